@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Ensure modules can be imported
+sys.path.append(os.getcwd())
+
+from modules.brains.color_engine import ColorEngine, rgb_to_lab, delta_e_2000
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+def compare_palette_modes(fixtures_dir: str, n_colors: int = 3) -> dict:
+    """
+    Compares the "fast" palette mode against the reference "kmeans" mode on a local image set.
+
+    Reports, per image and on average:
+    - dominant colour ΔE2000 between both modes,
+    - percentage error of the dominant colour (absolute difference in share of pixels),
+    - palette ΔE: every reference colour matched to its closest fast colour, weighted by share,
+    - time per image for each mode.
+    """
+    images = sorted(
+        os.path.join(fixtures_dir, name) for name in os.listdir(fixtures_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    if not images:
+        raise ValueError(f"No fixture images found in {fixtures_dir}")
+
+    reference = ColorEngine(n_colors=n_colors, mode="kmeans")
+    fast = ColorEngine(n_colors=n_colors, mode="fast")
+
+    rows = []
+    timings = {"kmeans": 0.0, "fast": 0.0}
+    for path in images:
+        # Decode outside the timed section: both modes read the same shared image.
+        reference._load_image(path)
+
+        start = time.perf_counter()
+        ref_palette = reference.extract_palette(path)
+        timings["kmeans"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast_palette = fast.extract_palette(path)
+        timings["fast"] += time.perf_counter() - start
+
+        if not ref_palette or not fast_palette:
+            continue
+
+        ref_lab = rgb_to_lab([c["rgb"] for c in ref_palette])
+        fast_lab = rgb_to_lab([c["rgb"] for c in fast_palette])
+        pairwise = delta_e_2000(ref_lab[:, None, :], fast_lab[None, :, :])
+        shares = np.array([c["percentage"] for c in ref_palette])
+
+        rows.append({
+            "image": os.path.basename(path),
+            "dominant_delta_e": float(pairwise[0, 0]),
+            "dominant_pct_error": abs(ref_palette[0]["percentage"] - fast_palette[0]["percentage"]),
+            "palette_delta_e": float((pairwise.min(axis=1) * shares).sum() / shares.sum()),
+            "same_dominant_pantone": ref_palette[0]["pantone_code"] == fast_palette[0]["pantone_code"],
+        })
+
+    count = len(images)
+    return {
+        "images": count,
+        "compared": len(rows),
+        "mean_dominant_delta_e": round(float(np.mean([r["dominant_delta_e"] for r in rows])), 2) if rows else None,
+        "mean_dominant_pct_error": round(float(np.mean([r["dominant_pct_error"] for r in rows])), 4) if rows else None,
+        "mean_palette_delta_e": round(float(np.mean([r["palette_delta_e"] for r in rows])), 2) if rows else None,
+        "same_dominant_pantone": round(float(np.mean([r["same_dominant_pantone"] for r in rows])), 4) if rows else None,
+        "kmeans_ms_per_image": round(timings["kmeans"] / count * 1000, 1),
+        "fast_ms_per_image": round(timings["fast"] / count * 1000, 1),
+        "speedup": round(timings["kmeans"] / timings["fast"], 1) if timings["fast"] else None,
+        "per_image": rows,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="ColorEngine: fast vs K-Means palette accuracy and speed.")
+    parser.add_argument("fixtures", help="Directory of sample images.")
+    parser.add_argument("--n-colors", type=int, default=3)
+    parser.add_argument("--verbose", action="store_true", help="Print per-image rows.")
+    args = parser.parse_args()
+
+    report = compare_palette_modes(args.fixtures, n_colors=args.n_colors)
+    print(f"🎨 [ColorBenchmark] {report['compared']}/{report['images']} images compared")
+    print(f"   Dominant ΔE2000:        {report['mean_dominant_delta_e']}")
+    print(f"   Dominant % error:       {report['mean_dominant_pct_error']}")
+    print(f"   Palette ΔE2000 (wtd):   {report['mean_palette_delta_e']}")
+    print(f"   Same dominant Pantone:  {report['same_dominant_pantone']}")
+    print(f"   K-Means: {report['kmeans_ms_per_image']} ms/img | Fast: {report['fast_ms_per_image']} ms/img | x{report['speedup']}")
+    if args.verbose:
+        for row in report["per_image"]:
+            print(f"   - {row['image']}: ΔE {row['dominant_delta_e']:.2f}, %err {row['dominant_pct_error']:.4f}, palette ΔE {row['palette_delta_e']:.2f}")
+
+if __name__ == "__main__":
+    main()
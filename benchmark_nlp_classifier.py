@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+# Ensure modules can be imported
+sys.path.append(os.getcwd())
+
+from modules.brains.nlp_engine import NLPEngine
+
+TEXT_EXTENSIONS = (".txt", ".md")
+
+# Same candidate labels as the pipeline's NLP phase
+CANDIDATES = {
+    "fabric": ["Sherpa", "Velvet", "Lino", "Denim", "Satin", "Metallic", "Leather", "Jersey", "Piel de Durazno", "Polilycra", "Piel de Conejo"],
+    "texture": ["Soft", "Rough", "Fluffy", "Smooth", "Quilted", "Wrinkled"],
+    "finish": ["Matte", "Shiny", "Distressed", "Sublimated", "Metallic"],
+}
+
+def compare_classifiers(fixtures_dir: str, candidate_data: dict = None, batch_size: int = 8) -> dict:
+    """
+    Compares the SigLIP embedding classifier against the BART-MNLI zero-shot pipeline on local texts.
+
+    Reports, per category:
+    - top-label agreement between both backends,
+    - decision agreement (same label, or both below the 0.4 threshold),
+    - time per document for each backend (after a warm-up document).
+    """
+    candidate_data = candidate_data or CANDIDATES
+    paths = sorted(
+        os.path.join(fixtures_dir, name) for name in os.listdir(fixtures_dir)
+        if name.lower().endswith(TEXT_EXTENSIONS)
+    )
+    if not paths:
+        raise ValueError(f"No fixture texts found in {fixtures_dir}")
+
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read()[:3000]) # Same truncation as analyze_text
+
+    def run(engine):
+        engine._classify(texts[:1], candidate_data)  # warm-up (model load, label embeddings)
+        start = time.perf_counter()
+        results = []
+        for offset in range(0, len(texts), batch_size):
+            results.extend(engine._classify(texts[offset:offset + batch_size], candidate_data))
+        return results, (time.perf_counter() - start) / len(texts)
+
+    reference, reference_latency = run(NLPEngine(classifier_backend="mnli"))
+    candidate, candidate_latency = run(NLPEngine(classifier_backend="siglip"))
+
+    report = {"documents": len(texts), "categories": {}}
+    for category in candidate_data:
+        pairs = [(r[category], c[category]) for r, c in zip(reference, candidate) if category in r and category in c]
+        if not pairs: continue
+        same_top = [r["labels"][0] == c["labels"][0] for r, c in pairs]
+        decisions = [
+            (r["labels"][0] if r["scores"][0] > 0.4 else None) == (c["labels"][0] if c["scores"][0] > 0.4 else None)
+            for r, c in pairs
+        ]
+        report["categories"][category] = {
+            "top_label_agreement": round(float(np.mean(same_top)), 4),
+            "decision_agreement": round(float(np.mean(decisions)), 4),
+        }
+    report["mnli_ms_per_doc"] = round(reference_latency * 1000, 1)
+    report["siglip_ms_per_doc"] = round(candidate_latency * 1000, 1)
+    report["speedup"] = round(reference_latency / candidate_latency, 1) if candidate_latency else None
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="NLPEngine: SigLIP embedding classifier vs BART-MNLI agreement and speed.")
+    parser.add_argument("fixtures", help="Directory of sample texts (.txt/.md).")
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    report = compare_classifiers(args.fixtures, batch_size=args.batch_size)
+    print(f"🏷️ [NLPClassifierBenchmark] {report['documents']} documents")
+    for category, item in report["categories"].items():
+        print(f"   {category:<8} top label: {item['top_label_agreement']:.0%} | decision: {item['decision_agreement']:.0%}")
+    print(f"   BART-MNLI: {report['mnli_ms_per_doc']} ms/doc | SigLIP: {report['siglip_ms_per_doc']} ms/doc | x{report['speedup']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+# Ensure modules can be imported
+sys.path.append(os.getcwd())
+
+from modules.hunters.short_video_hunter import ShortVideoHunter
+
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".mkv", ".mov", ".avi")
+MODES = ("read", "grab", "seek")
+
+def benchmark_video(path: str, sample_rate_sec: float = 1.5) -> dict:
+    """
+    Decodes one video with every ShortVideoHunter sampling mode and reports, per mode:
+    - sampled frames and wall time,
+    - throughput in source frames/sec (how fast the video is scanned) and sampled frames/sec,
+    - max pixel difference against the "read" frames (same index must give the same image).
+    """
+    report = {"video": os.path.basename(path), "modes": {}}
+    reference = {}
+    for mode in MODES:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        frame_interval = max(1, int(round(fps * sample_rate_sec)))
+
+        start = time.perf_counter()
+        frames = dict(ShortVideoHunter._iter_sampled_frames(cap, frame_interval, mode))
+        elapsed = time.perf_counter() - start
+        cap.release()
+
+        if mode == "read":
+            reference = frames
+        common = [index for index in frames if index in reference]
+        max_diff = max(
+            (int(np.abs(frames[i].astype(np.int16) - reference[i].astype(np.int16)).max()) for i in common),
+            default=0
+        )
+        report["frames"] = frame_count
+        report["modes"][mode] = {
+            "sampled": len(frames),
+            "seconds": round(elapsed, 3),
+            "source_fps": round(frame_count / elapsed, 1) if elapsed else None,
+            "sampled_fps": round(len(frames) / elapsed, 1) if elapsed else None,
+            "same_indices": sorted(frames) == sorted(reference),
+            "max_pixel_diff": max_diff,
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="ShortVideoHunter: frame decoding throughput per sampling mode (read / grab / seek).")
+    parser.add_argument("videos", nargs="+", help="Video files or directories of local sample videos.")
+    parser.add_argument("--sample-rate", type=float, default=1.5, help="Seconds between sampled frames (hunter default: 1.5).")
+    args = parser.parse_args()
+
+    paths = []
+    for item in args.videos:
+        if os.path.isdir(item):
+            paths.extend(sorted(
+                os.path.join(item, name) for name in os.listdir(item) if name.lower().endswith(VIDEO_EXTENSIONS)
+            ))
+        else:
+            paths.append(item)
+    if not paths:
+        raise SystemExit("No sample videos found.")
+
+    totals = {mode: [0, 0.0] for mode in MODES}
+    for path in paths:
+        report = benchmark_video(path, args.sample_rate)
+        print(f"🎞️ [VideoDecodeBenchmark] {report['video']} ({report['frames']} frames)")
+        for mode, item in report["modes"].items():
+            check = "" if item["same_indices"] else " ⚠️ different frame indices"
+            if item["max_pixel_diff"]:
+                check += f" ⚠️ pixel diff {item['max_pixel_diff']}"
+            print(f"   {mode:<5} {item['sampled']:>4} frames in {item['seconds']:.2f}s | "
+                  f"{item['source_fps']} source fps | {item['sampled_fps']} sampled fps{check}")
+            totals[mode][0] += report["frames"]
+            totals[mode][1] += item["seconds"]
+
+    baseline = totals["read"][1]
+    for mode, (frames, seconds) in totals.items():
+        speedup = f"x{baseline / seconds:.1f}" if seconds else "-"
+        print(f"   TOTAL {mode:<5} {frames / seconds if seconds else 0:.1f} source fps ({speedup} vs read)")
+
+if __name__ == "__main__":
+    main()
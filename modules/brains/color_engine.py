@@ -1,123 +1,374 @@
 from PIL import Image
 import numpy as np
 from sklearn.cluster import KMeans
-import requests
-from io import BytesIO
+from sklearn.neighbors import KDTree
 import matplotlib.colors as mcolors
-import math
+from functools import lru_cache
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from threadpoolctl import threadpool_limits
+import multiprocessing
+import csv
+import os
+from modules.integration.image_loader import get_image_loader
+
+# Pantone TCX reference table (code,name,r,g,b). The bundled file only holds a
+# fashion/interiors subset; point ANTC_PANTONE_TCX_PATH (or `pantone_path`) at the
+# full licensed TCX export to match against the whole library.
+DEFAULT_PANTONE_PATH = os.path.join(os.path.dirname(__file__), "data", "pantone_tcx.csv")
+
+
+def rgb_to_lab(rgb) -> np.ndarray:
+    """Vectorized sRGB (0-255, shape (..., 3)) -> CIELAB (D65)."""
+    rgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    linear = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ])
+    xyz = xyz / np.array([0.95047, 1.0, 1.08883])
+
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    L = 116 * f[..., 1] - 16
+    a = 500 * (f[..., 0] - f[..., 1])
+    b = 200 * (f[..., 1] - f[..., 2])
+    return np.stack([L, a, b], axis=-1)
+
+
+def delta_e_2000(lab1, lab2) -> np.ndarray:
+    """Vectorized CIEDE2000 colour difference. Inputs broadcast over the last axis (L, a, b)."""
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    C_mean7 = ((C1 + C2) / 2) ** 7
+    G = 0.5 * (1 - np.sqrt(C_mean7 / (C_mean7 + 25 ** 7)))
+
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = np.hypot(a1p, b1)
+    C2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180, dhp - 360, dhp)
+    dhp = np.where(dhp < -180, dhp + 360, dhp)
+    dhp = np.where(C1p * C2p == 0, 0, dhp)
+    dHp = 2 * np.sqrt(C1p * C2p) * np.sin(np.radians(dhp) / 2)
+
+    Lp_mean = (L1 + L2) / 2
+    Cp_mean = (C1p + C2p) / 2
+    hp_sum = h1p + h2p
+    hp_mean = np.where(np.abs(h1p - h2p) > 180, (hp_sum + 360) / 2, hp_sum / 2)
+    hp_mean = np.where(hp_mean >= 360, hp_mean - 360, hp_mean)
+    hp_mean = np.where(C1p * C2p == 0, hp_sum, hp_mean)
+
+    T = (1 - 0.17 * np.cos(np.radians(hp_mean - 30))
+         + 0.24 * np.cos(np.radians(2 * hp_mean))
+         + 0.32 * np.cos(np.radians(3 * hp_mean + 6))
+         - 0.20 * np.cos(np.radians(4 * hp_mean - 63)))
+    d_theta = 30 * np.exp(-(((hp_mean - 275) / 25) ** 2))
+    Cp_mean7 = Cp_mean ** 7
+    R_C = 2 * np.sqrt(Cp_mean7 / (Cp_mean7 + 25 ** 7))
+    S_L = 1 + (0.015 * (Lp_mean - 50) ** 2) / np.sqrt(20 + (Lp_mean - 50) ** 2)
+    S_C = 1 + 0.045 * Cp_mean
+    S_H = 1 + 0.015 * Cp_mean * T
+    R_T = -np.sin(np.radians(2 * d_theta)) * R_C
+
+    return np.sqrt(
+        (dLp / S_L) ** 2 + (dCp / S_C) ** 2 + (dHp / S_H) ** 2
+        + R_T * (dCp / S_C) * (dHp / S_H)
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_pantone_table(path: str):
+    """Reads the TCX table once per process and precomputes its Lab array and KD-tree."""
+    codes, names, rgbs = [], [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            codes.append(row["code"])
+            names.append(row["name"])
+            rgbs.append((int(row["r"]), int(row["g"]), int(row["b"])))
+
+    rgb = np.array(rgbs, dtype=np.float64)
+    lab = rgb_to_lab(rgb)
+    return codes, names, rgb, lab, KDTree(lab)
+
+
+PALETTE_MODES = ("kmeans", "fast")
+
 
 class ColorEngine:
-    def __init__(self, n_colors=5):
+    def __init__(self, n_colors=5, pantone_path: str = None, mode: str = "kmeans"):
+        """
+        Args:
+            n_colors: Number of dominant colours per image.
+            pantone_path: TCX reference CSV (defaults to $ANTC_PANTONE_TCX_PATH, then the bundled subset).
+            mode: "kmeans" (K-Means over every pixel, 10 restarts) or "fast"
+                  (K-Means over a coarse colour histogram, ~10x faster).
+                  Compare both on local images with `python benchmark_color.py <dir>`.
+        """
+        if mode not in PALETTE_MODES:
+            raise ValueError(f"Unknown palette mode '{mode}'. Expected one of {PALETTE_MODES}.")
         self.n_colors = n_colors
-        # Pantone TCX Subset (Fashion Home + Interiors)
-        # Mapping simple names/codes to RGB ref values
+        self.mode = mode
+
+        # Pantone TCX library, precomputed in CIELAB for vectorized matching.
+        path = pantone_path or os.getenv("ANTC_PANTONE_TCX_PATH") or DEFAULT_PANTONE_PATH
+        self._pantone_path = path
+        self.pantone_codes, self.pantone_names, self.pantone_rgb, self.pantone_lab, self._pantone_tree = _load_pantone_table(path)
         self.pantone_db = {
-            "11-0601 TCX": {"name": "Bright White", "rgb": (244, 249, 255)},
-            "19-4007 TCX": {"name": "Anthracite", "rgb": (40, 40, 40)},
-            "11-4001 TCX": {"name": "Brilliant White", "rgb": (240, 240, 250)},
-            "13-1006 TCX": {"name": "Creme Brulee", "rgb": (219, 204, 181)},
-            "16-1546 TCX": {"name": "Living Coral", "rgb": (255, 111, 97)},
-            "18-3838 TCX": {"name": "Ultra Violet", "rgb": (95, 75, 139)},
-            "19-4052 TCX": {"name": "Classic Blue", "rgb": (15, 76, 129)},
-            "17-5104 TCX": {"name": "Ultimate Gray", "rgb": (147, 149, 151)},
-            "13-0647 TCX": {"name": "Illuminating", "rgb": (245, 223, 77)},
-            "15-0343 TCX": {"name": "Greenery", "rgb": (136, 176, 75)},
-            "18-1438 TCX": {"name": "Marsala", "rgb": (150, 79, 76)},
-            "18-3224 TCX": {"name": "Radiant Orchid", "rgb": (173, 94, 153)},
-            "17-5641 TCX": {"name": "Emerald", "rgb": (0, 148, 115)},
-            "17-1463 TCX": {"name": "Tangerine Tango", "rgb": (221, 65, 36)},
-            "18-2120 TCX": {"name": "Honeysuckle", "rgb": (214, 80, 118)},
-            "15-5519 TCX": {"name": "Turquoise", "rgb": (69, 181, 170)},
-            "14-0848 TCX": {"name": "Mimosa", "rgb": (240, 192, 90)},
-            "18-3943 TCX": {"name": "Blue Iris", "rgb": (90, 91, 159)},
-            "19-1557 TCX": {"name": "Chili Pepper", "rgb": (155, 27, 48)},
-            "13-1106 TCX": {"name": "Sand Dollar", "rgb": (222, 205, 190)},
-            "19-0303 TCX": {"name": "Jet Black", "rgb": (45, 44, 47)},
-            "19-4005 TCX": {"name": "Stretch Limo", "rgb": (43, 46, 52)},
-            "11-0103 TCX": {"name": "Egret", "rgb": (243, 236, 224)},
-            "14-1118 TCX": {"name": "Beige", "rgb": (212, 184, 149)},
-            "16-1325 TCX": {"name": "Copper", "rgb": (184, 115, 51)},
-            "17-2031 TCX": {"name": "Fuchsia", "rgb": (193, 84, 193)},
-            "19-1664 TCX": {"name": "True Red", "rgb": (191, 25, 50)},
+            code: {"name": name, "rgb": tuple(int(v) for v in rgb)}
+            for code, name, rgb in zip(self.pantone_codes, self.pantone_names, self.pantone_rgb)
         }
 
-    def _load_image(self, image_path: str) -> Image.Image:
-        """Loads an image from a local path or URL."""
-        if image_path.startswith("http"):
-            response = requests.get(image_path)
-            img = Image.open(BytesIO(response.content)).convert("RGB")
-        elif image_path.startswith("file://"):
-            img = Image.open(image_path.replace("file://", "")).convert("RGB")
+    def _load_image(self, image_path, color_order: str = "RGB") -> Image.Image:
+        """
+        Loads an image from a local path or URL (decoded once per run, shared with VisionEngine),
+        from already-downloaded encoded bytes, or from an in-memory NumPy frame.
+        """
+        if isinstance(image_path, bytes):
+            img = Image.open(BytesIO(image_path)).convert("RGB")
+        elif isinstance(image_path, np.ndarray):
+            # In-memory frame: build the PIL image straight from the pixel buffer (no encode/decode).
+            frame = image_path[..., :3]
+            if color_order.upper() == "BGR":
+                frame = frame[..., ::-1]
+            img = Image.fromarray(np.ascontiguousarray(frame))
         else:
-            img = Image.open(image_path).convert("RGB")
+            # The shared image must not be modified in place, so thumbnail a copy.
+            img = get_image_loader().get_image(image_path).copy()
         
         # Resize for faster processing
         img.thumbnail((200, 200)) 
         return img
 
+    def match_pantone_batch(self, rgb_array, k: int = 16):
+        """
+        Matches many colours against the TCX library in one vectorized call.
+
+        A KD-tree in Lab space shortlists the `k` nearest references (ΔE76), which are
+        then re-ranked with CIEDE2000.
+
+        Args:
+            rgb_array: Array-like of shape (N, 3) with 0-255 sRGB values.
+            k: Shortlist size per colour.
+
+        Returns:
+            tuple: (codes, names, delta_e) lists of length N.
+        """
+        rgb_array = np.asarray(rgb_array, dtype=np.float64).reshape(-1, 3)
+        if len(rgb_array) == 0:
+            return [], [], []
+
+        lab = rgb_to_lab(rgb_array)
+        k = min(k, len(self.pantone_codes))
+        _, candidates = self._pantone_tree.query(lab, k=k)
+
+        delta_e = delta_e_2000(lab[:, None, :], self.pantone_lab[candidates])
+        best = np.argmin(delta_e, axis=1)
+        indices = candidates[np.arange(len(lab)), best]
+        best_delta = delta_e[np.arange(len(lab)), best]
+
+        codes = [self.pantone_codes[i] for i in indices]
+        names = [self.pantone_names[i] for i in indices]
+        return codes, names, [round(float(d), 2) for d in best_delta]
+
     def _match_pantone(self, rgb_tuple):
-        """Finds closest Pantone TCX from local DB using Euclidean distance."""
-        min_dist = float('inf')
-        closest_code = None
-        closest_name = None
-        
-        r1, g1, b1 = rgb_tuple
-        
-        for code, data in self.pantone_db.items():
-            r2, g2, b2 = data['rgb']
-            # Simple Euclidean distance in RGB space
-            # (Delta E Lab is better but requires conversion libs which might fail as per log)
-            dist = math.sqrt((r2 - r1)**2 + (g2 - g1)**2 + (b2 - b1)**2)
-            if dist < min_dist:
-                min_dist = dist
-                closest_code = code
-                closest_name = data['name']
-                
-        return closest_code, closest_name
-
-    def extract_palette(self, image_path: str) -> list[dict]:
+        """Finds closest Pantone TCX (CIEDE2000 in Lab space)."""
+        codes, names, _ = self.match_pantone_batch([rgb_tuple])
+        return codes[0], names[0]
+
+    def _cluster_kmeans(self, pixels: np.ndarray):
+        """Reference mode: K-Means over every pixel with 10 restarts."""
+        kmeans = KMeans(n_clusters=self.n_colors, random_state=42, n_init=10)
+        kmeans.fit(pixels)
+        counts = np.bincount(kmeans.labels_, minlength=self.n_colors)
+        return kmeans.cluster_centers_, counts
+
+    def _cluster_fast(self, pixels: np.ndarray):
+        """
+        Fast mode: pre-quantize to a 16x16x16 colour histogram, then run K-Means over
+        the occupied bins weighted by their pixel counts (a few hundred to a few
+        thousand points instead of every pixel, and 5 restarts instead of 10).
+        """
+        pixels = pixels.astype(np.int64)
+        bins = ((pixels[:, 0] >> 4) << 8) | ((pixels[:, 1] >> 4) << 4) | (pixels[:, 2] >> 4)
+
+        occupied, inverse, weights = np.unique(bins, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+        # Bin colour = mean of its pixels (keeps full precision inside each bin)
+        bin_colors = np.stack(
+            [np.bincount(inverse, weights=pixels[:, c], minlength=len(occupied)) for c in range(3)], axis=1
+        ) / weights[:, None]
+
+        n_clusters = min(self.n_colors, len(occupied))
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=5)
+        kmeans.fit(bin_colors, sample_weight=weights)
+        counts = np.bincount(kmeans.labels_, weights=weights, minlength=n_clusters).astype(int)
+        return kmeans.cluster_centers_, counts
+
+    def extract_palette(self, image_path, color_order: str = "RGB") -> list[dict]:
         """
         Extracts dominant colors and matches them to Pantone.
+
+        Args:
+            image_path: Path/URL (str), encoded bytes, or NumPy frame (H, W, 3) uint8.
+            color_order: Channel order of NumPy frames ("RGB" or "BGR" as read by OpenCV).
         """
         try:
-            image = self._load_image(image_path)
+            image = self._load_image(image_path, color_order)
             image_np = np.array(image)
             
             pixels = image_np.reshape(-1, 3)
             
-            kmeans = KMeans(n_clusters=self.n_colors, random_state=42, n_init=10)
-            kmeans.fit(pixels)
-            
-            colors = kmeans.cluster_centers_
-            labels = kmeans.labels_
-            
-            counts = np.bincount(labels)
-            total = len(labels)
+            if self.mode == "fast":
+                colors, counts = self._cluster_fast(pixels)
+            else:
+                colors, counts = self._cluster_kmeans(pixels)
+            total = counts.sum()
             
+            # Pantone Match (all cluster centres in one batched call)
+            centres = colors.astype(int)
+            p_codes, p_names, p_deltas = self.match_pantone_batch(centres)
+
             palette = []
-            for i in range(self.n_colors):
-                rgb = colors[i].astype(int)
+            for i in range(len(centres)):
+                rgb = centres[i]
                 hex_color = mcolors.to_hex(rgb / 255.0)
                 percentage = counts[i] / total
-                
-                # Pantone Match
-                p_code, p_name = self._match_pantone(rgb)
 
                 palette.append({
                     "hex": hex_color,
                     "rgb": rgb.tolist(),
-                    "percentage": round(percentage, 4),
-                    "pantone_code": p_code,
-                    "pantone_name": p_name
+                    "percentage": round(float(percentage), 4),
+                    "pantone_code": p_codes[i],
+                    "pantone_name": p_names[i],
+                    "delta_e": p_deltas[i]
                 })
             
             palette.sort(key=lambda x: x['percentage'], reverse=True)
             return palette
 
         except Exception as e:
-            print(f"   ❌ [ColorEngine] Error processing {image_path}: {e}")
+            if isinstance(image_path, bytes):
+                source = f"<{len(image_path)} bytes>"
+            elif isinstance(image_path, np.ndarray):
+                source = f"<frame {image_path.shape}>"
+            else:
+                source = image_path
+            print(f"   ❌ [ColorEngine] Error processing {source}: {e}")
             return []
 
+    def iter_palettes(self, paths: list, workers: int = None, ordered: bool = False):
+        """
+        Extracts palettes for many images on a process pool, yielding results as they finish.
+
+        Each worker builds its own ColorEngine once and caps BLAS/OpenMP threads to 1,
+        so N workers use N cores instead of oversubscribing them. Images the parent
+        process already downloaded are sent as bytes instead of being fetched again.
+        An image whose worker fails (or dies) yields an empty palette, like `extract_palette`.
+
+        Spawned workers re-import the caller's `__main__` module, so scripts that use this
+        should keep heavy imports (torch, selenium, ...) out of their top level.
+
+        Args:
+            paths: Paths/URLs of the images.
+            workers: Number of worker processes (defaults to min(4, CPU count)). 1 runs inline.
+            ordered: Yield in input order (as soon as each prefix is done) instead of completion order.
+
+        Yields:
+            tuple: (index in `paths`, palette list).
+        """
+        # Each spawned worker costs a fresh interpreter plus its imports; a few already saturate K-Means.
+        workers = workers or min(4, os.cpu_count() or 1)
+        if workers <= 1 or len(paths) <= 1:
+            for index, path in enumerate(paths):
+                yield index, self.extract_palette(path)
+            return
+
+        loader = get_image_loader()
+        # Spawned (not forked) workers: forking a process that already runs torch/OpenMP threads can deadlock.
+        context = multiprocessing.get_context("spawn")
+        max_pending = workers * 4
+        pending = {}  # future -> index in `paths`
+        buffered = {}
+        next_index = 0
+        items = iter(enumerate(paths))
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(paths)),
+            mp_context=context,
+            initializer=_init_palette_worker,
+            initargs=(self.n_colors, self._pantone_path, self.mode),
+        ) as pool:
+            while True:
+                finished = []
+                # Keep a bounded number of tasks in flight so payloads don't pile up in memory.
+                for index, path in items:
+                    payload = (loader.peek_bytes(path) or path) if isinstance(path, str) else path
+                    try:
+                        pending[pool.submit(_extract_palette_in_worker, index, payload)] = index
+                    except BrokenProcessPool as e:
+                        print(f"   ❌ [ColorEngine] Worker pool broken, skipping image {index}: {e}")
+                        finished.append((index, []))
+                        continue
+                    if len(pending) >= max_pending:
+                        break
+                if not pending and not finished:
+                    break
+
+                if pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            _, palette = future.result()
+                        except Exception as e:  # Includes BrokenProcessPool when a worker dies
+                            print(f"   ❌ [ColorEngine] Worker failed on image {index}: {e}")
+                            palette = []
+                        finished.append((index, palette))
+
+                for index, palette in finished:
+                    if not ordered:
+                        yield index, palette
+                        continue
+                    buffered[index] = palette
+                    while next_index in buffered:
+                        yield next_index, buffered.pop(next_index)
+                        next_index += 1
+
+    def extract_palettes(self, paths: list, workers: int = None) -> list[list[dict]]:
+        """Process-pool version of `extract_palette`. Returns one palette per path, in input order."""
+        palettes = [[] for _ in paths]
+        for index, palette in self.iter_palettes(paths, workers=workers):
+            palettes[index] = palette
+        return palettes
+
+
+_worker_engine = None
+
+def _init_palette_worker(n_colors, pantone_path, mode):
+    """Process-pool initializer: one ColorEngine per worker, single-threaded BLAS/OpenMP."""
+    global _worker_engine
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = "1"
+    threadpool_limits(limits=1)
+    _worker_engine = ColorEngine(n_colors=n_colors, pantone_path=pantone_path, mode=mode)
+
+def _extract_palette_in_worker(index, image_input):
+    return index, _worker_engine.extract_palette(image_input)
+
 if __name__ == "__main__":
     color_engine = ColorEngine()
     test_image = "https://images.pexels.com/photos/1036623/pexels-photo-1036623.jpeg"
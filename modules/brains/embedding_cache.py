@@ -0,0 +1,169 @@
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed store of image embeddings and category scores.
+
+    Layout (one directory per model):
+    - `embeddings.npy`: memory-mapped float32 matrix of shape (max_entries, dim).
+    - `index.sqlite`: key -> slot mapping with last access time (LRU), plus the
+      per-category scores already computed for each image.
+
+    Keys are the SHA-256 of the image bytes, so the same picture served from
+    different URLs or runs maps to the same entry. When the store is full the
+    least recently used slot is evicted and reused.
+
+    The store is safe to share between threads. Use one writer process per directory.
+    """
+    def __init__(self, cache_dir: str, model_id: str, max_entries: int = 50_000):
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]", "_", model_id)
+        self.cache_dir = os.path.join(os.path.abspath(cache_dir), safe_model)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.model_id = model_id
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._matrix_path = os.path.join(self.cache_dir, "embeddings.npy")
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite"), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, slot INTEGER UNIQUE, last_access REAL);
+            CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS scores (key TEXT, signature TEXT, result TEXT, PRIMARY KEY (key, signature));
+        """)
+        self._matrix = None
+        if not os.path.exists(self._matrix_path):
+            self._reset()
+        else:
+            matrix = np.load(self._matrix_path, mmap_mode="r+")
+            if matrix.shape[0] == max_entries:
+                self._matrix = matrix
+            else:
+                # Capacity changed: the slot layout is no longer valid.
+                del matrix
+                self._reset()
+
+    def key_for(self, data: bytes) -> str:
+        """Content address of an image: hash of its bytes (the directory scopes the model)."""
+        return hashlib.sha256(data).hexdigest()
+
+    def get_embedding(self, key: str):
+        """Returns the cached embedding (np.ndarray) or None. Counts a hit or a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or self._matrix is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return np.array(self._matrix[row[0]])
+
+    def get_scores(self, key: str, category: str, labels: list):
+        """Returns the cached result of a category for this image, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM scores WHERE key = ? AND signature = ?",
+                (key, _signature(category, labels))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, embedding: np.ndarray, results: dict, candidate_data: dict):
+        """
+        Stores an image embedding and its per-category results.
+
+        Args:
+            key: Content address from `key_for`.
+            embedding: 1-D image embedding.
+            results: Category -> result dict, as returned by VisionEngine.
+            candidate_data: Labels used to produce `results`.
+        """
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.lib.format.open_memmap(
+                    self._matrix_path, mode="w+", dtype=np.float32, shape=(self.max_entries, embedding.shape[0])
+                )
+
+            row = self._conn.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+            slot = row[0] if row else self._allocate_slot()
+
+            self._matrix[slot] = embedding
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, slot, last_access) VALUES (?, ?, ?)",
+                (key, slot, time.time())
+            )
+            self._write_scores(key, results, candidate_data)
+            self._conn.commit()
+
+    def put_scores(self, key: str, results: dict, candidate_data: dict):
+        """Adds results for new label sets to an image that is already cached."""
+        with self._lock:
+            self._write_scores(key, results, candidate_data)
+            self._conn.commit()
+
+    def _write_scores(self, key: str, results: dict, candidate_data: dict):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO scores (key, signature, result) VALUES (?, ?, ?)",
+            [
+                (key, _signature(category, candidate_data[category]), json.dumps(result))
+                for category, result in results.items() if category in candidate_data
+            ]
+        )
+
+    def _allocate_slot(self) -> int:
+        """Returns a free slot, evicting the least recently used entry when full. Caller holds the lock."""
+        # Slots stay dense (0..count-1): entries are only removed to be replaced.
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count < self.max_entries:
+            return count
+
+        key, slot = self._conn.execute("SELECT key, slot FROM entries ORDER BY last_access ASC LIMIT 1").fetchone()
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM scores WHERE key = ?", (key,))
+        return slot
+
+    def _reset(self):
+        self._conn.executescript("DELETE FROM entries; DELETE FROM scores;")
+        self._conn.commit()
+        if os.path.exists(self._matrix_path):
+            os.remove(self._matrix_path)
+        self._matrix = None
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
+
+
+def _signature(category: str, labels: list) -> str:
+    return hashlib.sha1(json.dumps([category, list(labels)]).encode("utf-8")).hexdigest()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(cache_dir: str, model_id: str, max_entries: int = 50_000) -> EmbeddingCache:
+    """Returns the process-wide cache for (cache_dir, model_id), so engines never open it twice."""
+    key = (os.path.abspath(cache_dir), model_id)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = EmbeddingCache(cache_dir, model_id, max_entries=max_entries)
+        return _caches[key]
@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from bisect import bisect_right
+from collections import deque
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "data", "fabric_lexicon.json")
+
+
+def normalize_for_matching(text: str) -> str:
+    """Lowercase and strip accents, so "Satén", "SATEN" and "saten" match the same entry."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class _Automaton:
+    """Aho-Corasick automaton over normalized patterns; one pass over the text finds every occurrence."""
+    def __init__(self, patterns: dict):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+        for pattern, payloads in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((len(pattern), payloads))
+
+        # Failure links (BFS): longest proper suffix that is also a prefix of some pattern
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yields (start, end, payloads) for every pattern occurrence."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payloads in out[state]:
+                yield i - length + 1, i + 1, payloads
+
+
+class LexiconPrefilter:
+    """
+    Cheap relevance gate in front of the transformer models.
+
+    Each candidate label is expanded with its multilingual synonyms from the lexicon
+    (e.g. "Lino" -> linen, linho; "Piel de Durazno" -> peach skin) and every term is
+    searched in a single Aho-Corasick pass (whole words, case and accent insensitive).
+    A text is relevant when it mentions at least one candidate, or at least
+    `min_generic_hits` generic fashion/textile words.
+
+    Everyday words that are also terms ("contextual" in the lexicon: soft, mate, lame...)
+    only count within `context_words` words of another lexicon hit ("soft cotton",
+    "tela mate"); on their own they would let almost any text through.
+
+    Labels missing from the lexicon are matched by their own name.
+    """
+    def __init__(self, lexicon_path: str = None, min_generic_hits: int = 3, context_words: int = 3):
+        self.lexicon_path = lexicon_path or os.getenv("ANTC_NLP_LEXICON_PATH") or DEFAULT_LEXICON_PATH
+        self.min_generic_hits = min_generic_hits
+        self.context_words = context_words
+
+        with open(self.lexicon_path, "rb") as f:
+            raw = f.read()
+        lexicon = json.loads(raw)
+        self.generic = [normalize_for_matching(term) for term in lexicon.get("generic", [])]
+        self.contextual = {normalize_for_matching(term) for term in lexicon.get("contextual", [])}
+        self.synonyms = {
+            category: {normalize_for_matching(label): terms for label, terms in labels.items()}
+            for category, labels in lexicon.get("categories", {}).items()
+        }
+        # Part of the NLP cache key: results depend on which chunks pass the filter.
+        self.version = hashlib.sha1(raw + repr((min_generic_hits, context_words)).encode("utf-8")).hexdigest()[:12]
+
+        self._automata = {}
+        self._lock = threading.Lock()
+        self.counters = {"documents": 0, "documents_skipped": 0, "chunks": 0, "chunks_skipped": 0,
+                         "chars": 0, "chars_skipped": 0}
+
+    def _automaton(self, candidate_data: dict) -> _Automaton:
+        signature = json.dumps(candidate_data, sort_keys=True)
+        with self._lock:
+            automaton = self._automata.get(signature)
+        if automaton is not None:
+            return automaton
+
+        patterns = {}
+        for term in self.generic:
+            patterns.setdefault(term, set()).add(None)
+        for category, labels in candidate_data.items():
+            for label in labels or []:
+                key = normalize_for_matching(label)
+                terms = self.synonyms.get(category, {}).get(key)
+                if terms is None:
+                    # Same label under another category (e.g. "Metallic" fabric / finish)
+                    terms = next((group[key] for group in self.synonyms.values() if key in group), [])
+                for term in [key, *terms]:
+                    patterns.setdefault(normalize_for_matching(term), set()).add((category, label))
+
+        automaton = _Automaton({term: frozenset(payloads) for term, payloads in patterns.items() if term})
+        with self._lock:
+            self._automata[signature] = automaton
+        return automaton
+
+    def match(self, text: str, candidate_data: dict) -> dict:
+        """
+        Counts lexicon hits in a text.
+
+        Returns:
+            dict: {"candidates": {category: {label: hits}}, "generic": hits}
+        """
+        normalized = normalize_for_matching(text)
+        matches = []
+        for start, end, payloads in self._automaton(candidate_data).iter_matches(normalized):
+            # Whole words only ("lino" must not match "linoleum")
+            if start > 0 and normalized[start - 1].isalnum():
+                continue
+            if end < len(normalized) and normalized[end].isalnum():
+                continue
+            matches.append((start, end, payloads))
+
+        if self.contextual and any(normalized[start:end] in self.contextual for start, end, _ in matches):
+            matches = self._in_context(normalized, matches)
+
+        candidates = {}
+        generic = 0
+        for _, _, payloads in matches:
+            for payload in payloads:
+                if payload is None:
+                    generic += 1
+                else:
+                    category, label = payload
+                    labels = candidates.setdefault(category, {})
+                    labels[label] = labels.get(label, 0) + 1
+        return {"candidates": candidates, "generic": generic}
+
+    def _in_context(self, normalized: str, matches: list) -> list:
+        """Drops contextual hits that are not within `context_words` words of another hit."""
+        word_starts = [m.start() for m in re.finditer(r"\w+", normalized)]
+        anchors = [bisect_right(word_starts, start) - 1 for start, end, _ in matches
+                   if normalized[start:end] not in self.contextual]
+        kept = []
+        for start, end, payloads in matches:
+            if normalized[start:end] in self.contextual:
+                first, last = bisect_right(word_starts, start) - 1, bisect_right(word_starts, end - 1) - 1
+                if not any(first - self.context_words <= anchor <= last + self.context_words for anchor in anchors):
+                    continue
+            kept.append((start, end, payloads))
+        return kept
+
+    def is_relevant(self, text: str, candidate_data: dict, chunk: bool = False) -> bool:
+        """Routes a document (or a chunk of one) to the models, counting the skipped work."""
+        hits = self.match(text, candidate_data)
+        relevant = bool(hits["candidates"]) or hits["generic"] >= self.min_generic_hits
+
+        unit = "chunks" if chunk else "documents"
+        with self._lock:
+            self.counters[unit] += 1
+            self.counters["chars"] += len(text)
+            if not relevant:
+                self.counters[f"{unit}_skipped"] += 1
+                self.counters["chars_skipped"] += len(text)
+        return relevant
+
+    def stats(self) -> dict:
+        """Documents, chunks and characters checked and skipped in this process."""
+        with self._lock:
+            stats = dict(self.counters)
+        stats["skip_rate"] = round(stats["chars_skipped"] / stats["chars"], 4) if stats["chars"] else 0.0
+        return stats
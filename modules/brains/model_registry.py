@@ -0,0 +1,119 @@
+import threading
+import time
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded models.
+
+    Every engine asks the registry for its weights instead of calling
+    `from_pretrained` directly, so one pipeline run holds a single copy of each
+    model per (model id, device, precision), no matter how many hunters or
+    engines use it. Instances are reference-counted and freed when the last
+    holder releases them.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._entries = {}
+
+    def acquire(self, model_id: str, device, precision: str, loader):
+        """
+        Returns the shared instance for the key, loading it with `loader()` on first use.
+
+        Args:
+            model_id: HuggingFace model id.
+            device: Device the instance lives on (str or pipeline device index).
+            precision: Precision/backend tag (e.g. "fp32").
+            loader: Zero-argument callable that builds the instance.
+        """
+        key = (model_id, str(device), precision)
+
+        # Per-key lock: concurrent callers wait for a single load of the same model,
+        # while loads of different models can proceed in parallel.
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry:
+                    entry["refs"] += 1
+                    print(f"   ♻️ [ModelRegistry] Reusing {model_id} ({entry['refs']} refs)")
+                    return entry["instance"]
+
+            start = time.perf_counter()
+            instance = loader()
+            entry = {
+                "instance": instance,
+                "refs": 1,
+                "bytes": _estimate_bytes(instance),
+                "load_seconds": time.perf_counter() - start,
+            }
+            with self._lock:
+                self._entries[key] = entry
+            return instance
+
+    def release(self, model_id: str, device, precision: str):
+        """Drops one reference. The instance is freed when no holder remains."""
+        key = (model_id, str(device), precision)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return
+            entry["refs"] -= 1
+            if entry["refs"] > 0:
+                return
+            del self._entries[key]
+
+        print(f"   🧹 [ModelRegistry] Unloaded {model_id}")
+
+    def memory_report(self) -> list[dict]:
+        """Returns the loaded models with their reference count, weight size and load time."""
+        with self._lock:
+            return [
+                {
+                    "model_id": model_id,
+                    "device": device,
+                    "precision": precision,
+                    "refs": entry["refs"],
+                    "size_mb": round(entry["bytes"] / (1024 * 1024), 1),
+                    "load_seconds": round(entry["load_seconds"], 2),
+                }
+                for (model_id, device, precision), entry in self._entries.items()
+            ]
+
+    def print_report(self):
+        report = self.memory_report()
+        total = sum(item["size_mb"] for item in report)
+        print(f"   📦 [ModelRegistry] {len(report)} models loaded ({total:.1f} MB):")
+        for item in report:
+            print(f"      - {item['model_id']} [{item['device']}/{item['precision']}] "
+                  f"{item['size_mb']} MB, {item['refs']} refs, loaded in {item['load_seconds']}s")
+
+
+def _estimate_bytes(instance) -> int:
+    """Sums parameter and buffer sizes of every torch module reachable from the instance."""
+    if isinstance(instance, (tuple, list)):
+        return sum(_estimate_bytes(item) for item in instance)
+
+    # transformers pipelines wrap the module in `.model`
+    module = getattr(instance, "model", instance)
+    if not hasattr(module, "parameters"):
+        return 0
+
+    total = 0
+    for tensor in list(module.parameters()) + list(module.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the process-wide ModelRegistry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
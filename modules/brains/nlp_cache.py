@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+
+class NLPResultCache:
+    """
+    Persistent store of NLPEngine results (summary, sentiment and attribute scores).
+
+    Entries live in a single SQLite file and are keyed by a hash of:
+    - the normalized text (Unicode NFKC, collapsed whitespace),
+    - the candidate label dictionary,
+    - the model ids and analysis settings that shape the result.
+
+    So the same article or transcript costs nothing on later runs, while any change
+    of labels, models or mode produces a fresh entry. Entries expire after
+    `ttl_days` and the least recently used ones are evicted above `max_entries`.
+
+    The store is safe to share between threads. Use one writer process per directory.
+    """
+    def __init__(self, cache_dir: str, ttl_days: float = 30, max_entries: int = 20_000):
+        self.cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.ttl_seconds = ttl_days * 24 * 3600 if ttl_days else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, "nlp_results.sqlite"), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT, created REAL, last_access REAL);
+            CREATE INDEX IF NOT EXISTS idx_results_access ON results (last_access);
+        """)
+        self._purge_expired()
+
+    def key_for(self, text: str, candidate_data: dict, signature: dict) -> str:
+        """
+        Content address of an analysis.
+
+        Args:
+            text: Raw input text (normalized here).
+            candidate_data: Categories and labels the text is classified against.
+            signature: Model ids and settings that affect the result.
+        """
+        return content_key(text, candidate_data, signature)
+
+    def get(self, key: str):
+        """Returns the cached result (dict) or None. Counts a hit or a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT result, created FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict):
+        """Stores a result, evicting the least recently used entries above `max_entries`."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, result, created, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def _purge_expired(self):
+        if not self.ttl_seconds:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the number of stored entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+        }
+
+
+def content_key(text: str, candidate_data: dict, signature: dict) -> str:
+    """Hash of the normalized text, the labels and the result signature (see `key_for`)."""
+    payload = json.dumps(
+        [normalize_text(text), candidate_data or {}, signature],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + collapsed whitespace, so trivially different copies share an entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_nlp_cache(cache_dir: str, ttl_days: float = 30, max_entries: int = 20_000) -> NLPResultCache:
+    """Returns the process-wide cache for `cache_dir`, so engines never open it twice."""
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = NLPResultCache(cache_dir, ttl_days=ttl_days, max_entries=max_entries)
+        return _caches[key]
@@ -1,9 +1,87 @@
-from transformers import pipeline
+import os
+import threading
+from collections import deque, OrderedDict
+from itertools import islice
+from transformers import AutoTokenizer, pipeline
+import numpy as np
 import torch
+from modules.brains.model_registry import get_model_registry
+from modules.brains.nlp_cache import get_nlp_cache, content_key
+from modules.brains.lexicon_prefilter import LexiconPrefilter
+from modules.brains.text_embedding_classifier import EmbeddingTextClassifier
 
 class NLPEngine:
-    def __init__(self):
-        print("🧠 [NLPEngine] Loading NLP Models...")
+    # attribute -> (pipeline task, model id, loading message)
+    MODELS = {
+        "summarizer": ("summarization", "facebook/bart-large-cnn", "📚 Loading Summarizer (BART)..."),
+        "sentiment_analyzer": ("sentiment-analysis", "distilbert-base-uncased-finetuned-sst-2-english", "🙂 Loading Sentiment Analyzer (DistilBERT)..."),
+        # Zero-Shot Classification (BART MNLI) - For Attribute Detection
+        "classifier": ("zero-shot-classification", "facebook/bart-large-mnli", "🏷️ Loading Zero-Shot Classifier (BART-MNLI)..."),
+    }
+
+    HYPOTHESIS_TEMPLATE = "This example is {}."
+
+    # Tokenizers used on their own (windowing, length bucketing), shared process-wide by model id.
+    # Loading one costs megabytes; going through the pipeline would load the whole model.
+    _tokenizers = {}
+    _tokenizers_lock = threading.Lock()
+
+    CHUNK_AGGREGATIONS = ("max", "mean")
+    # "mnli": BART-MNLI zero-shot (reference). "siglip": cosine similarity on the SigLIP text tower.
+    CLASSIFIER_BACKENDS = ("mnli", "siglip")
+    SIGLIP_MODEL_ID = "google/siglip-base-patch16-224"
+
+    def __init__(self, single_pass: bool = True, batch_size: int = 16, streaming: bool = False,
+                 chunk_tokens: int = 400, chunk_overlap: int = 50, chunk_batch: int = 4,
+                 chunk_aggregation: str = "max", cache_dir: str = None, cache_ttl_days: float = 30,
+                 cache_max_entries: int = 20_000, prefilter: bool = False, lexicon_path: str = None,
+                 classifier_backend: str = None, defer_summary: bool = False):
+        """
+        Args:
+            single_pass: Classify every category in one batched pass over all
+                         (premise, hypothesis) pairs instead of one pipeline call per category.
+            batch_size: Pairs per forward pass in single-pass mode.
+            streaming: Analyze documents longer than 3000 characters in overlapping token
+                       windows instead of truncating them (can be overridden per call).
+                       Shorter documents are read whole either way.
+            chunk_tokens: Window size in tokens (streaming mode).
+            chunk_overlap: Tokens shared by consecutive windows (streaming mode).
+            chunk_batch: Windows processed together; bounds memory whatever the document length.
+            chunk_aggregation: How window label scores become document scores:
+                               "max" (strongest mention anywhere) or "mean" (length-weighted average).
+            cache_dir: Optional directory for the persistent result cache (repeat texts cost nothing).
+            cache_ttl_days: Age after which cached results are recomputed.
+            cache_max_entries: Maximum number of cached results (LRU eviction).
+            prefilter: Only send documents (or chunks, in streaming mode) that mention a
+                       candidate or its synonyms to the models (see LexiconPrefilter).
+            lexicon_path: Multilingual synonym lexicon (JSON) for the prefilter.
+            classifier_backend: "mnli" (BART-MNLI zero-shot) or "siglip" (embedding similarity,
+                                much faster). Defaults to $ANTC_NLP_CLASSIFIER, then "mnli".
+            defer_summary: Skip summarization during analysis: sentiment runs on the source
+                           text (in windows) and `summarize()` computes summaries on demand.
+        """
+        self.classifier_backend = classifier_backend or os.getenv("ANTC_NLP_CLASSIFIER", "mnli")
+        if self.classifier_backend not in self.CLASSIFIER_BACKENDS:
+            raise ValueError(f"Unknown NLP classifier backend '{self.classifier_backend}'. Expected one of {self.CLASSIFIER_BACKENDS}.")
+        if chunk_aggregation not in self.CHUNK_AGGREGATIONS:
+            raise ValueError(f"chunk_aggregation must be one of {self.CHUNK_AGGREGATIONS}, got {chunk_aggregation!r}")
+        if not 0 <= chunk_overlap < chunk_tokens:
+            raise ValueError("chunk_overlap must be smaller than chunk_tokens")
+
+        print("🧠 [NLPEngine] Initializing (models load on first use)...")
+        self.single_pass = single_pass
+        self.batch_size = batch_size
+        self.streaming = streaming
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.chunk_batch = chunk_batch
+        self.chunk_aggregation = chunk_aggregation
+        self.cache = get_nlp_cache(cache_dir, cache_ttl_days, cache_max_entries) if cache_dir else None
+        self.prefilter = LexiconPrefilter(lexicon_path) if prefilter else None
+        self.defer_summary = defer_summary
+        # On-demand summaries (small in-process LRU; the result cache keeps them across runs)
+        self._summaries = OrderedDict()
+        self._summaries_lock = threading.Lock()
         self.device = 0 if torch.cuda.is_available() else -1
         
         device_str = "cpu"
@@ -12,33 +90,105 @@ class NLPEngine:
         
         print(f"   ⚙️ Device Target: {device_str}")
 
-        # Summarization (BART)
-        print("   📚 Loading Summarizer (BART)...")
-        self.summarizer = pipeline(
-            "summarization", 
-            model="facebook/bart-large-cnn", 
-            device=self.device
-        )
-
-        # Sentiment (DistilBERT)
-        print("   🙂 Loading Sentiment Analyzer (DistilBERT)...")
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="distilbert-base-uncased-finetuned-sst-2-english",
-            device=self.device
-        )
-        
-        # Zero-Shot Classification (BART MNLI) - For Attribute Detection
-        print("   🏷️ Loading Zero-Shot Classifier (BART-MNLI)...")
-        self.classifier = pipeline(
-            "zero-shot-classification",
-            model="facebook/bart-large-mnli",
-            device=self.device
-        )
-        
-        print("   ✅ Models loaded.")
+        # Pipelines are built lazily on first use and shared process-wide through
+        # the model registry, so a run only pays for the models it touches.
+        self._pipelines = {}
+        self._pipelines_lock = threading.Lock()
+        self._text_classifier = None
+
+    @property
+    def summarizer(self):
+        return self._pipeline("summarizer")
+
+    @property
+    def sentiment_analyzer(self):
+        return self._pipeline("sentiment_analyzer")
+
+    @property
+    def classifier(self):
+        return self._pipeline("classifier")
 
-    def analyze_text(self, text: str, candidate_data: dict = None) -> dict:
+    @property
+    def text_classifier(self):
+        """SigLIP embedding classifier (shares the VisionEngine weights), built on first use."""
+        with self._pipelines_lock:
+            if self._text_classifier is None:
+                self._text_classifier = EmbeddingTextClassifier(model_id=self.SIGLIP_MODEL_ID)
+            return self._text_classifier
+
+    def _pipeline(self, name: str):
+        """Returns the pipeline `name`, acquiring it from the registry on first use."""
+        pipe = self._pipelines.get(name)
+        if pipe is not None:
+            return pipe
+        with self._pipelines_lock:
+            if name not in self._pipelines:
+                task, model_id, message = self.MODELS[name]
+                self._pipelines[name] = get_model_registry().acquire(
+                    model_id, self.device, "fp32",
+                    lambda: self._load_pipeline(task, model_id, message)
+                )
+            return self._pipelines[name]
+
+    def _tokenizer(self, name: str):
+        """Tokenizer of model `name`, without loading its weights (the pipeline's one if already loaded)."""
+        pipe = self._pipelines.get(name)
+        if pipe is not None:
+            return pipe.tokenizer
+        model_id = self.MODELS[name][1]
+        with self._tokenizers_lock:
+            if model_id not in self._tokenizers:
+                self._tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
+            return self._tokenizers[model_id]
+
+    def _load_pipeline(self, task: str, model_id: str, message: str):
+        print(f"   {message}")
+        return pipeline(task, model=model_id, device=self.device)
+
+    def warmup(self, *names: str):
+        """
+        Loads pipelines ahead of time (all of them by default), e.g. before serving requests.
+
+        Args:
+            names: Subset of "summarizer", "sentiment_analyzer", "classifier".
+        """
+        for name in names or self.MODELS:
+            if name not in self.MODELS:
+                raise ValueError(f"Unknown NLP model {name!r}. Expected one of {list(self.MODELS)}")
+            self._pipeline(name)
+        print(f"   ✅ [NLPEngine] Warm: {', '.join(self._pipelines)}")
+
+    def release(self, *names: str):
+        """
+        Returns pipelines (all of them by default) to the registry.
+        They are loaded again on next use.
+        """
+        registry = get_model_registry()
+        with self._pipelines_lock:
+            for name in names or list(self._pipelines):
+                if self._pipelines.pop(name, None) is not None:
+                    registry.release(self.MODELS[name][1], self.device, "fp32")
+            if self._text_classifier is not None and (not names or "classifier" in names):
+                self._text_classifier.release()
+                self._text_classifier = None
+
+    def model_report(self) -> list[dict]:
+        """Load state, load time and resident size of each NLP model (from the registry)."""
+        loaded = {item["model_id"]: item for item in get_model_registry().memory_report()
+                  if item["device"] == str(self.device) and item["precision"] == "fp32"}
+        report = []
+        for name, (_, model_id, _) in self.MODELS.items():
+            item = loaded.get(model_id) if name in self._pipelines else None
+            report.append({
+                "name": name,
+                "model_id": model_id,
+                "loaded": item is not None,
+                "size_mb": item["size_mb"] if item else 0.0,
+                "load_seconds": item["load_seconds"] if item else None,
+            })
+        return report
+
+    def analyze_text(self, text: str, candidate_data: dict = None, streaming: bool = None) -> dict:
         """
         Summarizes, analyzes sentiment, AND classifies multiple attributes (Fabric, Texture, Finish).
         
@@ -51,60 +201,533 @@ class NLPEngine:
                                 "texture": ["Soft", "Rough"],
                                 "finish": ["Matte", "Shiny"]
                             }
+            streaming: Analyze the whole text in chunks when it is longer than 3000 characters
+                       (defaults to the engine setting). Otherwise only the first 3000
+                       characters are analyzed.
         """
         if not text:
              return {}
-             
+
+        streaming = self._streams(text, streaming)
+        key = None
+        if self.cache:
+            key = self._cache_key(text, candidate_data, streaming)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if streaming:
+            metrics = self._analyze_streaming(text, candidate_data)
+        elif not self._passes_prefilter(text[:3000], candidate_data):
+            return self._skipped_result(candidate_data)
+        else:
+            metrics = self._analyze_truncated(text, candidate_data)
+
+        if key and metrics and not metrics.get('skipped'):
+            self.cache.put(key, metrics)
+        return metrics
+
+    def _streams(self, text: str, streaming: bool = None) -> bool:
+        """
+        Whether `text` goes through the window-by-window path. Texts that fit in the
+        3000-character truncation are read whole anyway, so every API (and the cache key)
+        routes them through the single-document path.
+        """
+        streaming = self.streaming if streaming is None else streaming
+        return streaming and len(text) > 3000
+
+    def _passes_prefilter(self, text: str, candidate_data: dict, chunk: bool = False) -> bool:
+        """Lexicon gate. Only applies when attributes are requested."""
+        if self.prefilter is None or not candidate_data:
+            return True
+        return self.prefilter.is_relevant(text, candidate_data, chunk=chunk)
+
+    def _skipped_result(self, candidate_data: dict) -> dict:
+        """Result of a text the prefilter kept away from the models: no attribute found."""
+        return {
+            'skipped': True,
+            'attributes': {category: None for category, labels in candidate_data.items() if labels},
+        }
+
+    def _cache_key(self, text: str, candidate_data: dict, streaming: bool) -> str:
+        """Cache key: text, labels, model ids and the settings that change the result."""
+        signature = {"models": {name: model_id for name, (_, model_id, _) in self.MODELS.items()}}
+        if self.classifier_backend == "siglip":
+            signature["models"]["classifier"] = self.SIGLIP_MODEL_ID
+        if streaming:
+            signature["chunks"] = [self.chunk_tokens, self.chunk_overlap, self.chunk_aggregation]
+            if self.prefilter:
+                # Only relevant chunks are analyzed, so the lexicon shapes the result.
+                signature["prefilter"] = self.prefilter.version
+        if self.defer_summary:
+            # Sentiment is read from the source text instead of the summary.
+            signature["summary"] = "deferred"
+        return self.cache.key_for(text, candidate_data, signature)
+
+    def _analyze_truncated(self, text: str, candidate_data: dict = None) -> dict:
+        """Single-document analysis of the first 3000 characters."""
         metrics = {}
         processed_text = text[:3000] # Truncate
 
         try:
-            # 1. Summarize
-            if len(processed_text) > 100:
-                # Dynamic max_length to avoid errors with short inputs
-                max_len = min(130, len(processed_text) // 2) 
-                if max_len < 30: max_len = 30
-                
-                try:
-                    summary_output = self.summarizer(processed_text, max_length=max_len, min_length=10, do_sample=False)
-                    summary_text = summary_output[0]['summary_text']
-                except Exception as e:
-                     print(f"      ⚠️ Summarization skipped: {e}")
+            if self.defer_summary:
+                # Sentiment straight on the source text; the summary is left to summarize()
+                metrics['sentiment'], score = self._source_sentiment([processed_text])[0]
+                metrics['sentiment_score'] = round(score, 4)
+            else:
+                # 1. Summarize
+                if len(processed_text) > 100:
+                    # Dynamic max_length to avoid errors with short inputs
+                    max_len = min(130, len(processed_text) // 2) 
+                    if max_len < 30: max_len = 30
+                    
+                    try:
+                        summary_output = self.summarizer(processed_text, max_length=max_len, min_length=10, do_sample=False)
+                        summary_text = summary_output[0]['summary_text']
+                    except Exception as e:
+                         print(f"      ⚠️ Summarization skipped: {e}")
+                         summary_text = processed_text
+                else:
                      summary_text = processed_text
+
+                metrics['summary'] = summary_text
+
+                # 2. Sentiment
+                sentiment_output = self.sentiment_analyzer(summary_text)
+                metrics['sentiment'] = sentiment_output[0]['label']
+                metrics['sentiment_score'] = round(sentiment_output[0]['score'], 4)
+            
+            # 3. Multi-Attribute Classification (Zero-Shot)
+            if candidate_data:
+                classifications = self._classify([processed_text], candidate_data)[0]
+                metrics['attributes'] = self._format_attributes(classifications)
+            
+            return metrics
+
+        except Exception as e:
+            print(f"   ❌ [NLPEngine] Error processing text: {e}")
+            return {}
+
+    def analyze_texts(self, texts: list, candidate_data: dict = None, batch_size: int = 8,
+                      streaming: bool = None) -> list[dict]:
+        """
+        Batched `analyze_text` over many documents. Results keep the input order.
+
+        Documents are sorted by token length and grouped into buckets of `batch_size`,
+        so each padded batch holds documents of similar length. Summarization,
+        sentiment and zero-shot then run once per bucket.
+
+        Args:
+            texts: Input documents.
+            candidate_data: Dictionary of categories and labels.
+            batch_size: Documents per bucket.
+            streaming: As in `analyze_text`. Documents longer than 3000 characters are
+                       then analyzed one by one in chunks (each already batched internally).
+        """
+        results = [{} for _ in texts]
+
+        pending = []
+        keys = {}
+        for index, text in enumerate(texts):
+            if not text:
+                continue
+            streams = self._streams(text, streaming)
+            if self.cache:
+                keys[index] = self._cache_key(text, candidate_data, streams)
+                cached = self.cache.get(keys[index])
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            if streams:
+                results[index] = self._analyze_streaming(text, candidate_data)
+                if index in keys and results[index] and not results[index].get('skipped'):
+                    self.cache.put(keys[index], results[index])
+            elif not self._passes_prefilter(text[:3000], candidate_data):
+                results[index] = self._skipped_result(candidate_data)
             else:
-                 summary_text = processed_text
+                pending.append(index)
+        if not pending:
+            return results
 
-            metrics['summary'] = summary_text
+        # Length bucketing: sort by token count so padding inside a batch stays small
+        processed = {index: texts[index][:3000] for index in pending} # Truncate
+        tokenizer = self._tokenizer("sentiment_analyzer")
+        lengths = tokenizer([processed[index] for index in pending], add_special_tokens=False)["input_ids"]
+        order = [index for _, index in sorted(zip(map(len, lengths), pending))]
+
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            try:
+                for index, metrics in zip(bucket, self._analyze_bucket([processed[i] for i in bucket], candidate_data)):
+                    results[index] = metrics
+            except Exception as e:
+                # A failing document must not drop the whole bucket: retry one by one.
+                print(f"   ⚠️ [NLPEngine] Batch failed ({e}). Falling back to single-document analysis.")
+                for index in bucket:
+                    results[index] = self._analyze_truncated(processed[index], candidate_data)
+
+            for index in bucket:
+                if index in keys and results[index]:
+                    self.cache.put(keys[index], results[index])
+        return results
+
+    def _analyze_bucket(self, texts: list, candidate_data: dict = None) -> list[dict]:
+        """Summary, sentiment and attributes of a bucket of (truncated) documents."""
+        if self.defer_summary:
+            summaries = [None] * len(texts)
+            sentiments = [{'label': label, 'score': score} for label, score in self._source_sentiment(texts)]
+        else:
+            # 1. Summarize (only documents long enough, as in analyze_text)
+            summaries = list(texts)
+            long_ones = [i for i, text in enumerate(texts) if len(text) > 100]
+            if long_ones:
+                for i, summary in zip(long_ones, self._summarize_batch([texts[i] for i in long_ones])):
+                    summaries[i] = summary
 
             # 2. Sentiment
-            sentiment_output = self.sentiment_analyzer(summary_text)
-            metrics['sentiment'] = sentiment_output[0]['label']
-            metrics['sentiment_score'] = round(sentiment_output[0]['score'], 4)
+            sentiments = self.sentiment_analyzer(summaries, truncation=True, batch_size=len(summaries))
+
+        # 3. Multi-Attribute Classification (Zero-Shot)
+        classifications = [None] * len(texts)
+        if candidate_data:
+            classifications = self._classify(texts, candidate_data)
+
+        results = []
+        for summary, sentiment, classification in zip(summaries, sentiments, classifications):
+            metrics = {
+                'sentiment': sentiment['label'],
+                'sentiment_score': round(sentiment['score'], 4),
+            }
+            if summary is not None:
+                metrics['summary'] = summary
+            if candidate_data:
+                metrics['attributes'] = self._format_attributes(classification)
+            results.append(metrics)
+        return results
+
+    def _format_attributes(self, classifications: dict) -> dict:
+        """Top label per category, or None when it does not pass the threshold."""
+        attributes = {}
+        for category, classification in classifications.items():
+            top_label = classification['labels'][0]
+            top_score = classification['scores'][0]
             
-            # 3. Multi-Attribute Classification (Zero-Shot)
+            if top_score > 0.4: # Threshold
+                attributes[category] = {
+                    "label": top_label,
+                    "score": round(top_score, 4)
+                }
+            else:
+                attributes[category] = None
+        return attributes
+
+    def _classify(self, texts: list, candidate_data: dict) -> list[dict]:
+        """Zero-shot results of several texts with the configured backend (pipeline format)."""
+        if self.classifier_backend == "siglip":
+            return self.text_classifier.classify(texts, candidate_data)
+        if self.single_pass:
+            return self._classify_texts(texts, candidate_data)
+        return [
+            {category: self.classifier(text, labels, multi_label=False)
+             for category, labels in candidate_data.items() if labels}
+            for text in texts
+        ]
+
+    def _classify_categories(self, text: str, candidate_data: dict) -> dict:
+        """
+        Zero-shot classification of every category in one batched pass.
+
+        Builds the (premise, hypothesis) pair of every label of every category, runs
+        them through the NLI model `batch_size` pairs at a time and applies the
+        softmax over entailment logits per category, exactly like the
+        zero-shot pipeline does with `multi_label=False`.
+
+        Returns:
+            dict: Category -> {"labels": [...], "scores": [...]} sorted by score (pipeline format).
+        """
+        return self._classify_texts([text], candidate_data)[0]
+
+    def _classify_texts(self, texts: list, candidate_data: dict) -> list[dict]:
+        """`_classify_categories` for several premises; all their pairs share the batches."""
+        categories = [(category, list(labels)) for category, labels in candidate_data.items() if labels]
+        if not categories:
+            return [{} for _ in texts]
+
+        hypotheses = [self.HYPOTHESIS_TEMPLATE.format(label) for _, labels in categories for label in labels]
+        pairs = [(text, hypothesis) for text in texts for hypothesis in hypotheses]
+        tokenizer = self.classifier.tokenizer
+        model = self.classifier.model
+        entailment_id = self.classifier.entailment_id
+
+        entail_logits = []
+        with torch.no_grad():
+            for start in range(0, len(pairs), self.batch_size):
+                premises, batch = zip(*pairs[start:start + self.batch_size])
+                inputs = tokenizer(
+                    list(premises), list(batch),
+                    padding=True, truncation="only_first", return_tensors="pt"
+                ).to(model.device)
+                logits = model(**inputs).logits
+                entail_logits.append(logits[:, entailment_id].float().cpu().numpy())
+        entail_logits = np.concatenate(entail_logits).reshape(len(texts), len(hypotheses))
+
+        outputs = []
+        for row in entail_logits:
+            results = {}
+            offset = 0
+            for category, labels in categories:
+                logits = row[offset:offset + len(labels)]
+                offset += len(labels)
+                scores = np.exp(logits - logits.max())
+                scores /= scores.sum()
+                # Same ordering as the pipeline (ties resolved identically)
+                order = list(reversed(scores.argsort()))
+                results[category] = {
+                    "labels": [labels[i] for i in order],
+                    "scores": [float(scores[i]) for i in order],
+                }
+            outputs.append(results)
+        return outputs
+
+    def iter_chunks(self, text: str):
+        """
+        Yields overlapping windows of `chunk_tokens` tokens (sharing `chunk_overlap` tokens).
+
+        The text is tokenized block by block, so only about one window of token
+        offsets is held at a time, whatever the document length. Windows are cut on
+        token boundaries and returned as the original text slice.
+        """
+        # Window on the BART tokenizer; without BART-MNLI, on the sentiment one.
+        tokenizer = self._tokenizer("classifier" if self.classifier_backend == "mnli" else "sentiment_analyzer")
+        if not getattr(tokenizer, "is_fast", False):
+            # Slow tokenizers have no offsets: approximate with ~4 characters per token.
+            size, step = self.chunk_tokens * 4, (self.chunk_tokens - self.chunk_overlap) * 4
+            for start in range(0, max(len(text) - self.chunk_overlap * 4, 1), step):
+                yield text[start:start + size]
+            return
+
+        block_chars = self.chunk_tokens * 8
+        spans = deque()  # (start, end) character offsets of pending tokens
+        emitted = False
+        position = 0
+        while position < len(text):
+            end = min(len(text), position + block_chars)
+            if end < len(text):
+                # Never split a word between two blocks
+                cut = text.rfind(" ", position, end)
+                if cut > position: end = cut
+            encoding = tokenizer(text[position:end], add_special_tokens=False, return_offsets_mapping=True)
+            spans.extend((position + a, position + b) for a, b in encoding["offset_mapping"] if b > a)
+            position = end
+
+            while len(spans) >= self.chunk_tokens:
+                yield text[spans[0][0]:spans[self.chunk_tokens - 1][1]]
+                emitted = True
+                for _ in range(self.chunk_tokens - self.chunk_overlap):
+                    spans.popleft()
+
+        # Tail: skip it when it only repeats the overlap of the last window
+        if spans and (not emitted or len(spans) > self.chunk_overlap):
+            yield text[spans[0][0]:spans[-1][1]]
+
+    def _summarize_batch(self, texts: list) -> list:
+        """
+        Summaries of several texts; falls back to the texts themselves.
+
+        Each text keeps the `max_length` analyze_text gives it, so texts are grouped by
+        that value and each group runs as one call (long documents all share 130).
+        """
+        if not any(len(t) > 100 for t in texts):
+            return list(texts)
+        groups = {}
+        for index, text in enumerate(texts):
+            # Dynamic max_length to avoid errors with short inputs
+            groups.setdefault(max(30, min(130, len(text) // 2)), []).append(index)
+
+        summaries = list(texts)
+        for max_len, indices in groups.items():
+            try:
+                outputs = self.summarizer(
+                    [texts[i] for i in indices], max_length=max_len, min_length=10, do_sample=False,
+                    truncation=True, batch_size=len(indices)
+                )
+                for i, output in zip(indices, outputs):
+                    summaries[i] = output['summary_text']
+            except Exception as e:
+                print(f"      ⚠️ Summarization skipped: {e}")
+        return summaries
+
+    def _fold_summaries(self, summaries: list, new: list) -> list:
+        """Appends window summaries, re-summarizing them once they exceed 3000 characters."""
+        summaries = summaries + list(new)
+        if sum(len(summary) for summary in summaries) > 3000:
+            summaries = self._summarize_batch([" ".join(summaries)])
+        return summaries
+
+    def _source_sentiment(self, texts: list) -> list:
+        """
+        Sentiment read directly from the source texts.
+
+        Each text is split into token windows (the sentiment model reads at most 512
+        tokens); all windows run as one batch and each text gets the length-weighted
+        POSITIVE probability of its windows. Returns (label, score) per text.
+        """
+        windows, owners = [], []
+        for index, text in enumerate(texts):
+            for window in self.iter_chunks(text):
+                windows.append(window)
+                owners.append(index)
+
+        positive_weight = [0.0] * len(texts)
+        total_weight = [0] * len(texts)
+        if windows:
+            outputs = self.sentiment_analyzer(windows, truncation=True, batch_size=self.chunk_batch)
+            for index, window, sentiment in zip(owners, windows, outputs):
+                positive = sentiment['score'] if sentiment['label'] == "POSITIVE" else 1 - sentiment['score']
+                positive_weight[index] += len(window) * positive
+                total_weight[index] += len(window)
+
+        results = []
+        for weight, total in zip(positive_weight, total_weight):
+            positive = weight / total if total else 0.5
+            results.append(("POSITIVE" if positive >= 0.5 else "NEGATIVE", max(positive, 1 - positive)))
+        return results
+
+    def summarize(self, text: str, streaming: bool = None) -> str:
+        """
+        Summary of a text, computed on demand and cached.
+
+        With `defer_summary`, analysis never summarizes; consumers that need a
+        summary ask for it here. Results are kept in memory and, when the result
+        cache is enabled, across runs.
+
+        Args:
+            text: Input text content.
+            streaming: Summarize texts longer than 3000 characters window by window (defaults
+                       to the engine setting). Otherwise only the first 3000 characters are summarized.
+        """
+        if not text:
+            return ""
+        streaming = self._streams(text, streaming)
+        signature = {"summarizer": self.MODELS["summarizer"][1]}
+        if streaming:
+            signature["chunks"] = [self.chunk_tokens, self.chunk_overlap]
+        key = content_key(text, None, signature)
+
+        with self._summaries_lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+                return summary
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                summary = cached['summary']
+
+        if summary is None:
+            if streaming:
+                summaries = []
+                chunks = self.iter_chunks(text)
+                while True:
+                    group = list(islice(chunks, self.chunk_batch))
+                    if not group:
+                        break
+                    summaries = self._fold_summaries(summaries, self._summarize_batch(group))
+                summary = " ".join(summaries)
+            else:
+                summary = self._summarize_batch([text[:3000]])[0]
+            if self.cache:
+                self.cache.put(key, {'summary': summary})
+
+        with self._summaries_lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > 512:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def _analyze_streaming(self, text: str, candidate_data: dict = None) -> dict:
+        """
+        Whole-document analysis in overlapping token windows.
+
+        Windows go through summarization, sentiment and zero-shot `chunk_batch` at a
+        time. Only running aggregates are kept between batches:
+        - summary: window summaries, re-summarized whenever they exceed 3000 characters;
+        - sentiment: length-weighted probability of POSITIVE over all windows;
+        - attributes: per-label score over windows ("max" or length-weighted "mean").
+
+        With the prefilter on, windows without any lexicon hit are skipped entirely.
+        """
+        categories = {category: list(labels) for category, labels in (candidate_data or {}).items() if labels}
+        label_scores = {category: np.zeros(len(labels)) for category, labels in categories.items()}
+        summaries = []
+        positive_weight = 0.0
+        total_weight = 0
+        chunk_count = 0
+
+        try:
+            chunks = (
+                chunk for chunk in self.iter_chunks(text)
+                if self._passes_prefilter(chunk, categories, chunk=True)
+            )
+            while True:
+                group = list(islice(chunks, self.chunk_batch))
+                if not group:
+                    break
+                chunk_count += len(group)
+                weights = [len(chunk) for chunk in group]
+                total_weight += sum(weights)
+
+                # 1. Summarize (batch), unless deferred: then sentiment reads the windows themselves
+                if self.defer_summary:
+                    sentiment_inputs = group
+                else:
+                    sentiment_inputs = self._summarize_batch(group)
+                    summaries = self._fold_summaries(summaries, sentiment_inputs)
+
+                # 2. Sentiment on the window summaries (as in single-text mode)
+                for weight, sentiment in zip(weights, self.sentiment_analyzer(sentiment_inputs, truncation=True, batch_size=self.chunk_batch)):
+                    positive = sentiment['score'] if sentiment['label'] == "POSITIVE" else 1 - sentiment['score']
+                    positive_weight += weight * positive
+
+                # 3. Zero-shot per window
+                if categories:
+                    classifications = self._classify(group, categories)
+                    for weight, classification in zip(weights, classifications):
+                        for category, labels in categories.items():
+                            by_label = dict(zip(classification[category]['labels'], classification[category]['scores']))
+                            scores = np.array([by_label[label] for label in labels])
+                            if self.chunk_aggregation == "max":
+                                np.maximum(label_scores[category], scores, out=label_scores[category])
+                            else:
+                                label_scores[category] += weight * scores
+
+            if not chunk_count:
+                return self._skipped_result(categories) if self.prefilter and categories else {}
+
+            positive = positive_weight / total_weight
+            metrics = {
+                'sentiment': "POSITIVE" if positive >= 0.5 else "NEGATIVE",
+                'sentiment_score': round(max(positive, 1 - positive), 4),
+                'chunks': chunk_count,
+            }
+            if not self.defer_summary:
+                metrics['summary'] = " ".join(summaries)
+
             if candidate_data:
                 metrics['attributes'] = {}
-                
-                for category, labels in candidate_data.items():
-                    if not labels: continue
-                    
-                    classification = self.classifier(
-                        processed_text, 
-                        labels, 
-                        multi_label=False
-                    )
-                    
-                    top_label = classification['labels'][0]
-                    top_score = classification['scores'][0]
-                    
-                    if top_score > 0.4: # Threshold
+                for category, labels in categories.items():
+                    scores = label_scores[category]
+                    if self.chunk_aggregation == "mean":
+                        scores = scores / total_weight
+                    best = int(np.argmax(scores))
+                    if scores[best] > 0.4: # Threshold
                         metrics['attributes'][category] = {
-                            "label": top_label,
-                            "score": round(top_score, 4)
+                            "label": labels[best],
+                            "score": round(float(scores[best]), 4)
                         }
                     else:
                         metrics['attributes'][category] = None
-            
+
             return metrics
 
         except Exception as e:
@@ -0,0 +1,92 @@
+import numpy as np
+import torch
+from modules.brains.vision_engine import VisionEngine
+
+class EmbeddingTextClassifier:
+    """
+    Fast zero-shot text classifier on the SigLIP text tower.
+
+    Instead of one BART-MNLI pass per (text, label) pair, every text window and
+    every label is encoded once, and labels are scored by cosine similarity:
+    - label embeddings ("This example is {label}.") are cached process-wide by VisionEngine;
+    - texts are split into short word windows (the SigLIP text tower reads 64 tokens),
+      and each label keeps its best window similarity;
+    - similarities are scaled by the model's logit scale and soft-maxed per category.
+
+    The weights are the ones VisionEngine already loaded (shared through the model
+    registry), so this backend costs no extra memory when vision runs in the same process.
+    """
+    HYPOTHESIS_TEMPLATE = "This example is {}."
+
+    def __init__(self, model_id: str = "google/siglip-base-patch16-224", backend: str = None,
+                 window_words: int = 40, window_overlap: int = 8, batch_size: int = 32):
+        self.vision = VisionEngine(model_id=model_id, embedding_mode=True, backend=backend)
+        self.model_id = model_id
+        self.window_words = window_words
+        self.window_overlap = window_overlap
+        self.batch_size = batch_size
+
+    def release(self):
+        """Returns the shared SigLIP weights to the registry."""
+        self.vision.release()
+
+    def _windows(self, text: str) -> list:
+        words = text.split()
+        if len(words) <= self.window_words:
+            return [" ".join(words)]
+        step = self.window_words - self.window_overlap
+        return [" ".join(words[start:start + self.window_words])
+                for start in range(0, len(words) - self.window_overlap, step)]
+
+    def classify(self, texts: list, candidate_data: dict) -> list[dict]:
+        """
+        Returns, per text, category -> {"labels": [...], "scores": [...]} sorted by score,
+        the same format as the zero-shot pipeline.
+        """
+        categories = [(category, list(labels)) for category, labels in candidate_data.items() if labels]
+        if not categories:
+            return [{} for _ in texts]
+
+        label_embeds = torch.cat([
+            self.vision._text_features([self.HYPOTHESIS_TEMPLATE.format(label) for label in labels])
+            for _, labels in categories
+        ], dim=0)
+
+        # Every window of every text, encoded in batches
+        windows, owners = [], []
+        for index, text in enumerate(texts):
+            for window in self._windows(text):
+                windows.append(window)
+                owners.append(index)
+
+        similarities = []
+        for start in range(0, len(windows), self.batch_size):
+            text_embeds = self.vision.embed_texts(windows[start:start + self.batch_size])
+            similarities.append((text_embeds @ label_embeds.t()).float().cpu().numpy())
+        similarities = np.concatenate(similarities) if similarities else np.zeros((0, label_embeds.shape[0]))
+
+        # Best window per label and text
+        owners = np.array(owners)
+        best = np.full((len(texts), label_embeds.shape[0]), -1.0, dtype=np.float32)
+        for index in range(len(texts)):
+            rows = similarities[owners == index]
+            if len(rows):
+                best[index] = rows.max(axis=0)
+
+        scale = float(self.vision.model.logit_scale.detach().exp())
+        outputs = []
+        for row in best:
+            results = {}
+            offset = 0
+            for category, labels in categories:
+                logits = row[offset:offset + len(labels)] * scale
+                offset += len(labels)
+                scores = np.exp(logits - logits.max())
+                scores /= scores.sum()
+                order = list(reversed(scores.argsort()))
+                results[category] = {
+                    "labels": [labels[i] for i in order],
+                    "scores": [float(scores[i]) for i in order],
+                }
+            outputs.append(results)
+        return outputs
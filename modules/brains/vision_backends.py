@@ -0,0 +1,237 @@
+"""
+CPU inference backends for VisionEngine.
+
+- "torch": fp32 PyTorch (default).
+- "int8":  PyTorch with dynamic int8 quantization of every Linear layer.
+- "onnx":  ONNX Runtime sessions for the image and text towers, exported once with
+           `python -m modules.brains.vision_backends export`.
+
+Every backend exposes the same surface VisionEngine relies on
+(`get_image_features`, `get_text_features`, `logit_scale`, `logit_bias`), so the
+rest of the pipeline does not know which one is active.
+
+Usage:
+    python -m modules.brains.vision_backends export --output resources/models/siglip-onnx [--quantize]
+    python -m modules.brains.vision_backends parity --fixtures resources/fixtures/images --backend onnx
+"""
+import os
+import json
+import time
+import inspect
+import argparse
+import torch
+
+BACKENDS = ("torch", "int8", "onnx")
+DEFAULT_ONNX_DIR = "resources/models/siglip-onnx"
+
+
+def features_tensor(features) -> torch.Tensor:
+    """`get_*_features` returns a tensor in transformers 4.x and a ModelOutput in 5.x."""
+    if isinstance(features, torch.Tensor):
+        return features
+    return features.pooler_output
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of Linear layers (weights int8, activations quantized on the fly)."""
+    return torch.ao.quantization.quantize_dynamic(model.cpu(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class _ImageTower(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return features_tensor(self.model.get_image_features(pixel_values=pixel_values))
+
+
+class _TextTower(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask=None):
+        return features_tensor(self.model.get_text_features(input_ids=input_ids, attention_mask=attention_mask))
+
+
+class OnnxZeroShotModel:
+    """
+    Drop-in replacement for the zero-shot model backed by two ONNX Runtime sessions.
+    Only the embedding path is supported (VisionEngine forces `embedding_mode`).
+    """
+    def __init__(self, onnx_dir: str):
+        import onnxruntime as ort
+
+        with open(os.path.join(onnx_dir, "head.json")) as f:
+            head = json.load(f)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+        self.image_session = ort.InferenceSession(os.path.join(onnx_dir, head["image_model"]), options, providers=providers)
+        self.text_session = ort.InferenceSession(os.path.join(onnx_dir, head["text_model"]), options, providers=providers)
+        self.text_inputs = [i.name for i in self.text_session.get_inputs()]
+
+        self.logit_scale = torch.tensor(head["logit_scale"])
+        self.logit_bias = torch.tensor(head["logit_bias"]) if head.get("logit_bias") is not None else None
+
+    def get_image_features(self, pixel_values):
+        output = self.image_session.run(None, {"pixel_values": pixel_values.cpu().numpy()})[0]
+        return torch.from_numpy(output)
+
+    def get_text_features(self, **text_inputs):
+        feed = {name: text_inputs[name].cpu().numpy() for name in self.text_inputs if name in text_inputs}
+        output = self.text_session.run(None, feed)[0]
+        return torch.from_numpy(output)
+
+
+def export_onnx(model_id: str, output_dir: str, quantize: bool = False, opset: int = 17) -> str:
+    """
+    One-time export of the image and text towers to ONNX.
+
+    Args:
+        model_id: HuggingFace model id.
+        output_dir: Destination directory (created if needed).
+        quantize: Also apply ONNX Runtime dynamic int8 weight quantization.
+                  Dynamic quantization needs no calibration data.
+    """
+    from transformers import AutoProcessor, AutoModelForZeroShotImageClassification
+    from PIL import Image
+
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"📦 [VisionBackends] Exporting {model_id} to ONNX -> {output_dir}")
+
+    processor = AutoProcessor.from_pretrained(model_id)
+    model = AutoModelForZeroShotImageClassification.from_pretrained(model_id).eval()
+
+    sample_pixels = processor(images=[Image.new("RGB", (224, 224))], return_tensors="pt")["pixel_values"]
+    sample_text = processor(text=["a photo", "a photo of denim"], return_tensors="pt", padding="max_length", max_length=64, truncation=True)
+    text_names = [name for name in ("input_ids", "attention_mask") if name in sample_text]
+
+    export_kwargs = {"opset_version": opset}
+    # torch >= 2.9 defaults to the torch.export-based exporter; keep the tracer, which honours dynamic_axes.
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False
+
+    with torch.no_grad():
+        torch.onnx.export(
+            _ImageTower(model), (sample_pixels,), os.path.join(output_dir, "image.onnx"),
+            input_names=["pixel_values"], output_names=["image_embeds"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+            **export_kwargs,
+        )
+        torch.onnx.export(
+            _TextTower(model), tuple(sample_text[name] for name in text_names), os.path.join(output_dir, "text.onnx"),
+            input_names=text_names, output_names=["text_embeds"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in text_names}, "text_embeds": {0: "batch"}},
+            **export_kwargs,
+        )
+
+    image_model, text_model = "image.onnx", "text.onnx"
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        for name in ("image", "text"):
+            quantize_dynamic(
+                os.path.join(output_dir, f"{name}.onnx"),
+                os.path.join(output_dir, f"{name}.int8.onnx"),
+                weight_type=QuantType.QInt8,
+            )
+        image_model, text_model = "image.int8.onnx", "text.int8.onnx"
+
+    logit_bias = getattr(model, "logit_bias", None)
+    head = {
+        "model_id": model_id,
+        "image_model": image_model,
+        "text_model": text_model,
+        "logit_scale": float(model.logit_scale.detach()),
+        "logit_bias": float(logit_bias.detach()) if logit_bias is not None else None,
+    }
+    with open(os.path.join(output_dir, "head.json"), "w") as f:
+        json.dump(head, f, indent=2)
+
+    print(f"   ✅ Exported ({image_model}, {text_model}).")
+    return output_dir
+
+
+def parity_check(fixtures_dir: str, backend: str, candidate_data: dict, onnx_dir: str = None,
+                 model_id: str = "google/siglip-base-patch16-224") -> dict:
+    """
+    Compares label decisions of `backend` against fp32 PyTorch on a local image set.
+
+    Returns:
+        dict: Per-category label agreement, mean absolute top-score difference and
+              per-image latency of both backends.
+    """
+    from modules.brains.vision_engine import VisionEngine
+
+    extensions = (".jpg", ".jpeg", ".png", ".webp")
+    images = sorted(
+        os.path.join(fixtures_dir, name) for name in os.listdir(fixtures_dir)
+        if name.lower().endswith(extensions)
+    )
+    if not images:
+        raise ValueError(f"No fixture images found in {fixtures_dir}")
+
+    def run(engine):
+        engine.analyze_batch(images[:1], candidate_data)  # warm-up (label embeddings, graph init)
+        start = time.perf_counter()
+        results = engine.analyze_batch(images, candidate_data)
+        return results, (time.perf_counter() - start) / len(images)
+
+    reference, reference_latency = run(VisionEngine(model_id=model_id, embedding_mode=True, backend="torch"))
+    candidate, candidate_latency = run(VisionEngine(model_id=model_id, embedding_mode=True, backend=backend, onnx_dir=onnx_dir))
+
+    report = {"images": len(images), "categories": {}}
+    for category in candidate_data:
+        pairs = [(r[category], c[category]) for r, c in zip(reference, candidate) if category in r and category in c]
+        if not pairs: continue
+        report["categories"][category] = {
+            "agreement": round(sum(r["label"] == c["label"] for r, c in pairs) / len(pairs), 4),
+            "mean_score_diff": round(sum(abs(r["score"] - c["score"]) for r, c in pairs) / len(pairs), 4),
+        }
+    report["fp32_ms_per_image"] = round(reference_latency * 1000, 1)
+    report[f"{backend}_ms_per_image"] = round(candidate_latency * 1000, 1)
+    report["speedup"] = round(reference_latency / candidate_latency, 2) if candidate_latency else None
+    return report
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="VisionEngine CPU backends: export and parity check.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = sub.add_parser("export", help="Export the SigLIP towers to ONNX (one-time).")
+    export_cmd.add_argument("--model-id", default="google/siglip-base-patch16-224")
+    export_cmd.add_argument("--output", default=DEFAULT_ONNX_DIR)
+    export_cmd.add_argument("--quantize", action="store_true", help="Also write int8 ONNX weights.")
+
+    parity_cmd = sub.add_parser("parity", help="Compare a backend against fp32 on local images.")
+    parity_cmd.add_argument("--fixtures", required=True, help="Directory of sample images.")
+    parity_cmd.add_argument("--backend", choices=[b for b in BACKENDS if b != "torch"], required=True)
+    parity_cmd.add_argument("--onnx-dir", default=DEFAULT_ONNX_DIR)
+    parity_cmd.add_argument("--model-id", default="google/siglip-base-patch16-224")
+    parity_cmd.add_argument("--min-agreement", type=float, default=0.95)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_onnx(args.model_id, args.output, quantize=args.quantize)
+        return
+
+    # Same candidate labels as the pipeline's vision phase
+    candidates = {
+        "fabric": ["Sherpa", "Velvet", "Lino", "Denim", "Satin", "Metallic", "Leather", "Jersey", "Piel de Durazno", "Polilycra", "Piel de Conejo"],
+        "texture": ["Soft", "Rough", "Fluffy", "Smooth", "Quilted", "Wrinkled"],
+        "finish": ["Matte", "Shiny", "Distressed", "Sublimated", "Metallic"],
+    }
+    report = parity_check(args.fixtures, args.backend, candidates, onnx_dir=args.onnx_dir, model_id=args.model_id)
+    print(json.dumps(report, indent=2))
+
+    worst = min(item["agreement"] for item in report["categories"].values())
+    if worst < args.min_agreement:
+        print(f"❌ Label agreement {worst:.2%} below {args.min_agreement:.0%}")
+        raise SystemExit(1)
+    print(f"✅ Parity OK (min agreement {worst:.2%}, speedup x{report['speedup']})")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,83 +1,355 @@
 from transformers import AutoProcessor, AutoModelForZeroShotImageClassification
 from PIL import Image
 import torch
-import requests
-from io import BytesIO
+import numpy as np
 import os
+import threading
+from modules.brains.model_registry import get_model_registry
+from modules.integration.image_loader import get_image_loader
+from modules.brains.embedding_cache import get_embedding_cache
+from modules.brains.vision_backends import BACKENDS, DEFAULT_ONNX_DIR, OnnxZeroShotModel, features_tensor, quantize_int8
 
 class VisionEngine:
-    def __init__(self, model_id="google/siglip-base-patch16-224"):
-        print(f"🧠 [VisionEngine] Loading SigLIP model: {model_id}...")
+    # Normalized label embeddings shared by every engine in the process,
+    # keyed by (model_id, precision, label tuple). Labels are encoded once per run.
+    _text_embedding_cache = {}
+    _text_cache_lock = threading.Lock()
+
+    # SigLIP pools the text tower at the last position and was trained on texts padded
+    # to 64 tokens. Padding to the longest text of a batch would pool shorter texts from
+    # a pad token, making their embedding depend on the rest of the batch.
+    TEXT_MAX_LENGTH = 64
+
+    def __init__(self, model_id="google/siglip-base-patch16-224", embedding_mode: bool = False,
+                 cache_dir: str = None, cache_max_entries: int = 50_000,
+                 backend: str = None, onnx_dir: str = None):
+        """
+        Args:
+            model_id: HuggingFace model id (SigLIP/CLIP family).
+            embedding_mode: If True, each image is encoded once and every category is
+                            scored with a matrix product against cached label embeddings,
+                            instead of a full image+text forward pass per category.
+            cache_dir: Optional directory for the persistent image embedding cache.
+                       Enabling it implies `embedding_mode`.
+            cache_max_entries: Maximum number of images kept in the cache (LRU eviction).
+            backend: "torch" (fp32), "int8" (dynamic-quantized PyTorch) or "onnx" (ONNX Runtime).
+                     Defaults to $ANTC_VISION_BACKEND, then "torch". int8/onnx run on CPU.
+            onnx_dir: Exported ONNX model directory (defaults to $ANTC_VISION_ONNX_DIR).
+        """
+        self.model_id = model_id
+        self.backend = backend or os.getenv("ANTC_VISION_BACKEND", "torch")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown vision backend '{self.backend}'. Expected one of {BACKENDS}.")
+        self.onnx_dir = onnx_dir or os.getenv("ANTC_VISION_ONNX_DIR", DEFAULT_ONNX_DIR)
+
+        # The ONNX graphs only export the two towers, so scoring goes through embeddings.
+        self.embedding_mode = embedding_mode or bool(cache_dir) or self.backend == "onnx"
+        self.precision = {"torch": "fp32"}.get(self.backend, self.backend)
+        # Embeddings differ slightly between backends, so each one gets its own cache namespace.
+        cache_namespace = model_id if self.precision == "fp32" else f"{model_id}@{self.precision}"
+        self.cache = get_embedding_cache(cache_dir, cache_namespace, cache_max_entries) if cache_dir else None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         if torch.backends.mps.is_available():
             self.device = "mps"
-        
-        print(f"   ⚙️ Device: {self.device}")
+        if self.backend != "torch":
+            self.device = "cpu"
+
+        # Weights are shared process-wide: hunters and the pipeline reuse one copy.
+        self.processor, self.model = get_model_registry().acquire(
+            model_id, self.device, self.precision, self._load_model
+        )
+
+    def _load_model(self):
+        print(f"🧠 [VisionEngine] Loading SigLIP model: {self.model_id}...")
+        print(f"   ⚙️ Device: {self.device} | Backend: {self.backend}")
+        processor = AutoProcessor.from_pretrained(self.model_id)
+
+        if self.backend == "onnx":
+            model = OnnxZeroShotModel(self.onnx_dir)
+        else:
+            model = AutoModelForZeroShotImageClassification.from_pretrained(self.model_id).to(self.device)
+            model.eval()
+            if self.backend == "int8":
+                model = quantize_int8(model)
 
-        self.processor = AutoProcessor.from_pretrained(model_id)
-        self.model = AutoModelForZeroShotImageClassification.from_pretrained(model_id).to(self.device)
         print("   ✅ Model loaded.")
+        return processor, model
+
+    def release(self):
+        """Returns the shared model to the registry. The engine is unusable afterwards."""
+        if self.model is not None:
+            get_model_registry().release(self.model_id, self.device, self.precision)
+            self.processor, self.model = None, None
+
+    def _read_bytes(self, image_path: str) -> bytes:
+        """Reads the raw (encoded) bytes of an image from a local path or URL."""
+        return get_image_loader().get_bytes(image_path)
 
     def _load_image(self, image_path: str) -> Image.Image:
-        """Loads an image from a local path or URL."""
-        if image_path.startswith("http"):
-            # Set User-Agent to avoid 403 blocks from some CDNs
-            headers = {"User-Agent": "Mozilla/5.0"}
-            response = requests.get(image_path, headers=headers)
-            return Image.open(BytesIO(response.content)).convert("RGB")
-        elif image_path.startswith("file://"):
-            return Image.open(image_path.replace("file://", "")).convert("RGB")
+        """Loads an image from a local path or URL (decoded once per run, shared with ColorEngine)."""
+        return get_image_loader().get_image(image_path)
+
+    def _prepare_image(self, image_input, color_order: str = "RGB"):
+        """
+        Normalizes a Path/URL (str), PIL Image or NumPy frame into an RGB image.
+        NumPy frames stay arrays (the processor accepts them); BGR frames are flipped with a view.
+        """
+        if isinstance(image_input, str):
+            return self._load_image(image_input)
+        if isinstance(image_input, np.ndarray):
+            return _rgb_view(image_input, color_order)
+        return image_input.convert("RGB")
+
+    def _prepare_cached(self, image_input, candidate_data: dict, color_order: str = "RGB"):
+        """
+        Cache-aware version of `_prepare_image`.
+
+        Returns (key, result, image): on a hit `result` is the classification and
+        the image is never decoded nor sent through the model; on a miss `image`
+        is the decoded RGB image to classify.
+        """
+        if isinstance(image_input, str):
+            data = self._read_bytes(image_input)
+            key = self.cache.key_for(data)
+        elif isinstance(image_input, np.ndarray):
+            image = _rgb_view(image_input, color_order)
+            # Same key as the equivalent PIL image: RGB pixel bytes + (width, height).
+            size = (image.shape[1], image.shape[0])
+            key = self.cache.key_for(image.tobytes() + repr(size).encode("utf-8"))
         else:
-            return Image.open(image_path).convert("RGB")
+            image = image_input.convert("RGB")
+            key = self.cache.key_for(image.tobytes() + repr(image.size).encode("utf-8"))
+
+        embedding = self.cache.get_embedding(key)
+        if embedding is not None:
+            result = {}
+            missing = {}
+            for category, labels in candidate_data.items():
+                if not labels: continue
+                cached = self.cache.get_scores(key, category, labels)
+                if cached is None:
+                    missing[category] = labels
+                else:
+                    result[category] = cached
 
-    def analyze(self, image_input, candidate_data: dict) -> dict:
+            # New label sets only cost a matrix product against the stored embedding.
+            if missing:
+                image_embeds = torch.from_numpy(embedding).unsqueeze(0).to(self.device)
+                scored = self._score_embeddings(image_embeds, missing)[0]
+                self.cache.put_scores(key, scored, missing)
+                result.update(scored)
+            return key, result, None
+
+        if isinstance(image_input, str):
+            image = self._load_image(image_input)
+        return key, None, image
+
+    def _score_images(self, images: list, candidate_data: dict) -> list[dict]:
+        """
+        Runs Zero-Shot Classification for a list of already-loaded PIL images.
+        The pixel batch is collated once and reused for every category.
+        """
+        if self.embedding_mode:
+            return self._score_embeddings(self._embed_images(images), candidate_data)
+
+        pixel_values = self.processor(images=images, return_tensors="pt")["pixel_values"].to(self.device)
+
+        results = [{} for _ in images]
+        for category, labels in candidate_data.items():
+            if not labels: continue
+
+            text_inputs = self._tokenize_texts(labels)
+
+            with torch.no_grad():
+                outputs = self.model(pixel_values=pixel_values, **text_inputs)
+
+            probs = outputs.logits_per_image.softmax(dim=-1).cpu().numpy()
+
+            for row, image_probs in enumerate(probs):
+                results[row][category] = self._format_scores(labels, image_probs)
+
+        return results
+
+    def _embed_images(self, images: list) -> torch.Tensor:
+        """Collates PIL images and returns their normalized embeddings (one image-tower pass)."""
+        pixel_values = self.processor(images=images, return_tensors="pt")["pixel_values"].to(self.device)
+        with torch.no_grad():
+            return self._image_features(pixel_values)
+
+    def _image_features(self, pixel_values) -> torch.Tensor:
+        """Runs the image tower once and returns L2-normalized image embeddings."""
+        image_embeds = features_tensor(self.model.get_image_features(pixel_values=pixel_values))
+        return image_embeds / image_embeds.norm(p=2, dim=-1, keepdim=True)
+
+    def _text_features(self, labels: list) -> torch.Tensor:
+        """Returns L2-normalized label embeddings, encoding each label set only once."""
+        key = (self.model_id, self.precision, tuple(labels))
+        with self._text_cache_lock:
+            cached = self._text_embedding_cache.get(key)
+        if cached is not None:
+            return cached.to(self.device)
+
+        # Same tokenization as the per-category path so both modes agree.
+        text_inputs = self._tokenize_texts(labels)
+        with torch.no_grad():
+            text_embeds = features_tensor(self.model.get_text_features(**text_inputs))
+        text_embeds = text_embeds / text_embeds.norm(p=2, dim=-1, keepdim=True)
+
+        with self._text_cache_lock:
+            self._text_embedding_cache[key] = text_embeds
+        return text_embeds
+
+    def _tokenize_texts(self, texts: list):
+        """Fixed-length tokenization (see TEXT_MAX_LENGTH): a text encodes the same alone or in a batch."""
+        return self.processor(
+            text=list(texts), return_tensors="pt",
+            padding="max_length", max_length=self.TEXT_MAX_LENGTH, truncation=True
+        ).to(self.device)
+
+    def embed_texts(self, texts: list) -> torch.Tensor:
+        """
+        L2-normalized text-tower embeddings of arbitrary texts (not cached).
+        Long texts are truncated to the tower's context (64 tokens for SigLIP).
+        """
+        text_inputs = self._tokenize_texts(texts)
+        with torch.no_grad():
+            text_embeds = features_tensor(self.model.get_text_features(**text_inputs))
+        return text_embeds / text_embeds.norm(p=2, dim=-1, keepdim=True)
+
+    def _score_embeddings(self, image_embeds: torch.Tensor, candidate_data: dict) -> list[dict]:
+        """
+        Scores every category with a single matrix product between the image
+        embeddings and the concatenated (cached) label embeddings.
+        """
+        results = [{} for _ in range(image_embeds.shape[0])]
+        categories = [(category, labels) for category, labels in candidate_data.items() if labels]
+        if not categories:
+            return results
+
+        text_embeds = torch.cat([self._text_features(labels) for _, labels in categories], dim=0)
+
+        with torch.no_grad():
+            # Same logit head as the model: scaled cosine similarity (+ bias for SigLIP).
+            logits = image_embeds @ text_embeds.t() * self.model.logit_scale.exp()
+            logit_bias = getattr(self.model, "logit_bias", None)
+            if logit_bias is not None:
+                logits = logits + logit_bias
+
+        offset = 0
+        for category, labels in categories:
+            probs = logits[:, offset:offset + len(labels)].softmax(dim=-1).cpu().numpy()
+            offset += len(labels)
+            for row, image_probs in enumerate(probs):
+                results[row][category] = self._format_scores(labels, image_probs)
+
+        return results
+
+    def _format_scores(self, labels: list, probs) -> dict:
+        """Zips label probabilities and picks the best one."""
+        scores = {label: float(probs[i]) for i, label in enumerate(labels)}
+        sorted_scores = dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+        best_label = list(sorted_scores.keys())[0]
+        best_score = list(sorted_scores.values())[0]
+
+        return {
+            "label": best_label,
+            "score": best_score,
+            "all_scores": sorted_scores
+        }
+
+    def analyze(self, image_input, candidate_data: dict, color_order: str = "RGB") -> dict:
         """
         Performs Multi-Attribute Zero-Shot Classification.
         
         Args:
-            image_input: Path/URL (str) or PIL Image object.
+            image_input: Path/URL (str), PIL Image object or NumPy frame (H, W, 3) uint8.
             candidate_data: Dictionary of categories and labels.
+            color_order: Channel order of NumPy frames ("RGB" or "BGR" as read by OpenCV).
+        """
+        return self.analyze_batch([image_input], candidate_data, batch_size=1, color_order=color_order)[0]
+
+    def analyze_batch(self, images: list, candidate_data: dict, batch_size: int = 16, color_order: str = "RGB") -> list[dict]:
         """
-        try:
-            if isinstance(image_input, str):
-                image = self._load_image(image_input)
-            else:
-                image = image_input.convert("RGB")
+        Batched version of `analyze`. Images are collated into tensors of up to
+        `batch_size` and classified in a single forward pass per category.
+        
+        Args:
+            images: List of Path/URL (str), PIL Image objects or NumPy frames.
+            candidate_data: Dictionary of categories and labels.
+            batch_size: Maximum number of images per forward pass.
+            color_order: Channel order of NumPy frames ("RGB" or "BGR").
             
-            results = {}
+        Returns:
+            list: One result dict per input, in input order. Images that fail to
+                  load or classify get an empty dict, like `analyze`.
+        """
+        results = [{} for _ in images]
+        loader = get_image_loader()
+        # With the embedding cache, only bytes are prefetched: hits never decode the image.
+        decode = self.cache is None
+        loader.prefetch(images[:batch_size], decode=decode)
 
-            # Process each category independently using the same model
-            for category, labels in candidate_data.items():
-                if not labels: continue
-                
-                inputs = self.processor(images=image, text=labels, return_tensors="pt", padding=True).to(self.device)
-                
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                
-                logits = outputs.logits_per_image[0]
-                probs = logits.softmax(dim=-1).cpu().numpy()
-                
-                # Zip scores
-                scores = {label: float(probs[i]) for i, label in enumerate(labels)}
-                sorted_scores = dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
-                
-                # Get best
-                best_label = list(sorted_scores.keys())[0]
-                best_score = list(sorted_scores.values())[0]
-                
-                results[category] = {
-                    "label": best_label,
-                    "score": best_score,
-                    "all_scores": sorted_scores
-                }
+        for start in range(0, len(images), batch_size):
+            # Fetch (and decode, without cache) the next batch in the background while this one is classified.
+            loader.prefetch(images[start + batch_size:start + 2 * batch_size], decode=decode)
+            loaded = []
+            positions = []
+            keys = []
+            for offset, image_input in enumerate(images[start:start + batch_size]):
+                try:
+                    if self.cache:
+                        key, cached, image = self._prepare_cached(image_input, candidate_data, color_order)
+                        if cached is not None:
+                            results[start + offset] = cached
+                            continue
+                        keys.append(key)
+                    else:
+                        image = self._prepare_image(image_input, color_order)
+                    loaded.append(image)
+                    positions.append(start + offset)
+                except Exception:
+                    # Keeping logs quiet for minor image errors to avoid clutter
+                    continue
 
-            return results
+            if not loaded:
+                continue
+
+            try:
+                batch_results = self._classify(loaded, keys, candidate_data)
+            except Exception as e:
+                if len(loaded) > 1:
+                    print(f"   ⚠️ [VisionEngine] Batch failed ({e}). Falling back to single-image mode.")
+                batch_results = []
+                for i, image in enumerate(loaded):
+                    try:
+                        batch_results.append(self._classify([image], keys[i:i + 1], candidate_data)[0])
+                    except Exception:
+                        batch_results.append({})
+
+            for position, result in zip(positions, batch_results):
+                results[position] = result
+
+        return results
+
+    def _classify(self, images: list, keys: list, candidate_data: dict) -> list[dict]:
+        """Scores loaded images and, when caching, stores their embeddings and results."""
+        if not self.cache:
+            return self._score_images(images, candidate_data)
+
+        image_embeds = self._embed_images(images)
+        batch_results = self._score_embeddings(image_embeds, candidate_data)
+        embeddings = image_embeds.cpu().numpy()
+        for key, embedding, result in zip(keys, embeddings, batch_results):
+            self.cache.put(key, embedding, result, candidate_data)
+        return batch_results
 
-        except Exception as e:
-            # print(f"   ❌ [VisionEngine] Error processing {image_path}: {e}")
-            # Keeping logs quiet for minor image errors to avoid clutter
-            return {}
+def _rgb_view(frame: np.ndarray, color_order: str) -> np.ndarray:
+    """Returns an RGB (H, W, 3) view of a uint8 frame without copying pixel data."""
+    if frame.ndim != 3 or frame.shape[2] not in (3, 4):
+        raise ValueError(f"Expected an (H, W, 3) frame, got shape {frame.shape}")
+    frame = frame[..., :3]
+    return frame[..., ::-1] if color_order.upper() == "BGR" else frame
 
 if __name__ == "__main__":
     vision = VisionEngine()
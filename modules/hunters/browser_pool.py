@@ -0,0 +1,193 @@
+import os
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Recursos que el navegador no necesita descargar: los hunters solo leen el DOM y
+# descargan las imágenes por su cuenta (requests), así que bloqueamos vídeo, audio y fuentes.
+BLOCKED_URL_PATTERNS = [
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.m4a",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
+
+class BrowserPool:
+    """
+    Pool de sesiones de Chrome (Selenium) reutilizables entre búsquedas.
+
+    Arrancar Chrome (y resolver el chromedriver) cuesta segundos y cientos de MB por búsqueda.
+    Este pool:
+    1.  Resuelve el chromedriver UNA sola vez por proceso.
+    2.  Mantiene navegadores "calientes" que se reutilizan entre búsquedas.
+    3.  Limita la concurrencia: como máximo `max_size` navegadores vivos a la vez;
+        quien pida un navegador con el pool lleno espera a que otro lo devuelva.
+    4.  Arranca en modo headless (SELENIUM_HEADLESS) y sin cargar imágenes, vídeo ni fuentes.
+    5.  Recicla cada navegador tras `max_uses` sesiones para contener fugas de memoria de Chrome.
+
+    Uso:
+        with get_browser_pool().session() as driver:
+            driver.get(url)
+    """
+    def __init__(self, max_size: int = None, headless: bool = None, block_media: bool = True, max_uses: int = 20):
+        self.max_size = max_size or int(os.getenv("SELENIUM_POOL_SIZE", "2"))
+        if headless is None:
+            headless = os.getenv("SELENIUM_HEADLESS", "true").lower() in ("1", "true", "yes")
+        self.headless = headless
+        self.block_media = block_media
+        self.max_uses = max_uses
+
+        self._idle = queue.LifoQueue()  # Navegadores libres (el último devuelto es el más "caliente")
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._uses = {}                  # id(driver) -> sesiones servidas
+        self._lock = threading.Lock()
+        self._service = None             # chromedriver resuelto (una vez por proceso)
+        self._closed = False
+
+        self.created = 0
+        self.reused = 0
+
+    def _options(self) -> Options:
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+            # Ventana de escritorio: con la ventana mínima de headless Pinterest carga menos pines por scroll.
+            options.add_argument("--window-size=1920,1080")
+        # 'no-sandbox' y 'disable-dev-shm-usage' son críticos para entornos Docker/Linux con recursos limitados.
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+
+        # Intenta ocultar que el navegador está siendo controlado por un script de automatización
+        # para evitar detecciones y bloqueos simples.
+        options.add_argument("--disable-blink-features=AutomationControlled")
+
+        # Define un User-Agent de navegador real (Mac OS) para simular tráfico legítimo.
+        options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+        if self.block_media:
+            # No renderizar imágenes: el atributo src sigue en el DOM, pero Chrome no las descarga ni decodifica.
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+            })
+        return options
+
+    def _create_driver(self):
+        options = self._options()
+        try:
+            if self._service is None:
+                # Intentar instalar automáticamente el driver de Chrome compatible con la versión del navegador instalada.
+                self._service = Service(ChromeDriverManager().install())
+            driver = webdriver.Chrome(service=self._service, options=options)
+        except Exception as e:
+            print(f"⚠️ [BrowserPool] Falló init del driver con manager, intentando default: {e}")
+            # Si falla el gestor automático (común en algunos servidores), intentamos usar el driver del sistema.
+            driver = webdriver.Chrome(options=options)
+
+        if self.block_media:
+            try:
+                # Vídeo, audio y fuentes no tienen ajuste de contenido: los bloqueamos por URL (DevTools).
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+            except Exception as e:
+                print(f"⚠️ [BrowserPool] No se pudo bloquear multimedia: {e}")
+
+        with self._lock:
+            self.created += 1
+        return driver
+
+    def acquire(self, timeout: float = None):
+        """Entrega un navegador libre (o crea uno); espera si ya hay `max_size` en uso."""
+        if self._closed:
+            raise RuntimeError("BrowserPool cerrado")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No hay navegadores libres en el pool")
+        try:
+            try:
+                driver = self._idle.get_nowait()
+                with self._lock:
+                    self.reused += 1
+            except queue.Empty:
+                driver = self._create_driver()
+        except Exception:
+            self._slots.release()
+            raise
+        return driver
+
+    def release(self, driver, broken: bool = False):
+        """
+        Devuelve un navegador al pool. Se descarta si está roto, si ya sirvió `max_uses`
+        sesiones o si el pool está cerrado.
+        """
+        try:
+            with self._lock:
+                uses = self._uses.get(id(driver), 0) + 1
+                self._uses[id(driver)] = uses
+
+            if not broken and not self._closed and uses < self.max_uses:
+                try:
+                    # Página en blanco: libera la memoria de la búsqueda anterior y comprueba que sigue vivo.
+                    driver.get("about:blank")
+                    self._idle.put(driver)
+                    return
+                except WebDriverException:
+                    pass
+            self._quit(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: float = None):
+        """Context manager: `with pool.session() as driver: ...`."""
+        driver = self.acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """Cierra todos los navegadores libres (los que están en uso se cierran al devolverse)."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "created": self.created,
+            "reused": self.reused,
+            "idle": self._idle.qsize(),
+        }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """Devuelve el pool de navegadores del proceso (se cierra automáticamente al salir)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
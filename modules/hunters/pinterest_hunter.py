@@ -1,20 +1,46 @@
+import os
 import time
 import uuid
-import requests
 import io
+import queue
+import re
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from PIL import Image
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from modules.hunters.browser_pool import get_browser_pool
 from modules.integration.storage import get_storage_provider
+from modules.integration.image_loader import get_image_loader
+from modules.integration.phash_index import get_dedup_index, dhash
 from modules.brains.vision_engine import VisionEngine
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException
+
+# Devuelve los src de las <img> que aún no se han leído y las marca como vistas.
+# La marca guarda el propio src: Pinterest recicla nodos al virtualizar la lista, y un nodo
+# reciclado con una imagen nueva vuelve a contar como nuevo.
+COLLECT_NEW_IMAGES_JS = """
+const srcs = [];
+for (const img of document.getElementsByTagName('img')) {
+    const src = img.src;
+    if (src && img.dataset.antcSeen !== src) {
+        img.dataset.antcSeen = src;
+        srcs.push(src);
+    }
+}
+return srcs;
+"""
+
+# Verdadero cuando hay contenido nuevo tras un scroll: alguna <img> sin leer o una página más alta.
+HAS_NEW_CONTENT_JS = """
+if (document.body.scrollHeight > arguments[0]) return true;
+for (const img of document.getElementsByTagName('img')) {
+    if (img.src && img.dataset.antcSeen !== img.src) return true;
+}
+return false;
+"""
 
 class PinterestHunter:
     """
@@ -27,102 +53,159 @@ class PinterestHunter:
     4.  Filtrar imágenes irrelevantes (texto, anuncios) usando Inteligencia Artificial (VisionEngine).
     5.  Descargar y almacenar solo las imágenes de alta calidad validadas.
     """
-    def __init__(self):
+    # Candidatos del filtro de relevancia (Zero-Shot).
+    # Basado en pruebas, "editorial fashion photography" funciona mejor para capturar
+    # imágenes reales de alta calidad, mientras que las categorías negativas específicas
+    # ayudan a descartar collages y banners promocionales que antes se colaban.
+    RELEVANCE_CANDIDATES = {
+        "content_type": [
+            # Categorías Positivas (Lo que queremos)
+            "editorial fashion photography",   # Foto de moda estilo editorial (alta calidad).
+            "street style photography",        # Foto de estilo callejero (personas reales).
+            "clothing product photography",    # Foto de producto limpia.
+
+            # Categorías Negativas (Lo que queremos evitar)
+            "promotional graphic with text",   # Gráficos con texto de venta/promo.
+            "digital collage with text",       # Collages de varias fotos + texto (muy común en Pinterest).
+            "infographic layout",              # Infografías o guías de estilo con mucho texto.
+            "text overlay"                     # Imágenes donde el texto tapa la ropa.
+        ]
+    }
+
+    # Lista blanca de categorías aceptadas.
+    ALLOWED_TYPES = [
+        "editorial fashion photography",
+        "street style photography", 
+        "clothing product photography"
+    ]
+
+    # Variantes de tamaño que sirve el CDN de Pinterest (i.pinimg.com/<variante>/...) y su ancho en px.
+    # '/originals/' no tiene ancho fijo: se considera el más grande.
+    SIZE_VARIANTS = [("236x", 236), ("474x", 474), ("564x", 564), ("736x", 736), ("originals", None)]
+    SIZE_VARIANT_PATTERN = re.compile(r"/(\d+x|originals)/")
+
+    def __init__(self, browser_pool=None):
         # Inicializar el proveedor de almacenamiento configurado (S3, disco local, etc.)
         self.storage = get_storage_provider()
         
+        # Cargador de imágenes compartido (descarga y decodifica cada imagen una sola vez).
+        self.loader = get_image_loader()
+        
         # Inicializar el Motor de Visión (IA) para análisis y filtrado de contenido visual.
         # Esto cargará el modelo CLIP/SigLIP en memoria.
-        self.vision = VisionEngine()
+        self.vision = VisionEngine(embedding_mode=True, cache_dir=os.getenv("ANTC_VISION_CACHE_DIR"))
         
-        # Configuración de opciones para el navegador Chrome (Selenium)
-        self.options = Options()
-        # 'no-sandbox' y 'disable-dev-shm-usage' son críticos para entornos Docker/Linux con recursos limitados.
-        self.options.add_argument("--no-sandbox")
-        self.options.add_argument("--disable-dev-shm-usage")
+        # Índice persistente de hashes perceptuales (ANTC_DEDUP_INDEX_PATH; None si no está configurado).
+        # Evita volver a descargar y clasificar la misma imagen servida por otra URL, re-pineada o de otra ejecución.
+        self.dedup = get_dedup_index()
         
-        # Intenta ocultar que el navegador está siendo controlado por un script de automatización
-        # para evitar detecciones y bloqueos simples por parte de Pinterest.
-        self.options.add_argument("--disable-blink-features=AutomationControlled")
+        # Scroll guiado por eventos (WebDriverWait) en lugar de pausas fijas:
+        # - scroll_pause: pausa mínima de cortesía entre scrolls (segundos), con un pequeño jitter.
+        # - scroll_timeout: espera máxima a que aparezca contenido nuevo tras un scroll.
+        # - max_idle_scrolls: scrolls seguidos sin contenido nuevo antes de dar la búsqueda por agotada.
+        self.scroll_pause = float(os.getenv("PINTEREST_SCROLL_PAUSE", "0.75"))
+        self.scroll_timeout = float(os.getenv("PINTEREST_SCROLL_TIMEOUT", "8"))
+        self.max_idle_scrolls = int(os.getenv("PINTEREST_MAX_IDLE_SCROLLS", "3"))
+        # Espera máxima (segundos) a las subidas pendientes una vez cubierta la cuota:
+        # una subida colgada no debe dejar la caza (ni su navegador) bloqueada para siempre.
+        self.upload_timeout = float(os.getenv("PINTEREST_UPLOAD_TIMEOUT", "60"))
         
-        # Define un User-Agent de navegador real (Mac OS) para simular tráfico legítimo.
-        self.options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        # Ancho mínimo (px) de la variante a descargar. La IA trabaja a 224 px, así que no hace falta
+        # bajar originales de varios MB: se elige la variante MÁS PEQUEÑA que cumpla este mínimo.
+        self.min_width = int(os.getenv("PINTEREST_MIN_WIDTH", "474"))
         
-    def hunt(self, query: str, limit: int = 10):
+        # Navegadores Chrome headless reutilizables (compartidos por todas las búsquedas del proceso).
+        # Se arrancan sin imágenes ni multimedia: solo leemos el DOM y descargamos por HTTP.
+        self.browsers = browser_pool or get_browser_pool()
+
+    def hunt(self, query: str, limit: int = 10, download_workers: int = 8, batch_size: int = 8,
+             queue_size: int = 64, upload_workers: int = 4):
         """
         Ejecuta el proceso completo de "caza" (búsqueda, filtrado y descarga).
         
         El flujo garantiza que se obtengan `limit` imágenes VÁLIDAS, no solo procesadas.
         
+        Arquitectura productor/consumidor (el scroll nunca espera a la IA):
+        1. Productor (hilo principal): hace scroll, lee el DOM y envía cada miniatura nueva
+           a un pool de descargas. Los futuros se encolan en una cola ACOTADA (`queue_size`),
+           que frena el scroll si las etapas siguientes van atrasadas.
+        2. Descargas: `download_workers` hilos sobre la sesión HTTP keep-alive del ImageLoader.
+        3. Clasificador (hilo dedicado): agrupa las descargas listas en lotes de hasta
+           `batch_size` y aplica el filtro de relevancia con un solo pase del VisionEngine por lote.
+        4. Subidas: las imágenes aprobadas se suben al storage en segundo plano.
+        
         Args:
             query (str): Término de búsqueda (ej. "Summer 2025 Fashion").
             limit (int): Número objetivo de imágenes válidas a descargar.
+            download_workers (int): Descargas simultáneas.
+            batch_size (int): Imágenes máximas por lote de clasificación.
+            queue_size (int): Candidatos pendientes máximos entre scroll y clasificación.
+            upload_workers (int): Subidas simultáneas al storage.
             
         Returns:
             list: Lista de diccionarios con metadatos de las imágenes capturadas.
         """
         print(f"🕵️‍♀️ [PinterestHunter] Iniciando caza para: '{query}'")
-        try:
-            # Intentar instalar automáticamente el driver de Chrome compatible con la versión del navegador instalada.
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=self.options)
-        except Exception as e:
-            print(f"⚠️ [PinterestHunter] Falló init del driver con manager, intentando default: {e}")
-            # Si falla el gestor automático (común en algunos servidores), intentamos usar el driver del sistema.
-            driver = webdriver.Chrome(options=self.options)
+        # Navegador del pool (reutilizado si hay uno libre; espera si todos están ocupados).
+        driver = self.browsers.acquire()
         
-        results = []
-        unique_urls = set()       # Registro de URLs ya descargadas para evitar duplicados exactos.
+        session = _HuntSession(query, limit, download_workers, upload_workers, queue_size)
         visited_raw_urls = set()  # Registro de URLs de origen (thumbnails) para no procesar la misma imagen dos veces.
         
+        # Consumidor: clasifica en lotes mientras el hilo principal sigue haciendo scroll.
+        classifier = threading.Thread(
+            target=self._classify_loop, args=(session, batch_size),
+            name="pinterest-classifier", daemon=True
+        )
+        classifier.start()
+        uploads_stalled = False # Cuota cubierta pero las subidas no terminaron a tiempo
+        
         try:
             # 1. Navegación Inicial
             # Construimos la URL de búsqueda y navegamos a ella.
             search_url = f"https://www.pinterest.com/search/pins/?q={query}"
             driver.get(search_url)
-            time.sleep(5) # Espera explícita para asegurar la carga del "esqueleto" de la página.
+            # Esperamos a que aparezcan las primeras imágenes (no un tiempo fijo).
+            try:
+                WebDriverWait(driver, self.scroll_timeout * 2).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "img"))
+                )
+            except TimeoutException:
+                print("⚠️ [PinterestHunter] La página no mostró imágenes a tiempo.")
             
             # 2. Bucle de Scroll Infinito
             scrolls = 0
+            idle_scrolls = 0 # Scrolls seguidos sin contenido nuevo
+            # Las imágenes visibles antes del primer scroll también cuentan.
+            new_srcs = self._read_image_srcs(driver)
             # Aumentamos agresivamente los intentos de scroll.
             # Como el filtro es estricto, necesitamos ver MUCHAS imágenes para encontrar las válidas.
             # Factor 5x: Para encontrar 10 imágenes, estamos dispuestos a scrollear 50 veces.
             max_scrolls = max(60, limit * 5)
+            upload_deadline = None
             
             # El bucle continúa MIENTRAS:
-            # a) No hayamos alcanzado el número deseado de resultados (len(results) < limit)
+            # a) No hayamos alcanzado el número deseado de resultados (session.done)
             # b) Y no hayamos excedido el límite de intentos de scroll.
-            while len(results) < limit and scrolls < max_scrolls:
-                print(f"📜 [PinterestHunter] Scroll {scrolls+1}/{max_scrolls} | Válidos: {len(results)}/{limit}")
-                
-                # Ejecutar JavaScript para hacer scroll hasta el fondo absoluto de la página actual.
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                # Pausa variable: aumentar un poco el tiempo máximo para dar margen a redes lentas
-                time.sleep(random.uniform(2, 5))
+            while not session.done.is_set() and scrolls < max_scrolls:
+                # Si ya hay `limit` imágenes aprobadas subiéndose, no hace falta más contenido:
+                # esperamos a las subidas (si alguna falla, el scroll se reanuda), como mucho `upload_timeout`.
+                if session.accepted >= limit:
+                    if upload_deadline is None:
+                        upload_deadline = time.monotonic() + self.upload_timeout
+                    elif time.monotonic() > upload_deadline:
+                        print(f"⏱️ [PinterestHunter] Subidas sin terminar tras {self.upload_timeout:.0f}s. Se cancelan las pendientes.")
+                        uploads_stalled = True
+                        break
+                    session.done.wait(0.5)
+                    continue
+                upload_deadline = None
                 
-                # 3. Extracción de Elementos del DOM
-                # Buscamos todas las etiquetas <img> presentes en la página tras el scroll.
-                # IMPORTANTE: Extraemos las URLs (src) inmediatamente a una lista de strings.
-                # Si iteramos sobre los objetos WebElement (img) direcatmente mientras hacemos operaciones lentas
-                # (descargas/IA), el DOM puede cambiar (virtualización) y provocar 'StaleElementReferenceException'.
-                try:
-                    current_images = driver.find_elements(By.TAG_NAME, "img")
-                    # Captura robusta de URLs ignorando elementos que desaparecen instantáneamente
-                    raw_srcs = []
-                    for img in current_images:
-                        try:
-                            src = img.get_attribute("src")
-                            if src:
-                                raw_srcs.append(src)
-                        except StaleElementReferenceException:
-                            continue # El elemento desapareció, lo ignoramos
-                except Exception as e:
-                    print(f"⚠️ [PinterestHunter] Error leyendo DOM: {e}")
-                    raw_srcs = []
+                print(f"📜 [PinterestHunter] Scroll {scrolls+1}/{max_scrolls} | Válidos: {len(session.results)}/{limit}")
                 
-                for raw_src in raw_srcs:
-                    # Verificación rápida: si ya cumplimos la cuota en medio del procesamiento de este lote, paramos.
-                    if len(results) >= limit:
+                # 3. Extracción de Elementos del DOM (solo los nodos nuevos desde la pasada anterior)
+                for raw_src in new_srcs:
+                    if session.done.is_set():
                         break
                         
                     # Validar que la URL es nueva
@@ -134,155 +217,387 @@ class PinterestHunter:
                     # Pinterest usa sufijos como /75x75/ para avatares de usuarios. Los descartamos inmediatamente.
                     if "/75x75/" in raw_src or "/60x60/" in raw_src:
                         continue
-                        
-                    # 5. Lógica de "Mejora de Resolución"
-                    # Pinterest sirve miniaturas (/236x/). Aquí intentamos deducir la URL de la imagen original.
-                    candidates = []
-                    if "/236x/" in raw_src:
-                        # Prioridad 1: '/originals/' es la imagen subida originalmente (máxima calidad).
-                        candidates.append(raw_src.replace("/236x/", "/originals/"))
-                        # Prioridad 2: '/564x/' es una versión de alta calidad estándar.
-                        candidates.append(raw_src.replace("/236x/", "/564x/"))
-                        # Prioridad 3: Fallback a la miniatura original si las otras fallan.
-                        candidates.append(raw_src) 
-                    else:
-                        candidates.append(raw_src)
-                    
-                    # Intentar descargar la imagen probando los candidatos en orden de calidad.
-                    image_bytes = None
-                    successful_url = None
-                    
-                    for url in candidates:
-                        if url in unique_urls: 
-                            continue # Ya tenemos esta URL exacta guardada.
-                        
-                        try:
-                            # Descargamos a memoria (BytesIO) para analizar sin guardar en disco todavía.
-                            image_bytes = self._download_image(url)
-                            successful_url = url
-                            break # ¡Éxito! Salimos del bucle de candidatos.
-                        except Exception:
-                            # Si falla (ej. 404 porque no existe '/originals/'), probamos el siguiente candidato.
-                            continue
-                    
-                    if not image_bytes or not successful_url:
-                        continue
-
-                    # 6. Filtrado Inteligente con Vision Engine (IA)
-                    # Aquí es donde aplicamos el filtro semántico solicitado por el usuario.
-                    try:
-                        # Convertimos bytes a objeto PIL Image para que la IA pueda "verlo".
-                        pil_image = Image.open(image_bytes)
-                        
-                        # Llamamos al método de validación que usa Zero-Shot classification.
-                        if not self._is_relevant_image(pil_image, query):
-                            # Si la IA dice que es texto, un banner o irrelevante, la descartamos.
-                            # debug: print(f"   🗑️ Descartada por filtro IA.")
-                            continue
-                    except Exception as e:
-                        print(f"   ⚠️ [PinterestHunter] Error analizando imagen (IA): {e}")
-                        continue
-                        
-                    # Si llegamos aquí, la imagen pasó todos los filtros. Registramos la URL final.
-                    unique_urls.add(successful_url)
                     
-                    # 7. Persistencia y Almacenamiento Final
-                    try:
-                        # IMPORTANTE: Rebobinar el puntero del archivo en memoria al inicio para poder leerlo de nuevo al subirlo.
-                        image_bytes.seek(0)
-                        
-                        file_name = f"pinterest_{uuid.uuid4().hex[:8]}.jpg"
-                        # Subir archivo al storage definitivo.
-                        stored_url = self.storage.upload_file(image_bytes, file_name)
-                        
-                        # Guardar metadatos del resultado.
-                        result = {
-                            "s3_url": stored_url,
-                            "source_url": successful_url,
-                            "query": query,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        results.append(result)
-                        print(f"   ✅ [PinterestHunter] Guardado ({len(results)}/{limit}): {stored_url}")
-                        
-                    except Exception as e:
-                        print(f"⚠️ [PinterestHunter] Error al guardar en storage {successful_url}: {e}")
-                        continue
+                    # 5. Descarga en segundo plano; el futuro pasa al clasificador por la cola acotada.
+                    future = session.downloads.submit(self._download_best, session, raw_src)
+                    if not session.enqueue(future):
+                        break
                 
+                if session.done.is_set():
+                    break
+                
+                # Scroll y espera a que Pinterest cargue más contenido.
                 scrolls += 1
+                if self._scroll_and_wait(driver):
+                    idle_scrolls = 0
+                else:
+                    idle_scrolls += 1
+                    if idle_scrolls >= self.max_idle_scrolls:
+                        print(f"🛑 [PinterestHunter] Sin contenido nuevo tras {idle_scrolls} scrolls. Fin de resultados.")
+                        break
+                new_srcs = self._read_image_srcs(driver)
                 
         except Exception as e:
             print(f"❌ [PinterestHunter] Error crítico durante la ejecución: {e}")
         finally:
-            # Siempre cerrar el navegador, incluso si hubo error, para evitar zombis de Chrome.
-            driver.quit()
+            # Siempre devolver el navegador al pool, incluso si hubo error (si quedó roto, el pool lo cierra).
+            self.browsers.release(driver)
+            # Fin del productor: el clasificador procesa lo pendiente y termina.
+            session.close()
+            classifier.join()
+            session.downloads.shutdown(wait=True, cancel_futures=True)
+            session.probes.shutdown(wait=True, cancel_futures=True)
+            # Subidas colgadas: no las esperamos (las que aún no empezaron se cancelan).
+            session.uploads.shutdown(wait=not uploads_stalled, cancel_futures=uploads_stalled)
         
+        results = session.results[:limit]
         print(f"🏁 [PinterestHunter] Caza terminada. Capturados {len(results)} assets válidos.")
         return results
 
-    def _is_relevant_image(self, image: Image.Image, query: str) -> bool:
+    def hunt_many(self, queries: list, limit: int = 10, **kwargs) -> dict:
+        """
+        Ejecuta varias búsquedas en paralelo compartiendo el pool de navegadores.
+        
+        La concurrencia queda acotada por el tamaño del pool (SELENIUM_POOL_SIZE):
+        las búsquedas que no tienen navegador libre esperan a que otra termine.
+        
+        Returns:
+            dict: query -> lista de resultados (como `hunt`).
+        """
+        with ThreadPoolExecutor(max_workers=self.browsers.max_size, thread_name_prefix="pinterest-hunt") as executor:
+            futures = {query: executor.submit(self.hunt, query, limit, **kwargs) for query in queries}
+            return {query: future.result() for query, future in futures.items()}
+
+    def _scroll_and_wait(self, driver) -> bool:
+        """
+        Hace scroll hasta el fondo y espera (WebDriverWait) a que aparezcan imágenes nuevas
+        o crezca la página, en lugar de dormir un tiempo fijo.
+        
+        Siempre respeta la pausa mínima de cortesía `scroll_pause` (con jitter) para no
+        martillear a Pinterest cuando el contenido carga muy rápido.
+        
+        Returns:
+            bool: True si llegó contenido nuevo antes de `scroll_timeout`.
+        """
+        started = time.monotonic()
+        # Ejecutar JavaScript para hacer scroll hasta el fondo absoluto de la página actual.
+        height = driver.execute_script("const h = document.body.scrollHeight; window.scrollTo(0, h); return h;")
+        try:
+            WebDriverWait(driver, self.scroll_timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script(HAS_NEW_CONTENT_JS, height)
+            )
+            loaded = True
+        except TimeoutException:
+            loaded = False
+        
+        floor = self.scroll_pause * random.uniform(1, 1.5)
+        remaining = floor - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+        return loaded
+
+    def _read_image_srcs(self, driver) -> list:
+        """
+        Lee las URLs (src) de las etiquetas <img> que aparecieron desde la última lectura.
+        
+        Se hace en un único script del navegador que marca cada nodo leído (data-antc-seen),
+        así cada pasada solo devuelve los nodos nuevos en vez de releer toda la página, y
+        obtenemos strings directamente: sin WebElements no hay 'StaleElementReferenceException'
+        aunque el DOM cambie (virtualización) durante las descargas.
+        """
+        try:
+            return driver.execute_script(COLLECT_NEW_IMAGES_JS) or []
+        except Exception as e:
+            print(f"⚠️ [PinterestHunter] Error leyendo DOM: {e}")
+            return []
+
+    def _candidate_urls(self, raw_src: str) -> list:
+        """
+        Lógica de "Resolución Suficiente".
+        Pinterest sirve miniaturas (/236x/). A partir de ellas deducimos las demás variantes
+        del CDN y las ordenamos por preferencia:
+        1. Las que cumplen `min_width`, de menor a mayor (la más ligera que sirve para la IA).
+        2. Las que no llegan al mínimo, de mayor a menor (fallback, incluida la miniatura original).
         """
-        Analiza el contenido visual de la imagen usando VisionEngine para determinar si es relevante.
+        match = self.SIZE_VARIANT_PATTERN.search(raw_src)
+        if not match or "pinimg.com" not in raw_src:
+            return [raw_src]
         
-        Utiliza clasificación Zero-Shot para distinguir entre fotos reales de moda y gráficos/texto basura.
+        variants = [
+            (raw_src[:match.start()] + f"/{name}/" + raw_src[match.end():], width)
+            for name, width in self.SIZE_VARIANTS
+        ]
+        big_enough = [(url, width) for url, width in variants if width is None or width >= self.min_width]
+        too_small = [(url, width) for url, width in variants if width is not None and width < self.min_width]
+        big_enough.sort(key=lambda item: float("inf") if item[1] is None else item[1])
+        too_small.sort(key=lambda item: item[1], reverse=True)
+        urls = [url for url, _ in big_enough + too_small]
+        if raw_src not in urls:
+            urls.append(raw_src) # Variante desconocida: la miniatura original queda como último recurso.
+        return urls
+
+    def _download_best(self, session, raw_src: str):
         """
-        # Definir categorías semánticas refinadas para mejorar el filtrado.
-        # Basado en pruebas, "editorial fashion photography" funciona mejor para capturar
-        # imágenes reales de alta calidad, mientras que las categorías negativas específicas
-        # ayudan a descartar collages y banners promocionales que antes se colaban.
-        candidates = {
-            "content_type": [
-                # Categorías Positivas (Lo que queremos)
-                "editorial fashion photography",   # Foto de moda estilo editorial (alta calidad).
-                "street style photography",        # Foto de estilo callejero (personas reales).
-                "clothing product photography",    # Foto de producto limpia.
-
-                # Categorías Negativas (Lo que queremos evitar)
-                "promotional graphic with text",   # Gráficos con texto de venta/promo.
-                "digital collage with text",       # Collages de varias fotos + texto (muy común en Pinterest).
-                "infographic layout",              # Infografías o guías de estilo con mucho texto.
-                "text overlay"                     # Imágenes donde el texto tapa la ropa.
-            ]
-        }
+        (Hilo de descargas) Elige la variante preferida que existe y la descarga.
+        
+        Antes de nada, el hash perceptual (dHash) de la miniatura se consulta en el índice de
+        deduplicación: si la imagen ya se guardó (aquí o en otra ejecución) o se está evaluando,
+        no se descarga en tamaño completo ni pasa por la IA. Las descartadas salen del índice.
         
-        # Ejecutar inferencia en el VisionEngine. Retorna las probabilidades.
-        analysis = self.vision.analyze(image, candidates)
+        Todas las variantes se sondean A LA VEZ con peticiones HEAD (sesión keep-alive del ImageLoader):
+        se recorren en orden de preferencia y gana la primera que responde OK; los sondeos
+        perdedores que aún no empezaron se cancelan. Solo la ganadora se descarga (GET en streaming
+        con tope de tamaño). Los bytes quedan en el ImageLoader, así la clasificación y la subida
+        no vuelven a descargarlos.
         
+        Returns:
+            tuple: (raw_src, url descargada) o None.
+        """
+        if session.done.is_set():
+            return None
+        if not self._claim_new_image(raw_src):
+            return None
+        
+        url = self._download_variant(session, self._candidate_urls(raw_src))
+        if url is None:
+            self._release_image(raw_src) # No llegó a evaluarse: que pueda reintentarse en otra ejecución.
+            return None
+        return raw_src, url
+
+    def _claim_new_image(self, raw_src: str) -> bool:
+        """Registra la miniatura en el índice de deduplicación. False si ya se había visto una casi idéntica."""
+        if self.dedup is None:
+            return True
+        try:
+            # La miniatura (/236x/) pesa pocos KB y su dHash coincide con el de las variantes grandes.
+            thumbnail_hash = dhash(self.loader.get_image(raw_src))
+            return self.dedup.claim(thumbnail_hash, source=raw_src, namespace="pinterest") is None
+        except Exception as e:
+            # Sin miniatura (o sin índice) no podemos deduplicar; seguimos con la descarga normal.
+            print(f"⚠️ [PinterestHunter] Deduplicación omitida para {raw_src}: {e}")
+            return True
+
+    def _release_image(self, raw_src: str):
+        """Saca la miniatura del índice de deduplicación (no llegó a guardarse)."""
+        if self.dedup is not None:
+            self.dedup.discard(raw_src)
+
+    def _download_variant(self, session, candidates: list):
+        """Sondea las variantes y descarga la preferida. Devuelve la URL descargada o None."""
+        # Sin variantes que negociar (una sola URL): descarga directa, sin sondeo previo.
+        probes = [session.probes.submit(self.loader.head, url) for url in candidates] if len(candidates) > 1 else [None]
+        try:
+            for url, probe in zip(candidates, probes):
+                if probe is not None:
+                    try:
+                        length = probe.result()
+                    except Exception:
+                        # Si falla (ej. 403/404 porque no existe '/originals/'), probamos el siguiente candidato.
+                        continue
+                    if length and length > self.loader.max_asset_bytes:
+                        continue # Demasiado pesada: mejor una variante más pequeña.
+                
+                if not session.claim_url(url):
+                    return None # Ya tenemos (o estamos procesando) esta URL exacta.
+                try:
+                    self._download_image(url)
+                    return url # ¡Éxito!
+                except Exception:
+                    continue
+        finally:
+            for probe in probes:
+                if probe is not None:
+                    probe.cancel()
+        return None
+
+    def _classify_loop(self, session, batch_size: int):
+        """
+        (Hilo clasificador) Consume las descargas de la cola y filtra por lotes con el VisionEngine.
+        Toma lo que ya esté encolado (hasta `batch_size`) para no esperar lotes completos.
+        Si el hilo muere por un error inesperado, lo marca en la sesión para que el productor no
+        se quede bloqueado en la cola llena.
+        """
+        try:
+            self._classify_batches(session, batch_size)
+        except Exception as e:
+            print(f"❌ [PinterestHunter] El clasificador se detuvo: {e}")
+            session.fail()
+
+    def _classify_batches(self, session, batch_size: int):
+        finished = False
+        while not finished:
+            batch = []
+            item = session.pending.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = session.pending.get_nowait()
+                except queue.Empty:
+                    break
+            finished = item is None
+
+            downloaded = []
+            for future in batch:
+                try:
+                    item = future.result()
+                except Exception:
+                    item = None
+                if item:
+                    downloaded.append(item)
+
+            if session.done.is_set():
+                # Cuota cumplida: solo drenamos la cola. Lo descargado sin evaluar sale del índice.
+                for raw_src, _ in downloaded:
+                    self._release_image(raw_src)
+                continue
+            if not downloaded:
+                continue
+            urls = [url for _, url in downloaded]
+
+            # 6. Filtrado Inteligente con Vision Engine (IA), un pase por lote.
+            try:
+                analyses = self.vision.analyze_batch(urls, self.RELEVANCE_CANDIDATES, batch_size=len(urls))
+            except Exception as e:
+                print(f"   ⚠️ [PinterestHunter] Error analizando imágenes (IA): {e}")
+                for raw_src, _ in downloaded:
+                    self._release_image(raw_src)
+                continue
+
+            for (raw_src, url), analysis in zip(downloaded, analyses):
+                # Si la IA dice que es texto, un banner o irrelevante, la descartamos.
+                # En el índice de deduplicación solo quedan las imágenes guardadas.
+                if not self._is_relevant_analysis(analysis):
+                    self._release_image(raw_src)
+                    continue
+                # 7. Persistencia en segundo plano (solo hasta completar la cuota).
+                if session.reserve():
+                    session.uploads.submit(self._upload, session, raw_src, url)
+                else:
+                    self._release_image(raw_src)
+
+    def _upload(self, session, raw_src: str, url: str):
+        """(Hilo de subidas) Sube una imagen aprobada al storage y registra sus metadatos."""
+        try:
+            file_name = f"pinterest_{uuid.uuid4().hex[:8]}.jpg"
+            # Subir archivo al storage definitivo (bytes ya en memoria en el ImageLoader).
+            stored_url = self.storage.upload_file(self._download_image(url), file_name)
+        except Exception as e:
+            print(f"⚠️ [PinterestHunter] Error al guardar en storage {url}: {e}")
+            session.unreserve()
+            self._release_image(raw_src)
+            return
+
+        # Guardar metadatos del resultado.
+        count = session.add_result({
+            "s3_url": stored_url,
+            "source_url": url,
+            "query": session.query,
+            "timestamp": datetime.now().isoformat()
+        })
+        print(f"   ✅ [PinterestHunter] Guardado ({count}/{session.limit}): {stored_url}")
+
+    def _is_relevant_analysis(self, analysis: dict) -> bool:
+        """Decide la relevancia a partir del resultado de VisionEngine para RELEVANCE_CANDIDATES."""
         if not analysis or "content_type" not in analysis:
             return False
             
         best_match = analysis["content_type"]["label"]
         score = analysis["content_type"]["score"]
         
-        # Lista blanca de categorías aceptadas.
-        allowed_types = [
-            "editorial fashion photography",
-            "street style photography", 
-            "clothing product photography"
-        ]
-        
         # La imagen es válida SI:
         # 1. Su categoría más probable está en la lista blanca.
         # 2. La confianza del modelo es mayor a 0.2 (20%).
         #    Nota: El umbral es bajo (0.2) porque al tener categorías negativas tan fuertes (ej. collage con 0.8),
         #    si una imagen real gana aunque sea con 0.3, es suficiente para confirmar que NO es un collage.
-        is_valid = best_match in allowed_types and score > 0.2 
+        is_valid = best_match in self.ALLOWED_TYPES and score > 0.2 
         
         return is_valid
 
     def _download_image(self, url: str) -> io.BytesIO:
         """
-        Realiza la petición HTTP para descargar los bytes de la imagen.
-        Utiliza 'stream=True' para manejo eficiente de memoria.
+        Descarga los bytes de la imagen a través del cargador compartido (ImageLoader).
+        
+        El cargador reutiliza una sesión HTTP keep-alive (con User-Agent de navegador y timeout)
+        y guarda los bytes en un LRU acotado, así los motores no vuelven a descargar la imagen.
+        La descarga es en streaming y se aborta si supera el tope de tamaño del cargador.
+        Lanza excepción si el status code no es 200 OK.
         """
-        headers = {
-            # User-Agent necesario para que el servidor de imágenes no rechace la petición (403 Forbidden).
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-        # Timeout de 10s para evitar bloqueos si la red está lenta.
-        response = requests.get(url, headers=headers, stream=True, timeout=10)
-        response.raise_for_status() # Lanza error si el status code no es 200 OK.
-        return io.BytesIO(response.content)
+        return io.BytesIO(self.loader.get_bytes(url))
+
+class _HuntSession:
+    """
+    Estado compartido de una caza entre el productor (scroll), las descargas,
+    el clasificador y las subidas.
+    """
+    def __init__(self, query: str, limit: int, download_workers: int, upload_workers: int, queue_size: int):
+        self.query = query
+        self.limit = limit
+        self.results = []
+        self.accepted = 0            # Imágenes aprobadas (subidas o subiéndose)
+        self.done = threading.Event() # Se activa al completar `limit` resultados
+        self.failed = threading.Event() # Se activa si el clasificador muere: nadie consume la cola
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.downloads = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="pinterest-download")
+        self.uploads = ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix="pinterest-upload")
+        # Sondeos HEAD de variantes de tamaño (varios por descarga)
+        self.probes = ThreadPoolExecutor(max_workers=download_workers * 2, thread_name_prefix="pinterest-probe")
+        self._unique_urls = set()    # URLs finales ya descargadas, para evitar duplicados exactos
+        self._lock = threading.Lock()
+
+    def enqueue(self, future) -> bool:
+        """Encola una descarga; bloquea mientras la cola está llena (contrapresión). False si terminó."""
+        while not self.done.is_set() and not self.failed.is_set():
+            try:
+                self.pending.put(future, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        future.cancel()
+        return False
+
+    def close(self):
+        """Marca el fin del productor para el clasificador (sin bloquear si el clasificador murió)."""
+        while not self.failed.is_set():
+            try:
+                self.pending.put(None, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def fail(self):
+        """(Clasificador) Error fatal: detiene al productor, que deja de encolar."""
+        self.failed.set()
+        self.done.set()
+
+    def claim_url(self, url: str) -> bool:
+        with self._lock:
+            if url in self._unique_urls:
+                return False
+            self._unique_urls.add(url)
+            return True
+
+    def reserve(self) -> bool:
+        """Reserva un hueco de la cuota antes de subir una imagen aprobada."""
+        with self._lock:
+            if self.accepted >= self.limit:
+                return False
+            self.accepted += 1
+            return True
+
+    def unreserve(self):
+        with self._lock:
+            self.accepted -= 1
+
+    def add_result(self, result: dict) -> int:
+        with self._lock:
+            self.results.append(result)
+            count = len(self.results)
+        if count >= self.limit:
+            self.done.set()
+        return count
+
 
 if __name__ == "__main__":
     # Bloque de prueba para ejecutar este script directamente desde la terminal.
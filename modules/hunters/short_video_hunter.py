@@ -7,14 +7,47 @@ warnings.filterwarnings("ignore", message="Support for Python version 3.9 has be
 
 import cv2
 import yt_dlp
-import uuid
 import glob
-import numpy as np
-from PIL import Image
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from modules.integration.storage import get_storage_provider
+from modules.integration.phash_index import get_dedup_index, dhash
 from modules.brains.vision_engine import VisionEngine
 
+class _DiskBudget:
+    """
+    Presupuesto de disco para los videos temporales (descargando + pendientes de procesar).
+    Siempre deja pasar al menos un video, aunque su tamaño estimado supere el tope.
+    """
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, nbytes: int, cancel) -> bool:
+        """Reserva `nbytes`; espera a que haya espacio. False si se canceló mientras esperaba."""
+        with self._cond:
+            while self.used and self.used + nbytes > self.max_bytes:
+                if cancel.is_set():
+                    return False
+                self._cond.wait(0.5)
+            if cancel.is_set():
+                return False
+            self.used += nbytes
+            return True
+
+    def resize(self, old: int, new: int):
+        with self._cond:
+            self.used += new - old
+            self._cond.notify_all()
+
+    def release(self, nbytes: int):
+        with self._cond:
+            self.used -= nbytes
+            self._cond.notify_all()
+
+
 class ShortVideoHunter:
     """
     Cazador de Videos Cortos (Shorts/Reels).
@@ -30,33 +63,80 @@ class ShortVideoHunter:
        - Analiza cada frame con IA (VisionEngine) para asegurar relevancia (moda/ropa).
        - Exige un MÍNIMO de 5 frames válidos por video para aceptarlo.
     3. Sube solo las imágenes validadas al sistema de almacenamiento.
+    4. Opcionalmente, calcula atributos (VisionEngine) y paleta (ColorEngine) directamente
+       sobre el frame en memoria, evitando el ciclo codificar -> subir -> descargar -> decodificar.
     """
 
+    # Candidatos del filtro de relevancia (positivos y negativos)
+    RELEVANCE_CANDIDATES = {
+        "content_type": [
+            # Positivos (Incluimos 'person wearing clothes' que es muy común en video)
+            "person wearing clothes",
+            "fashion outfit",
+            "editorial fashion photography",
+            "street style photography",
+            
+            # Negativos
+            "promotional graphic with text",
+            "digital collage with text",
+            "text overlay",
+            "blurry or low quality image",  # Nuevo negativo para video
+            "close-up of face only"         # Evitar selfies sin ropa visible
+        ]
+    }
+    
+    # Frames válidos mínimos para aceptar un video
+    MIN_VALID_FRAMES = 5
+
     def __init__(self):
         # Inicializar proveedor de almacenamiento (S3, Local, etc.)
         self.storage = get_storage_provider()
         
         # Inicializar Vision Engine para filtrado de contenido de frames
-        self.vision = VisionEngine()
+        self.vision = VisionEngine(embedding_mode=True, cache_dir=os.getenv("ANTC_VISION_CACHE_DIR"))
+        
+        # Índice persistente de hashes perceptuales compartido con los demás hunters (None si no está configurado).
+        # El histograma solo deduplica dentro de un video; el índice detecta frames ya vistos en
+        # re-subidas y en ejecuciones anteriores.
+        self.dedup = get_dedup_index()
+        
+        # Modo de decodificación de frames (ver `_iter_sampled_frames`): grab | seek | read
+        self.decode_mode = os.getenv("ANTC_VIDEO_DECODE_MODE", "grab").lower()
         
         # Directorio temporal para descargar los videos antes de procesarlos.
         # Se asegura de crear la carpeta si no existe.
         self.temp_dir = "temp_video_downloads"
         os.makedirs(self.temp_dir, exist_ok=True)
 
-    def hunt(self, tag: str, limit: int = 5):
+    def hunt(self, tag: str, limit: int = 5, attribute_candidates: dict = None, color_engine=None,
+             download_workers: int = None, max_disk_mb: int = None):
         """
         Método principal para buscar, descargar y procesar videos cortos.
         
+        Descarga y procesamiento se solapan: un pool acotado de descargadores va bajando los
+        siguientes candidatos mientras el hilo principal extrae y clasifica frames de los ya
+        descargados. Al alcanzar `limit` videos aceptados se cancelan las descargas pendientes
+        (y se abortan las que están en curso). El espacio ocupado en `temp_video_downloads`
+        (descargando + pendiente de procesar) nunca supera `max_disk_mb`.
+        
         Args:
             tag (str): Término de búsqueda o hashtag (ej. "Summer Fashion").
             limit (int): Número objetivo de VIDEOS COMPLETOS a procesar (cada uno aportará >= 5 frames).
+            attribute_candidates (dict): Categorías de atributos (fabric, texture...) a clasificar en el
+                mismo pase que el filtro de relevancia. El resultado se adjunta en "vision".
+            color_engine (ColorEngine): Si se indica, la paleta se extrae del frame en memoria
+                y se adjunta en "palette".
+            download_workers (int): Descargas simultáneas (por defecto ANTC_VIDEO_DOWNLOAD_WORKERS o 2).
+            max_disk_mb (int): Tope de disco para videos temporales (por defecto ANTC_VIDEO_TEMP_MAX_MB o 500).
             
         Returns:
             list: Lista de diccionarios con la metadata de los frames extraídos.
         """
         print(f"📹 [ShortVideoHunter] Iniciando búsqueda para el tag: '{tag}'")
         
+        download_workers = download_workers or int(os.getenv("ANTC_VIDEO_DOWNLOAD_WORKERS", "2"))
+        max_disk_mb = max_disk_mb or int(os.getenv("ANTC_VIDEO_TEMP_MAX_MB", "500"))
+        
         results = []
         successful_videos_count = 0
         
@@ -66,8 +146,10 @@ class ShortVideoHunter:
             'outtmpl': os.path.join(self.temp_dir, '%(id)s.%(ext)s'),
             'noplaylist': True,
             'quiet': True,
-            'concurrent_fragment_downloads': 1,
+            'concurrent_fragment_downloads': 4,
             'nowarnings': True,
+            # Ningún video puede ocupar por sí solo más que el tope de disco.
+            'max_filesize': max_disk_mb * 1024 * 1024,
         }
 
         # Construcción de query: Pedimos 'limit * 10' para tener un buffer grande,
@@ -81,69 +163,155 @@ class ShortVideoHunter:
                 # 1. Extracción de Metadatos
                 info = ydl.extract_info(search_query, download=False)
                 
-                if 'entries' in info:
-                    all_entries = info['entries']
-                else:
-                    all_entries = [info]
+            if 'entries' in info:
+                all_entries = info['entries']
+            else:
+                all_entries = [info]
 
-                # 2. Filtrado por Duración (< 120s)
-                filtered_entries = []
-                for entry in all_entries:
-                    if not entry: continue
-                    duration = entry.get('duration', 0)
-                    if 0 < duration < 120: 
-                        filtered_entries.append(entry)
-                
-                print(f"   ℹ️ Candidatos por duración (<120s): {len(filtered_entries)}")
+            # 2. Filtrado por Duración (< 120s)
+            filtered_entries = []
+            for entry in all_entries:
+                if not entry: continue
+                duration = entry.get('duration', 0)
+                if 0 < duration < 120: 
+                    filtered_entries.append(entry)
+            
+            print(f"   ℹ️ Candidatos por duración (<120s): {len(filtered_entries)}")
+        except Exception as e:
+            print(f"❌ [ShortVideoHunter] Error crítico: {e}")
+            filtered_entries = []
 
-                # 3. Proceso de Caza (Descarga -> Análisis -> Aprobación)
-                for entry in filtered_entries:
-                    # Si ya cumplimos la cuota de videos exitosos, terminamos.
-                    if successful_videos_count >= limit:
+        # 3. Proceso de Caza (Descarga || Análisis -> Aprobación)
+        cancel = threading.Event()  # Se activa al cumplir la cuota: corta descargas en curso
+        budget = _DiskBudget(max_disk_mb * 1024 * 1024)
+        downloader = ThreadPoolExecutor(max_workers=download_workers, thread_name_prefix="shorts-download")
+        # Se adelantan como mucho `download_workers + 1` videos: uno listo esperando al procesado.
+        lookahead = download_workers + 1
+        upcoming = iter(filtered_entries)
+        pending = set()
+        
+        try:
+            while True:
+                # Mantener el pool de descargas lleno mientras falten videos por aceptar.
+                while successful_videos_count < limit and len(pending) < lookahead:
+                    entry = next(upcoming, None)
+                    if entry is None:
                         break
-                        
-                    video_id = entry.get('id')
-                    video_url = entry.get('webpage_url') or entry.get('url')
-                    
-                    print(f"   ⬇️ Probando video {video_id} ({entry.get('duration')}s)...")
-                    
+                    print(f"   ⬇️ Probando video {entry.get('id')} ({entry.get('duration')}s)...")
+                    pending.add(downloader.submit(self._download_video, entry, ydl_opts, budget, cancel))
+                if not pending:
+                    break
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    video_id, video_path, reserved = None, None, 0
                     try:
-                        # Descargar
-                        ydl.download([video_url or video_id])
+                        video_id, video_path, reserved = future.result()
+                        if video_path is None:
+                            continue
                         
-                        # Localizar archivo
-                        candidates = glob.glob(os.path.join(self.temp_dir, f"{video_id}.*"))
-                        if candidates:
-                            video_path = candidates[0]
-                            
-                            # 4. Procesamiento Visual y Filtrado de Frames
-                            frames = self._process_video(video_path, parent_id=video_id, tag=tag)
-                            
-                            # Lógica crítica: Solo aceptamos el video si conseguimos al menos 5 buenos frames
-                            if len(frames) >= 5:
-                                results.extend(frames)
-                                successful_videos_count += 1
-                                print(f"      ✅ Video ACEPTADO. Frames extraídos: {len(frames)}. Progreso: {successful_videos_count}/{limit}")
-                            else:
-                                print(f"      🗑️ Video DESCARTADO. Insuficientes frames válidos ({len(frames)} < 5).")
-                            
-                            # Limpieza
-                            if os.path.exists(video_path):
-                                os.remove(video_path)
+                        # Si ya cumplimos la cuota de videos exitosos, no hace falta procesar más.
+                        if successful_videos_count >= limit:
+                            continue
+                        
+                        # 4. Procesamiento Visual y Filtrado de Frames
+                        frames = self._process_video(
+                            video_path, parent_id=video_id, tag=tag,
+                            attribute_candidates=attribute_candidates, color_engine=color_engine
+                        )
+                        
+                        # Lógica crítica: Solo aceptamos el video si conseguimos al menos 5 buenos frames
+                        if len(frames) >= self.MIN_VALID_FRAMES:
+                            results.extend(frames)
+                            successful_videos_count += 1
+                            print(f"      ✅ Video ACEPTADO. Frames extraídos: {len(frames)}. Progreso: {successful_videos_count}/{limit}")
                         else:
-                             print(f"   ⚠️ Archivo no encontrado tras descarga: {video_id}")
-
+                            print(f"      🗑️ Video DESCARTADO. Insuficientes frames válidos ({len(frames)} < {self.MIN_VALID_FRAMES}).")
                     except Exception as e:
-                        print(f"   ❌ Error procesando {video_id}: {e}")
-                        continue
-
-        except Exception as e:
-            print(f"❌ [ShortVideoHunter] Error crítico: {e}")
+                        print(f"   ❌ Error procesando {video_id or 'video'}: {e}")
+                    finally:
+                        # Limpieza (y devolver su espacio al presupuesto de disco)
+                        if video_path is not None:
+                            self._remove_video_files(video_id)
+                            budget.release(reserved)
+                
+                if successful_videos_count >= limit and not cancel.is_set():
+                    # Cuota cumplida: cancelar descargas en cola y abortar las que están en curso.
+                    cancel.set()
+                    for future in pending:
+                        future.cancel()
+        finally:
+            cancel.set()
+            downloader.shutdown(wait=True, cancel_futures=True)
+            # Descargas terminadas que ya no se procesarán
+            for future in pending:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    video_id, video_path, reserved = future.result()
+                    if video_path is not None:
+                        self._remove_video_files(video_id)
+                        budget.release(reserved)
 
         print(f"🏁 [ShortVideoHunter] Caza terminada. {successful_videos_count} videos procesados, {len(results)} frames totales.")
         return results
 
-    def _process_video(self, video_path: str, parent_id: str, tag: str) -> list:
+    def _download_video(self, entry: dict, ydl_opts: dict, budget, cancel) -> tuple:
+        """
+        (Hilo de descargas) Descarga un candidato a `temp_video_downloads`.
+        
+        Antes de empezar reserva en el presupuesto de disco el tamaño estimado del video
+        (espera si no cabe); al terminar, la reserva se ajusta al tamaño real del archivo.
+        Si `cancel` se activa, la descarga se aborta desde el hook de progreso de yt-dlp.
+        
+        Returns:
+            tuple: (video_id, ruta del video o None, bytes reservados en el presupuesto).
+        """
+        video_id = entry.get('id')
+        video_url = entry.get('webpage_url') or entry.get('url')
+        
+        # Tamaño estimado: el que informa yt-dlp o ~0.5 MB por segundo de video.
+        estimate = entry.get('filesize') or entry.get('filesize_approx') or int((entry.get('duration') or 60) * 512 * 1024)
+        if not budget.acquire(estimate, cancel):
+            return video_id, None, 0
+        
+        def abort_if_cancelled(progress):
+            if cancel.is_set():
+                raise yt_dlp.utils.DownloadCancelled("Cuota de videos cumplida")
+        
+        try:
+            # YoutubeDL no es thread-safe: una instancia por descarga.
+            with yt_dlp.YoutubeDL({**ydl_opts, 'progress_hooks': [abort_if_cancelled]}) as ydl:
+                ydl.download([video_url or video_id])
+            
+            # Localizar archivo
+            candidates = [path for path in glob.glob(os.path.join(self.temp_dir, f"{video_id}.*")) if not path.endswith(".part")]
+            if not candidates:
+                if not cancel.is_set():
+                    print(f"   ⚠️ Archivo no encontrado tras descarga: {video_id}")
+                self._remove_video_files(video_id)
+                budget.release(estimate)
+                return video_id, None, 0
+            
+            video_path = candidates[0]
+            actual = os.path.getsize(video_path)
+            budget.resize(estimate, actual)
+            return video_id, video_path, actual
+        except Exception as e:
+            if not cancel.is_set():
+                print(f"   ❌ Error descargando {video_id}: {e}")
+            self._remove_video_files(video_id)
+            budget.release(estimate)
+            return video_id, None, 0
+
+    def _remove_video_files(self, video_id: str):
+        """Borra el video y sus restos de descarga (.part, fragmentos)."""
+        for path in glob.glob(os.path.join(self.temp_dir, f"{video_id}.*")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _process_video(self, video_path: str, parent_id: str, tag: str,
+                       attribute_candidates: dict = None, color_engine=None) -> list:
         """
         Lee el video, extrae frames, los filtra con IA y guarda solo los válidos.
         
@@ -151,10 +319,16 @@ class ShortVideoHunter:
            video_path: Ruta archivo.
            parent_id: ID.
            tag: Tag.
+           attribute_candidates: Categorías extra a clasificar sobre el frame (opcional).
+           color_engine: Motor de color para la paleta del frame (opcional).
            
         Returns:
            list: Lista de objetos resultado (solo si se superó el umbral en 'hunt', 
                  pero aquí retornamos todos los válidos encontrados para que 'hunt' decida).
+        
+        En el índice de deduplicación solo quedan los frames guardados de videos aceptados:
+        los descartados por la IA, los que no se pudieron subir y, si el video no llega a
+        MIN_VALID_FRAMES, todos los suyos se sacan del índice.
         """
         # print(f"      🎞️ Analizando frames de: {os.path.basename(video_path)}")
         
@@ -167,72 +341,153 @@ class ShortVideoHunter:
 
         # Extraer 1 frame cada 1.5 segundos (un poco más frecuente para tener más oportunidades de pasar el filtro)
         sample_rate_sec = 1.5
+        frame_interval = max(1, int(round(fps * sample_rate_sec)))
         valid_frames_exctracted = []
         # Lista para almacenar histogramas de los frames aceptados
         accepted_histograms = []
-        current_frame_idx = 0
+        # Fuentes en el índice de deduplicación de los frames guardados
+        claimed_sources = []
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break 
-            
-            if current_frame_idx % frame_interval == 0:
-                # 1. Verificación de Duplicados por Histograma de Color (Semántico)
-                # El usuario quiere evitar "misma persona, misma ropa, distinta pose".
-                # El dHash falla aquí porque la pose cambia la estructura.
-                # El Histograma de Color (Hue/Saturation) es invariante a la pose: si la ropa es roja, el histograma será rojo.
+        # Solo se decodifican los frames muestreados (ver `_iter_sampled_frames`).
+        for current_frame_idx, frame in self._iter_sampled_frames(cap, frame_interval, self.decode_mode):
+            # 1. Verificación de Duplicados por Histograma de Color (Semántico)
+            # El usuario quiere evitar "misma persona, misma ropa, distinta pose".
+            # El dHash falla aquí porque la pose cambia la estructura.
+            # El Histograma de Color (Hue/Saturation) es invariante a la pose: si la ropa es roja, el histograma será rojo.
+            try:
+                current_hist = self._calculate_histogram(frame)
+                is_duplicate = False
+                
+                for existing_hist in accepted_histograms:
+                     # Comparamos correlación (1.0 = idéntico, 0.0 = nada que ver)
+                     similarity = cv2.compareHist(current_hist, existing_hist, cv2.HISTCMP_CORREL)
+                     
+                     # Si la similitud es > 0.85, asumimos que es el mismo outfit/escena.
+                     if similarity > 0.85: 
+                         is_duplicate = True
+                         break
+                
+                if is_duplicate:
+                    # print(f"         🔄 Frame descartado por redundancia de color (Mismo outfit).")
+                    continue
+            except Exception as e:
+                print(f"      ⚠️ Warning: Falló cálculo de histograma ({e}). Continuando.")
+
+            # 1.1 Verificación contra el índice de deduplicación (entre videos y ejecuciones)
+            # Si un frame casi idéntico ya se guardó, nos ahorramos el pase de IA.
+            frame_source = f"shorts:{parent_id}:{current_frame_idx}"
+            if self.dedup is not None:
                 try:
-                    current_hist = self._calculate_histogram(frame)
-                    is_duplicate = False
-                    
-                    for existing_hist in accepted_histograms:
-                         # Comparamos correlación (1.0 = idéntico, 0.0 = nada que ver)
-                         similarity = cv2.compareHist(current_hist, existing_hist, cv2.HISTCMP_CORREL)
-                         
-                         # Si la similitud es > 0.85, asumimos que es el mismo outfit/escena.
-                         if similarity > 0.85: 
-                             is_duplicate = True
-                             break
-                    
-                    if is_duplicate:
-                        # print(f"         🔄 Frame descartado por redundancia de color (Mismo outfit).")
-                        current_frame_idx += 1
+                    if self.dedup.claim(dhash(frame, color_order="BGR"), source=frame_source, namespace="shorts"):
                         continue
                 except Exception as e:
-                    print(f"      ⚠️ Warning: Falló cálculo de histograma ({e}). Continuando.")
+                    print(f"      ⚠️ Warning: Falló la deduplicación ({e}). Continuando.")
 
-                # 2. Análisis de IA
-                # Convertir BGR (OpenCV) a RGB (PIL) para el VisionEngine
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(frame_rgb)
-                
-                # Filtrar con IA
-                if self._is_relevant_frame(pil_image):
-                    # Si es válido, lo codificamos para subir
-                    # Volvemos a usar 'frame' (BGR) para encoding JPG correcto
-                    success, buffer = cv2.imencode(".jpg", frame)
-                    if success:
-                        file_name = f"shorts_{parent_id}_{current_frame_idx}.jpg"
-                        
-                        # Subir
-                        stored_url = self.storage.upload_file(buffer.tobytes(), file_name)
-                        
-                        valid_frames_exctracted.append({
-                            "s3_url": stored_url,
-                            "parent_video": parent_id,
-                            "tag": tag,
-                            "timestamp": datetime.now().isoformat()
-                        })
-                        
-                        # Registrar el histograma de este frame exitoso
-                        accepted_histograms.append(current_hist)
+            # 2. Análisis de IA
+            # El VisionEngine acepta el frame BGR de OpenCV directamente (sin conversión a PIL).
+            # Relevancia y atributos se clasifican en un único pase del modelo.
+            candidates = {**self.RELEVANCE_CANDIDATES, **(attribute_candidates or {})}
+            analysis = self.vision.analyze(frame, candidates, color_order="BGR")
+            
+            # Filtrar con IA
+            if not self._is_relevant_frame(analysis):
+                self._release_frame(frame_source)
+                continue
             
-            current_frame_idx += 1
+            # Si es válido, lo codificamos para subir
+            # Volvemos a usar 'frame' (BGR) para encoding JPG correcto
+            success, buffer = cv2.imencode(".jpg", frame)
+            if not success:
+                self._release_frame(frame_source)
+                continue
+            file_name = f"shorts_{parent_id}_{current_frame_idx}.jpg"
+            
+            # Subir
+            try:
+                stored_url = self.storage.upload_file(buffer.tobytes(), file_name)
+            except Exception as e:
+                print(f"      ⚠️ Error al subir {file_name}: {e}")
+                self._release_frame(frame_source)
+                continue
+            
+            record = {
+                "s3_url": stored_url,
+                "parent_video": parent_id,
+                "tag": tag,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+            # Adjuntar resultados calculados sobre el frame en memoria,
+            # para que el pipeline no tenga que volver a descargarlo.
+            if attribute_candidates:
+                record["vision"] = {
+                    category: analysis[category]
+                    for category in attribute_candidates if category in analysis
+                }
+            if color_engine is not None:
+                record["palette"] = color_engine.extract_palette(frame, color_order="BGR")
+            
+            valid_frames_exctracted.append(record)
+            claimed_sources.append(frame_source)
+            
+            # Registrar el histograma de este frame exitoso
+            accepted_histograms.append(current_hist)
         
         cap.release()
+        # Video descartado: sus frames no deben contar como vistos en otra ejecución.
+        if len(valid_frames_exctracted) < self.MIN_VALID_FRAMES:
+            for frame_source in claimed_sources:
+                self._release_frame(frame_source)
         return valid_frames_exctracted
 
+    def _release_frame(self, frame_source: str):
+        """Saca un frame del índice de deduplicación (no llegó a guardarse)."""
+        if self.dedup is not None:
+            self.dedup.discard(frame_source)
+
+    @staticmethod
+    def _iter_sampled_frames(cap, frame_interval: int, mode: str = "grab"):
+        """
+        Genera (índice, frame BGR) de 1 de cada `frame_interval` frames, decodificando lo mínimo.
+        
+        Modos:
+        - "grab" (por defecto): avanza con `cap.grab()` sobre los frames que no se usan. El códec
+          sigue procesando el paquete (los frames P/B dependen de los anteriores), pero se omite
+          la conversión a BGR y la copia a NumPy, que es la mayor parte del coste por frame.
+        - "seek": salta directamente a cada frame muestreado (CAP_PROP_POS_FRAMES). El demuxer
+          busca el keyframe anterior y decodifica desde ahí: compensa cuando el intervalo de
+          muestreo es mayor que la distancia entre keyframes (GOP). Si el video no informa su
+          número de frames, se usa "grab".
+        - "read": el comportamiento original (`cap.read()` de todos los frames).
+        """
+        mode = mode.lower()
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        
+        if mode == "seek" and frame_count > 0:
+            for frame_idx in range(0, frame_count, frame_interval):
+                if frame_idx and not cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx):
+                    break
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame_idx, frame
+            return
+        
+        frame_idx = 0
+        while True:
+            if frame_idx % frame_interval == 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame_idx, frame
+            elif mode == "read":
+                ret, _ = cap.read()
+                if not ret:
+                    break
+            elif not cap.grab():
+                break
+            frame_idx += 1
+
     def _calculate_histogram(self, image):
         """
         Calcula el histograma de color HSV de una imagen.
@@ -251,28 +506,13 @@ class ShortVideoHunter:
         
         return hist
 
-    def _is_relevant_frame(self, image: Image.Image) -> bool:
+    def _is_relevant_frame(self, analysis: dict) -> bool:
         """
         Filtro de IA más permisivo que PinterestHunter, pero descarta basura.
-        """
-        candidates = {
-            "content_type": [
-                # Positivos (Incluimos 'person wearing clothes' que es muy común en video)
-                "person wearing clothes",
-                "fashion outfit",
-                "editorial fashion photography",
-                "street style photography",
-                
-                # Negativos
-                "promotional graphic with text",
-                "digital collage with text",
-                "text overlay",
-                "blurry or low quality image",  # Nuevo negativo para video
-                "close-up of face only"         # Evitar selfies sin ropa visible
-            ]
-        }
         
-        analysis = self.vision.analyze(image, candidates)
+        Args:
+            analysis: Resultado de VisionEngine.analyze con la categoría "content_type".
+        """
         if not analysis or "content_type" not in analysis:
             return False
             
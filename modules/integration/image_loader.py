@@ -0,0 +1,183 @@
+import hashlib
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+class ImageLoader:
+    """
+    Shared image loading layer for the engines and hunters.
+
+    - Raw bytes are cached per source (URL or path) in a size-bounded LRU, so each
+      asset is fetched once per run even if several engines read it.
+    - Decoded RGB images are cached per content hash in a second bounded LRU, so
+      the same picture is decoded once even when it comes from different URLs.
+    - Concurrent requests for the same source wait for a single in-flight load.
+    - `prefetch` loads (and optionally decodes) upcoming assets in background threads.
+    - Downloads are streamed and aborted above `max_asset_mb`; `head` probes a URL
+      (existence and size) without downloading it.
+
+    Cached images are shared: callers must not modify them in place (copy first).
+    """
+    def __init__(self, max_raw_mb: int = 128, max_decoded_mb: int = 256, timeout: int = 15, prefetch_workers: int = 4,
+                 max_asset_mb: int = 20, pool_maxsize: int = 32):
+        self.max_raw_bytes = max_raw_mb * 1024 * 1024
+        self.max_decoded_bytes = max_decoded_mb * 1024 * 1024
+        self.max_asset_bytes = max_asset_mb * 1024 * 1024
+        self.timeout = timeout
+
+        # Keep-alive HTTP session shared by every caller.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(pool_maxsize, prefetch_workers * 2))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Set User-Agent to avoid 403 blocks from some CDNs
+        self.session.headers["User-Agent"] = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+        self._lock = threading.Lock()
+        self._raw = OrderedDict()      # source -> bytes
+        self._raw_size = 0
+        self._decoded = OrderedDict()  # sha256 -> PIL.Image
+        self._decoded_size = 0
+        self._inflight = {}            # source -> Future[bytes]
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="antc-prefetch")
+
+        self.hits = 0
+        self.misses = 0
+
+    def _fetch(self, source: str) -> bytes:
+        if source.startswith("http"):
+            with self.session.get(source, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                length = response.headers.get("Content-Length")
+                if length and int(length) > self.max_asset_bytes:
+                    raise ValueError(f"{source} is {int(length)} bytes (limit {self.max_asset_bytes})")
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > self.max_asset_bytes:
+                        raise ValueError(f"{source} exceeds {self.max_asset_bytes} bytes")
+                    chunks.append(chunk)
+                return b"".join(chunks)
+        with open(source.replace("file://", "", 1), "rb") as f:
+            return f.read()
+
+    def get_bytes(self, source: str) -> bytes:
+        """Returns the raw (encoded) bytes of a local path, file:// or http(s) URL."""
+        with self._lock:
+            data = self._raw.get(source)
+            if data is not None:
+                self._raw.move_to_end(source)
+                self.hits += 1
+                return data
+            future = self._inflight.get(source)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[source] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = self._fetch(source)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(source, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(source, None)
+            self._raw[source] = data
+            self._raw_size += len(data)
+            while self._raw_size > self.max_raw_bytes and len(self._raw) > 1:
+                _, evicted = self._raw.popitem(last=False)
+                self._raw_size -= len(evicted)
+        future.set_result(data)
+        return data
+
+    def head(self, source: str):
+        """
+        Checks that a URL exists without downloading it (HEAD on the keep-alive session).
+        Returns its Content-Length (None if the server does not send it); raises on HTTP errors.
+        """
+        response = self.session.head(source, timeout=self.timeout, allow_redirects=True)
+        response.raise_for_status()
+        length = response.headers.get("Content-Length")
+        return int(length) if length else None
+
+    def peek_bytes(self, source: str):
+        """Returns the cached bytes of a source without fetching it (None if not cached)."""
+        with self._lock:
+            return self._raw.get(source)
+
+    def get_image(self, source: str) -> Image.Image:
+        """Returns the decoded RGB image for a source. Do not modify it in place."""
+        data = self.get_bytes(source)
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            image = self._decoded.get(digest)
+            if image is not None:
+                self._decoded.move_to_end(digest)
+                return image
+
+        image = Image.open(BytesIO(data)).convert("RGB")
+        size = image.width * image.height * 3
+
+        with self._lock:
+            # A prefetch thread may have decoded the same content meanwhile.
+            if digest in self._decoded:
+                return self._decoded[digest]
+            self._decoded[digest] = image
+            self._decoded_size += size
+            while self._decoded_size > self.max_decoded_bytes and len(self._decoded) > 1:
+                _, evicted = self._decoded.popitem(last=False)
+                self._decoded_size -= evicted.width * evicted.height * 3
+        return image
+
+    def prefetch(self, sources: list, decode: bool = True) -> list:
+        """
+        Starts downloading (and, with `decode`, decoding) `sources` in background threads.
+        Callers that may not need the pixels (e.g. an embedding cache hit) prefetch bytes only.
+        """
+        return [self._executor.submit(self._prefetch_one, source, decode) for source in sources if isinstance(source, str)]
+
+    def _prefetch_one(self, source: str, decode: bool = True):
+        try:
+            if decode:
+                self.get_image(source)
+            else:
+                self.get_bytes(source)
+        except Exception:
+            # The foreground load will retry and report the error.
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "raw_entries": len(self._raw),
+                "raw_mb": round(self._raw_size / (1024 * 1024), 1),
+                "decoded_entries": len(self._decoded),
+                "decoded_mb": round(self._decoded_size / (1024 * 1024), 1),
+            }
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+def get_image_loader() -> ImageLoader:
+    """Returns the process-wide ImageLoader."""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ImageLoader()
+        return _loader
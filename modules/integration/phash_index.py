@@ -0,0 +1,183 @@
+import os
+import time
+import sqlite3
+import threading
+from itertools import combinations
+import numpy as np
+from PIL import Image
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def dhash(image, color_order: str = "RGB") -> int:
+    """
+    64-bit difference hash (dHash) of a PIL image or a NumPy frame (H, W, 3).
+
+    The image is reduced to a 9x8 grayscale grid and each bit says whether a pixel
+    is brighter than its right neighbour. Re-encodes, resizes and CDN variants of the
+    same picture land within a few bits of each other.
+    """
+    if isinstance(image, np.ndarray):
+        frame = image[..., ::-1] if color_order.upper() == "BGR" else image
+        image = Image.fromarray(np.ascontiguousarray(frame[..., :3]))
+    pixels = np.asarray(image.convert("L").resize((9, 8), Image.BILINEAR), dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    # int.bit_count() needs Python 3.10
+    return bin(a ^ b).count("1")
+
+
+def _signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def _unsigned(value: int) -> int:
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def _bands(value: int) -> list:
+    return [(value >> (BAND_BITS * i)) & BAND_MASK for i in range(BANDS)]
+
+
+class PerceptualHashIndex:
+    """
+    Persistent index of perceptual hashes of every visual asset the hunters have kept.
+
+    Hunters check it before downloading full-size bytes or running SigLIP, so the same
+    picture coming back through another CDN URL, a re-post or a later run is skipped.
+
+    Lookups use multi-index hashing: the 64-bit hash is split into 4 bands of 16 bits,
+    each with its own SQLite index. Two hashes within distance `r` share at least one
+    band within distance `r // 4`, so a query enumerates those band values, fetches the
+    few matching rows and verifies the full Hamming distance. Lookup cost grows with
+    the size of a band bucket (entries / 65536), not with the size of the index, and
+    each entry costs a handful of integers on disk.
+
+    The index is safe to share between threads (WAL mode also lets several processes read it).
+    """
+    def __init__(self, path: str, max_distance: int = 6):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.max_distance = max_distance
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(f"""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS hashes (
+                id INTEGER PRIMARY KEY, hash INTEGER NOT NULL,
+                {", ".join(f"b{i} INTEGER NOT NULL" for i in range(BANDS))},
+                source TEXT, namespace TEXT, created REAL
+            );
+            {" ".join(f"CREATE INDEX IF NOT EXISTS idx_hashes_b{i} ON hashes (b{i});" for i in range(BANDS))}
+            CREATE INDEX IF NOT EXISTS idx_hashes_source ON hashes (source);
+        """)
+
+    def _candidates(self, value: int, max_distance: int) -> list:
+        radius = max_distance // BANDS
+        clauses, params = [], []
+        for i, band in enumerate(_bands(value)):
+            variants = [band]
+            for flips in range(1, radius + 1):
+                for positions in combinations(range(BAND_BITS), flips):
+                    variant = band
+                    for position in positions:
+                        variant ^= 1 << position
+                    variants.append(variant)
+            # One indexed query per band (SQLite would scan the table for an OR across columns)
+            clauses.append(f"SELECT hash, source, namespace FROM hashes WHERE b{i} IN ({', '.join('?' * len(variants))})")
+            params.extend(variants)
+        return self._conn.execute(" UNION ".join(clauses), params).fetchall()
+
+    def _nearest(self, value: int, max_distance: int):
+        best = None
+        for stored, source, namespace in self._candidates(value, max_distance):
+            distance = hamming(value, _unsigned(stored))
+            if distance <= max_distance and (best is None or distance < best["distance"]):
+                best = {"source": source, "namespace": namespace, "distance": distance}
+        return best
+
+    def lookup(self, value: int, max_distance: int = None):
+        """Closest indexed asset within `max_distance` bits ({"source", "namespace", "distance"}) or None."""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            match = self._nearest(value, max_distance)
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return match
+
+    def add(self, value: int, source: str = None, namespace: str = None):
+        """Indexes a hash (duplicates are allowed; use `claim` to check and add atomically)."""
+        with self._lock:
+            self._insert(value, source, namespace)
+            self._conn.commit()
+
+    def claim(self, value: int, source: str = None, namespace: str = None, max_distance: int = None):
+        """
+        Atomically looks up a hash and, if nothing is within `max_distance`, indexes it.
+        Returns the existing match (the caller should skip the asset) or None (the asset is new and now claimed).
+        """
+        max_distance = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            match = self._nearest(value, max_distance)
+            if match is not None:
+                self.hits += 1
+                return match
+            self.misses += 1
+            self._insert(value, source, namespace)
+            self._conn.commit()
+        return None
+
+    def discard(self, source: str):
+        """Removes the entries of a source (e.g. a claimed asset that was rejected or never stored)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM hashes WHERE source = ?", (source,))
+            self._conn.commit()
+
+    def _insert(self, value: int, source: str, namespace: str):
+        self._conn.execute(
+            f"INSERT INTO hashes (hash, {', '.join(f'b{i}' for i in range(BANDS))}, source, namespace, created) "
+            f"VALUES (?, {', '.join('?' * BANDS)}, ?, ?, ?)",
+            (_signed(value), *_bands(value), source, namespace, time.time())
+        )
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the number of indexed assets."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_dedup_index(path: str = None):
+    """
+    Returns the process-wide index for `path` (default: ANTC_DEDUP_INDEX_PATH),
+    or None when cross-run deduplication is not configured.
+    """
+    path = path or os.getenv("ANTC_DEDUP_INDEX_PATH")
+    if not path:
+        return None
+    key = os.path.abspath(path)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = PerceptualHashIndex(path, max_distance=int(os.getenv("ANTC_DEDUP_MAX_DISTANCE", "6")))
+        return _indexes[key]
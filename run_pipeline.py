@@ -1,5 +1,4 @@
 import os
-import sys
 import json
 from dotenv import load_dotenv
 from collections import Counter
@@ -7,24 +6,29 @@ from collections import Counter
 # Load env variables
 load_dotenv()
 
-# --- Modules ---
-from modules.hunters.pinterest_hunter import PinterestHunter
-from modules.hunters.tiktok_hunter import TikTokHunter
-from modules.hunters.youtube_listener import YouTubeListener
-from modules.hunters.web_reader import WebReader
+def main():
+    # --- Modules ---
+    # Imported here, not at module level: ColorEngine's spawned workers re-import this
+    # script and must not pay for torch, transformers, selenium or genai.
+    from modules.hunters.pinterest_hunter import PinterestHunter
+    from modules.hunters.short_video_hunter import ShortVideoHunter
+    from modules.hunters.youtube_listener import YouTubeListener
+    from modules.hunters.web_reader import WebReader
 
-from modules.brains.vision_engine import VisionEngine
-from modules.brains.nlp_engine import NLPEngine
-from modules.brains.color_engine import ColorEngine
+    from modules.brains.vision_engine import VisionEngine
+    from modules.brains.nlp_engine import NLPEngine
+    from modules.brains.color_engine import ColorEngine
+    from modules.brains.model_registry import get_model_registry
+    from modules.integration.image_loader import get_image_loader
+    from modules.integration.phash_index import get_dedup_index
 
-from modules.oracle.trends_oracle import TrendsOracle
-from modules.creative.copy_engine import CopyEngine
-from modules.creative.image_engine import ImageEngine
-from modules.integration.db import get_db_engine
-from modules.integration.models import Base, TrendReport
-from sqlalchemy.orm import sessionmaker
+    from modules.oracle.trends_oracle import TrendsOracle
+    from modules.creative.copy_engine import CopyEngine
+    from modules.creative.image_engine import ImageEngine
+    from modules.integration.db import get_db_engine
+    from modules.integration.models import Base, TrendReport
+    from sqlalchemy.orm import sessionmaker
 
-def main():
     print("🚀 [ANTC] Starting Pipeline (Omnichannel Top 5 Mode)...")
     load_dotenv()
     
@@ -51,15 +55,31 @@ def main():
     # --- 1. THE HUNTERS (Ingesta Omnicanal) ---
     print("\n🏹 [ANTC] Phase 1: Hunters (Omnichannel)")
     
+    # Labels Dict for Vision
+    vision_candidates = {
+        "fabric": candidate_fabrics,
+        "texture": candidate_textures,
+        "finish": candidate_finishes
+    }
+    color_engine = ColorEngine(n_colors=3, mode="fast")
+
     # 1. Gather Data
     pinterest = PinterestHunter()
     short_video = ShortVideoHunter()
     
     p_results = pinterest.hunt("Summer 2025 Fashion Trends", limit=10)
-    sv_results = short_video.hunt("Summer Fashion Trends 2025", limit=5) 
+    # Video frames are classified and colour-profiled while still in memory.
+    sv_results = short_video.hunt(
+        "Summer Fashion Trends 2025", limit=5,
+        attribute_candidates=vision_candidates, color_engine=color_engine
+    )
     
     visual_assets = p_results + sv_results
     print(f"   📸 Total Visual Assets: {len(visual_assets)}")
+    dedup = get_dedup_index()
+    if dedup:
+        stats = dedup.stats()
+        print(f"   🧬 Dedup index: skipped {stats['hits']} already-seen images/frames ({stats['entries']} indexed)")
 
     # 1.3 YouTube (Context - Audio/Text)
     youtube = YouTubeListener()
@@ -82,29 +102,43 @@ def main():
     print("\n🧠 [ANTC] Phase 2: The Brains (Vision, NLP, Color)")
     
     # 2.1 Vision Analysis (Multi-Attribute)
-    vision = VisionEngine()
-    color_engine = ColorEngine(n_colors=3)
-    
-    # Labels Dict for Vision
-    vision_candidates = {
-        "fabric": candidate_fabrics,
-        "texture": candidate_textures,
-        "finish": candidate_finishes
-    }
+    vision = VisionEngine(embedding_mode=True, cache_dir=os.getenv("ANTC_VISION_CACHE_DIR"))
 
     print("   --- Vision Processing ---")
-    for asset in visual_assets:
-        img_url = asset.get('s3_url')
-        if not img_url or "mock" in img_url: continue 
-        
+    # Assets analysed at extraction time (video frames) carry their results already.
+    precomputed = [
+        asset for asset in visual_assets
+        if asset.get('vision') and asset.get('s3_url')
+    ]
+    image_urls = [
+        asset.get('s3_url') for asset in visual_assets
+        if asset.get('s3_url') and "mock" not in asset.get('s3_url') and not asset.get('vision')
+    ]
+
+    # 1. Vision Classify (batched forward passes)
+    # Assets are classified one window at a time while the next window is downloaded
+    # and decoded in the background. Raw bytes stay in the shared loader cache,
+    # so colour extraction reuses them instead of fetching every asset a second time.
+    loader = get_image_loader()
+    window = 16
+
+    def classified_assets():
+        for start in range(0, len(image_urls), window):
+            chunk = image_urls[start:start + window]
+            loader.prefetch(image_urls[start + window:start + 2 * window])
+            yield from zip(chunk, vision.analyze_batch(chunk, vision_candidates, batch_size=window))
+
+    def all_results():
+        for asset in precomputed:
+            yield asset['s3_url'], asset['vision'], asset.get('palette')
+        for img_url, results in classified_assets():
+            yield img_url, results, None
+
+    matched_assets = [] # (img_url, winner) pairs that need a palette
+
+    for img_url, results, palette in all_results():
         print(f"   👁️ Analyzing: {img_url.split('/')[-1]}")
         
-        # 1. Vision Classify
-        results = vision.analyze(img_url, vision_candidates)
-        
-        # 2. Color Extract
-        palette = color_engine.extract_palette(img_url)
-        
         if results.get('fabric'):
              fab_res = results['fabric']
              winner = fab_res['label']
@@ -122,14 +156,31 @@ def main():
                  if results.get('finish'):
                      fabric_attributes[winner]['finishes'][results['finish']['label']] += 1
                  
-                 # Aggregate Colors
-                 if palette:
+                 if palette is not None:
                      fabric_attributes[winner]['colors'].extend(palette)
+                 else:
+                     matched_assets.append((img_url, winner))
              else:
                  print(f"      🗑️ Discarded ({score:.2f})")
 
+    # 2. Color Extract (only matched assets need a palette)
+    # Palettes are computed on a process pool and aggregated as they stream back.
+    color_workers = int(os.getenv("ANTC_COLOR_WORKERS", "0")) or None
+    matched_urls = [img_url for img_url, _ in matched_assets]
+    for index, palette in color_engine.iter_palettes(matched_urls, workers=color_workers):
+        if palette:
+            winner = matched_assets[index][1]
+            fabric_attributes[winner]['colors'].extend(palette)
+
+    if vision.cache:
+        stats = vision.cache.stats()
+        print(f"   💾 Vision cache: {stats['hits']} hits / {stats['misses']} misses (hit rate {stats['hit_rate']:.0%})")
+
     # 2.2 NLP Analysis (Multi-Attribute)
-    nlp = NLPEngine()
+    # Full transcripts and articles are analyzed in overlapping windows (no 3000-char cut).
+    # Texts (and transcript chunks) that never mention a candidate skip the models.
+    # Nothing below reads summaries, so summarization is deferred (nlp.summarize on demand).
+    nlp = NLPEngine(streaming=True, cache_dir=os.getenv("ANTC_NLP_CACHE_DIR"), prefilter=True, defer_summary=True)
     
     # Labels Dict for NLP
     nlp_candidates = {
@@ -139,13 +190,15 @@ def main():
     }
     
     print("   --- NLP Processing ---")
-    for asset in text_assets:
-        text_content = asset.get('full_text') or (asset.get('title', '') + " " + asset.get('content_preview', ''))
-        if not text_content: continue
-        
-        print(f"   📜 Analyzing Text...")
-        nlp_results = nlp.analyze_text(text_content, nlp_candidates)
-        
+    text_contents = [
+        asset.get('full_text') or (asset.get('title', '') + " " + asset.get('content_preview', ''))
+        for asset in text_assets
+    ]
+    text_contents = [text for text in text_contents if text and text.strip()]
+    
+    # Documents are analyzed in length-bucketed batches; results keep the input order.
+    print(f"   📜 Analyzing {len(text_contents)} texts...")
+    for nlp_results in nlp.analyze_texts(text_contents, nlp_candidates):
         if 'attributes' in nlp_results and nlp_results['attributes'].get('fabric'):
             fab_data = nlp_results['attributes']['fabric']
             if fab_data:
@@ -171,6 +224,17 @@ def main():
                         f_data = nlp_results['attributes']['finish']
                         if f_data: fabric_attributes[winner]['finishes'][f_data['label']] += 1
 
+    if nlp.prefilter:
+        stats = nlp.prefilter.stats()
+        print(f"   🔎 Lexicon prefilter: skipped {stats['documents_skipped']}/{stats['documents']} docs, "
+              f"{stats['chunks_skipped']}/{stats['chunks']} chunks ({stats['skip_rate']:.0%} of text)")
+    if nlp.cache:
+        stats = nlp.cache.stats()
+        print(f"   💾 NLP cache: {stats['hits']} hits / {stats['misses']} misses (hit rate {stats['hit_rate']:.0%})")
+
+    # Shared model footprint after the heavy phases (one copy per model).
+    get_model_registry().print_report()
+
     # --- 3. RANKING (Top 5) ---
     print("\n🏆 [ANTC] Phase 3: Ranking Top 5")
     top_5 = fabric_counts.most_common(5)
@@ -0,0 +1,81 @@
+"""
+Minimal stand-ins for the hunters' third-party clients (Selenium, webdriver-manager, boto3,
+yt-dlp), installed only when the real package is missing. Hunter tests drive the hunters'
+own logic with fake drivers, loaders and storage; only WebDriverWait and
+presence_of_element_located do real work here.
+"""
+import importlib.util
+import sys
+import time
+import types
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def _missing(name) -> bool:
+    return name not in sys.modules and importlib.util.find_spec(name) is None
+
+
+def install():
+    if _missing("selenium"):
+        class WebDriverException(Exception):
+            pass
+
+        class TimeoutException(WebDriverException):
+            pass
+
+        class WebDriverWait:
+            """Polling loop with the selenium.webdriver.support.ui.WebDriverWait contract."""
+
+            def __init__(self, driver, timeout, poll_frequency=0.5):
+                self.driver, self.timeout, self.poll_frequency = driver, timeout, poll_frequency
+
+            def until(self, method):
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    value = method(self.driver)
+                    if value:
+                        return value
+                    if time.monotonic() > deadline:
+                        raise TimeoutException()
+                    time.sleep(self.poll_frequency)
+
+        _module("selenium")
+        _module("selenium.webdriver", Chrome=None)
+        _module("selenium.webdriver.chrome")
+        _module("selenium.webdriver.chrome.options", Options=object)
+        _module("selenium.webdriver.chrome.service", Service=object)
+        _module("selenium.webdriver.common")
+        _module("selenium.webdriver.common.by", By=types.SimpleNamespace(TAG_NAME="tag name"))
+        _module("selenium.webdriver.support")
+        _module("selenium.webdriver.support.ui", WebDriverWait=WebDriverWait)
+        _module("selenium.webdriver.support.expected_conditions",
+                presence_of_element_located=lambda locator: lambda driver: driver.find_element(*locator))
+        _module("selenium.common")
+        _module("selenium.common.exceptions", WebDriverException=WebDriverException,
+                TimeoutException=TimeoutException)
+    if _missing("webdriver_manager"):
+        _module("webdriver_manager")
+        _module("webdriver_manager.chrome", ChromeDriverManager=object)
+    if _missing("boto3"):
+        _module("boto3")
+    if _missing("botocore"):
+        _module("botocore")
+        _module("botocore.exceptions", ClientError=Exception, NoCredentialsError=Exception)
+    if _missing("yt_dlp"):
+        class DownloadCancelled(Exception):
+            pass
+
+        _module("yt_dlp", YoutubeDL=None)
+        _module("yt_dlp.utils", DownloadCancelled=DownloadCancelled)
+
+
+install()
@@ -0,0 +1,187 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests run offline: the real SigLIP checkpoint is replaced by a tiny random model
+# with the same architecture and a character-level tokenizer.
+PAD_ID = 1
+
+
+class _Batch(dict):
+    def to(self, device):
+        return self
+
+
+class FakeSiglipProcessor:
+    """Character tokenizer + 32x32 image collation with the AutoProcessor call signature."""
+
+    def __call__(self, images=None, text=None, return_tensors="pt", padding=False,
+                 max_length=None, truncation=False, **kwargs):
+        batch = _Batch()
+        if images is not None:
+            images = images if isinstance(images, list) else [images]
+            pixels = np.stack([
+                np.asarray(
+                    (Image.fromarray(np.ascontiguousarray(image)) if isinstance(image, np.ndarray) else image)
+                    .convert("RGB").resize((32, 32)),
+                    dtype=np.float32
+                ) / 255.0
+                for image in images
+            ])
+            batch["pixel_values"] = torch.from_numpy(pixels).permute(0, 3, 1, 2)
+        if text is not None:
+            ids = [[ord(char) % 90 + 2 for char in item] for item in text]
+            if truncation and max_length:
+                ids = [item[:max_length] for item in ids]
+            length = max_length if padding == "max_length" else max(len(item) for item in ids)
+            batch["input_ids"] = torch.tensor([item + [PAD_ID] * (length - len(item)) for item in ids])
+        return batch
+
+
+def make_tiny_siglip():
+    from transformers import SiglipConfig, SiglipModel
+    config = SiglipConfig(
+        text_config=dict(vocab_size=100, hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+                         num_attention_heads=2, max_position_embeddings=64),
+        vision_config=dict(image_size=32, patch_size=8, hidden_size=32, intermediate_size=64,
+                           num_hidden_layers=2, num_attention_heads=2),
+    )
+    torch.manual_seed(0)
+    model = SiglipModel(config)
+    model.eval()
+    return model
+
+
+@pytest.fixture(autouse=True)
+def model_registry(monkeypatch):
+    """Every test starts with an empty process-wide model registry."""
+    from modules.brains import model_registry
+
+    registry = model_registry.ModelRegistry()
+    monkeypatch.setattr(model_registry, "_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def make_vision_engine(monkeypatch):
+    """Factory of VisionEngines (CPU) running on the tiny random SigLIP; kwargs go to VisionEngine."""
+    from modules.brains.vision_engine import VisionEngine
+    from modules.brains.vision_backends import OnnxZeroShotModel, quantize_int8
+
+    def load_model(self):
+        # Same backend handling as VisionEngine._load_model, on the tiny model.
+        if self.backend == "onnx":
+            return FakeSiglipProcessor(), OnnxZeroShotModel(self.onnx_dir)
+        model = make_tiny_siglip()
+        return FakeSiglipProcessor(), quantize_int8(model) if self.backend == "int8" else model
+
+    monkeypatch.setattr(VisionEngine, "_load_model", load_model)
+    monkeypatch.setattr(VisionEngine, "_text_embedding_cache", {})
+    monkeypatch.setenv("ANTC_VISION_BACKEND", "torch")
+    engines = []
+
+    def make(**kwargs):
+        engine = VisionEngine(model_id="tests/tiny-siglip", **kwargs)
+        engine.device = "cpu"
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.release()
+
+
+@pytest.fixture
+def vision_engine(make_vision_engine):
+    """VisionEngine (torch backend, per-category scoring) on the tiny random SigLIP."""
+    return make_vision_engine()
+
+
+WORDS = (
+    "this example is a an the of and with in on for from to . , ! ? "
+    "sherpa velvet lino linen denim satin metallic leather jersey silk wool cotton "
+    "soft rough fluffy smooth quilted wrinkled matte shiny distressed sublimated "
+    "winter summer collection jacket dress shirt trousers coat fabric texture finish "
+    "love hate great bad new trend trends fashion colombia moda tela"
+).split()
+
+
+def make_word_tokenizer(model_max_length: int = 128):
+    """Fast (offset-aware) word-level tokenizer with BART-style special tokens."""
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+    from transformers import PreTrainedTokenizerFast
+
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for word in WORDS:
+        vocab.setdefault(word, len(vocab))
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    backend.normalizer = normalizers.Lowercase()
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", pair="<s> $A </s> </s> $B </s>", special_tokens=[("<s>", 0), ("</s>", 2)]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", eos_token="</s>", pad_token="<pad>",
+        unk_token="<unk>", model_max_length=model_max_length
+    )
+
+
+def make_tiny_zero_shot():
+    from transformers import BartConfig, BartForSequenceClassification, pipeline
+
+    tokenizer = make_word_tokenizer()
+    config = BartConfig(
+        vocab_size=len(tokenizer), d_model=32, encoder_layers=2, decoder_layers=2,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=64, decoder_ffn_dim=64,
+        max_position_embeddings=256, num_labels=3,
+        id2label={0: "contradiction", 1: "neutral", 2: "entailment"},
+        label2id={"contradiction": 0, "neutral": 1, "entailment": 2},
+        pad_token_id=1, bos_token_id=0, eos_token_id=2, decoder_start_token_id=2,
+    )
+    torch.manual_seed(0)
+    model = BartForSequenceClassification(config).eval()
+    return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, device=-1)
+
+
+class FakeTextPipeline:
+    """Deterministic stand-in for the summarization / sentiment pipelines (summaries honour `max_length`)."""
+
+    def __init__(self):
+        self.tokenizer = make_word_tokenizer()
+        self.calls = 0
+        self.batch_sizes = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls += 1
+        self.batch_sizes.append(kwargs.get("batch_size"))
+        items = texts if isinstance(texts, list) else [texts]
+        return [
+            {"summary_text": text[:kwargs.get("max_length", 60)], "label": "POSITIVE" if "love" in text.lower() else "NEGATIVE", "score": 0.9}
+            for text in items
+        ]
+
+
+@pytest.fixture
+def nlp_models(monkeypatch):
+    """
+    Patches NLPEngine so it loads tiny offline models. Returns the list of loaded model
+    ids (in load order) so tests can check which models a code path touched.
+    """
+    from modules.brains import nlp_engine
+
+    loaded = []
+
+    def load_pipeline(self, task, model_id, message):
+        loaded.append(model_id)
+        return make_tiny_zero_shot() if task == "zero-shot-classification" else FakeTextPipeline()
+
+    monkeypatch.setattr(nlp_engine.NLPEngine, "_load_pipeline", load_pipeline)
+    monkeypatch.setattr(nlp_engine.NLPEngine, "_tokenizers", {})
+    monkeypatch.setattr(nlp_engine.AutoTokenizer, "from_pretrained", staticmethod(lambda model_id, **kw: make_word_tokenizer()))
+    return loaded
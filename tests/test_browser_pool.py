@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+from tests import _stubs  # noqa: F401  (Selenium / webdriver-manager stand-ins when not installed)
+from modules.hunters import browser_pool
+from modules.hunters.browser_pool import BLOCKED_URL_PATTERNS, BrowserPool
+
+
+class FakeOptions:
+    def __init__(self):
+        self.arguments, self.prefs = [], {}
+
+    def add_argument(self, argument):
+        self.arguments.append(argument)
+
+    def add_experimental_option(self, name, value):
+        self.prefs[name] = value
+
+
+class FakeDriver:
+    def __init__(self, service=None, options=None):
+        self.service, self.options = service, options
+        self.cdp, self.pages = [], []
+        self.quit_called = False
+        self.dead = False
+
+    def execute_cdp_cmd(self, command, args):
+        self.cdp.append((command, args))
+
+    def get(self, url):
+        if self.dead:
+            raise browser_pool.WebDriverException("chrome not reachable")
+        self.pages.append(url)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Drivers(list):
+    """Chrome instances started by the pool, plus the chromedriver installs."""
+    installs = 0
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = Drivers()
+
+    def chrome(**kwargs):
+        driver = FakeDriver(**kwargs)
+        created.append(driver)
+        return driver
+
+    class Manager:
+        def install(self):
+            created.installs += 1
+            return "/usr/bin/chromedriver"
+
+    monkeypatch.setattr(browser_pool.webdriver, "Chrome", chrome)
+    monkeypatch.setattr(browser_pool, "ChromeDriverManager", Manager)
+    monkeypatch.setattr(browser_pool, "Service", lambda path: ("service", path))
+    monkeypatch.setattr(browser_pool, "Options", FakeOptions)
+    return created
+
+
+def test_sessions_reuse_warm_browsers_and_resolve_the_driver_once(drivers):
+    pool = BrowserPool(max_size=2, headless=True)
+
+    with pool.session() as first:
+        pass
+    with pool.session() as second:
+        pass
+
+    assert first is second
+    assert pool.stats() == {"max_size": 2, "created": 1, "reused": 1, "idle": 1}
+    assert first.pages == ["about:blank", "about:blank"]
+    assert drivers.installs == 1
+
+
+def test_browsers_start_headless_without_images_or_media(drivers):
+    with BrowserPool(max_size=1, headless=True).session() as driver:
+        pass
+
+    assert "--headless=new" in driver.options.arguments
+    assert "--blink-settings=imagesEnabled=false" in driver.options.arguments
+    assert driver.options.prefs["prefs"]["profile.managed_default_content_settings.images"] == 2
+    assert ("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS}) in driver.cdp
+
+
+def test_pool_never_exceeds_max_size(drivers):
+    pool = BrowserPool(max_size=2, headless=True)
+    held = [pool.acquire(), pool.acquire()]
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.1)
+
+    waiter = threading.Thread(target=lambda: pool.release(pool.acquire()))
+    waiter.start()
+    pool.release(held[0])
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert len(drivers) == 2
+
+
+def test_broken_and_worn_out_browsers_are_replaced(drivers):
+    pool = BrowserPool(max_size=1, headless=True, max_uses=2)
+
+    with pytest.raises(browser_pool.WebDriverException):
+        with pool.session() as broken:
+            raise browser_pool.WebDriverException("tab crashed")
+    assert broken.quit_called
+
+    for _ in range(2):
+        with pool.session() as worn:
+            pass
+    assert worn.quit_called  # Recycled after max_uses sessions
+
+    with pool.session() as dead:
+        dead.dead = True  # Fails the about:blank health check on release
+    assert dead.quit_called
+    assert pool.stats()["idle"] == 0
+    assert len(drivers) == 3
+
+
+def test_close_quits_idle_browsers_and_refuses_new_sessions(drivers):
+    pool = BrowserPool(max_size=2, headless=True)
+    busy = pool.acquire()
+    with pool.session() as idle:
+        pass
+
+    pool.close()
+    assert idle.quit_called and not busy.quit_called
+    pool.release(busy)
+    assert busy.quit_called
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from modules.brains.color_engine import ColorEngine, delta_e_2000, rgb_to_lab
+
+# Sharma, Wu & Dalal (2005) CIEDE2000 test data (subset).
+SHARMA_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 3.1571, -77.2803), (50.0, 0.0, -82.7485), 2.8615),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+]
+
+
+def test_delta_e_2000_matches_reference_data():
+    lab1 = np.array([pair[0] for pair in SHARMA_PAIRS])
+    lab2 = np.array([pair[1] for pair in SHARMA_PAIRS])
+    expected = np.array([pair[2] for pair in SHARMA_PAIRS])
+
+    assert np.allclose(delta_e_2000(lab1, lab2), expected, atol=1e-4)
+    assert np.allclose(delta_e_2000(lab2, lab1), expected, atol=1e-4)
+
+
+def test_rgb_to_lab_reference_points():
+    lab = rgb_to_lab([[255, 255, 255], [0, 0, 0], [255, 0, 0]])
+    assert lab[0] == pytest.approx([100.0, 0.0, 0.0], abs=0.01)
+    assert lab[1] == pytest.approx([0.0, 0.0, 0.0], abs=0.01)
+    assert lab[2] == pytest.approx([53.24, 80.09, 67.20], abs=0.05)
+
+
+def test_batch_matching_equals_brute_force_ciede2000():
+    engine = ColorEngine()
+    rgb = np.random.default_rng(0).integers(0, 256, size=(200, 3))
+
+    codes, _, deltas = engine.match_pantone_batch(rgb, k=16)
+
+    brute = delta_e_2000(rgb_to_lab(rgb)[:, None, :], engine.pantone_lab[None, :, :])
+    best = brute.min(axis=1)
+    # The KD-tree shortlist may miss the CIEDE2000 optimum only by a hair.
+    assert np.all(np.array(deltas) - best < 0.5)
+    assert np.mean([engine.pantone_codes[i] == code for i, code in zip(brute.argmin(axis=1), codes)]) > 0.95
+
+
+def test_reference_colours_match_themselves():
+    engine = ColorEngine()
+    codes, names, deltas = engine.match_pantone_batch(engine.pantone_rgb[:20])
+    assert codes == engine.pantone_codes[:20]
+    assert max(deltas) == 0.0
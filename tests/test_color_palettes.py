@@ -0,0 +1,29 @@
+import numpy as np
+
+from modules.brains.color_engine import ColorEngine
+
+
+def _solid(rgb, size=24):
+    return np.full((size, size, 3), rgb, dtype=np.uint8)
+
+
+def test_iter_palettes_ordered_survives_a_failed_worker():
+    engine = ColorEngine(n_colors=2, mode="fast")
+    # A lambda cannot be pickled to a worker: its future fails, the images after it must still come back.
+    paths = [_solid((200, 30, 30)), (lambda: None), _solid((30, 30, 200)), _solid((30, 200, 30))]
+
+    results = list(engine.iter_palettes(paths, workers=2, ordered=True))
+
+    assert [index for index, _ in results] == [0, 1, 2, 3]
+    assert results[1][1] == []
+    assert all(results[index][1] for index in (0, 2, 3))
+
+
+def test_extract_palettes_matches_inline_extraction():
+    engine = ColorEngine(n_colors=2, mode="fast")
+    paths = [_solid((200, 30, 30)), _solid((30, 30, 200)), _solid((240, 240, 240))]
+
+    parallel = engine.extract_palettes(paths, workers=2)
+    inline = engine.extract_palettes(paths, workers=1)
+
+    assert [[c["hex"] for c in palette] for palette in parallel] == [[c["hex"] for c in palette] for palette in inline]
@@ -0,0 +1,62 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from modules.brains import embedding_cache
+from modules.brains.embedding_cache import EmbeddingCache
+from tests.test_vision_batch import CANDIDATES, _assert_same, _images
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    ticks = itertools.count(1)
+    monkeypatch.setattr(embedding_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_put_get_and_scores(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "org/model", max_entries=4)
+    key = cache.key_for(b"image bytes")
+    result = {"fabric": {"label": "denim", "score": 0.9, "all_scores": {"denim": 0.9, "silk": 0.1}}}
+
+    assert cache.get_embedding(key) is None
+    cache.put(key, np.arange(3, dtype=np.float32), result, {"fabric": ["denim", "silk"]})
+
+    assert np.array_equal(cache.get_embedding(key), np.arange(3, dtype=np.float32))
+    assert cache.get_scores(key, "fabric", ["denim", "silk"]) == result["fabric"]
+    assert cache.get_scores(key, "fabric", ["denim", "linen"]) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_reuses_the_least_recently_used_slot(tmp_path, clock):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=2)
+    keys = [cache.key_for(bytes([i])) for i in range(3)]
+    cache.put(keys[0], np.zeros(2), {}, {})
+    cache.put(keys[1], np.ones(2), {}, {})
+    cache.get_embedding(keys[0])  # keys[1] is now the least recently used
+
+    cache.put(keys[2], np.full(2, 2.0), {}, {})
+
+    assert cache.get_embedding(keys[1]) is None
+    assert np.array_equal(cache.get_embedding(keys[0]), np.zeros(2))
+    assert np.array_equal(cache.get_embedding(keys[2]), np.full(2, 2.0))
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_persist_and_capacity_change_resets(tmp_path):
+    key = "k"
+    EmbeddingCache(str(tmp_path), "model", max_entries=4).put(key, np.ones(2), {}, {})
+
+    assert EmbeddingCache(str(tmp_path), "model", max_entries=4).get_embedding(key) is not None
+    assert EmbeddingCache(str(tmp_path), "model", max_entries=8).get_embedding(key) is None
+
+
+def test_vision_engine_skips_the_model_on_a_cache_hit(make_vision_engine, tmp_path, monkeypatch):
+    engine = make_vision_engine(cache_dir=str(tmp_path))
+    image = _images(1)[0]
+    first = engine.analyze(image, CANDIDATES)
+
+    monkeypatch.setattr(engine.model, "get_image_features", lambda **kw: pytest.fail("image tower ran on a hit"))
+    _assert_same(engine.analyze(image, CANDIDATES), first)
+    # New labels are scored against the stored embedding.
+    assert engine.analyze(image, {"colour": ["dark", "light"]})["colour"]["label"] in ("dark", "light")
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from tests import _stubs  # noqa: F401  (Selenium / boto3 / yt-dlp stand-ins when not installed)
+from modules.hunters.pinterest_hunter import PinterestHunter, _HuntSession
+from modules.hunters.short_video_hunter import ShortVideoHunter
+from modules.integration.phash_index import PerceptualHashIndex, dhash
+
+RELEVANT = {"content_type": {"label": "editorial fashion photography", "score": 0.9}}
+IRRELEVANT = {"content_type": {"label": "text overlay", "score": 0.9}}
+
+
+def _picture(seed: int) -> Image.Image:
+    pixels = (np.random.default_rng(seed).random((12, 12, 3)) * 255).astype(np.uint8)
+    return Image.fromarray(pixels).resize((96, 96), Image.BILINEAR)
+
+
+class FakeStorage:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.uploaded = []
+
+    def upload_file(self, data, name):
+        if self.fail:
+            raise IOError("storage down")
+        self.uploaded.append(name)
+        return f"file://{name}"
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PerceptualHashIndex(str(tmp_path / "phash.sqlite"))
+
+
+class FakeLoader:
+    max_asset_bytes = 20 * 1024 * 1024
+
+    def __init__(self, pictures):
+        self.pictures = pictures
+
+    def get_image(self, url):
+        return self.pictures[url]
+
+    def get_bytes(self, url):
+        return b"jpeg"
+
+
+class FakeVision:
+    def __init__(self, relevant):
+        self.relevant = relevant
+
+    def analyze_batch(self, urls, candidates, batch_size=None):
+        return [RELEVANT if url in self.relevant else IRRELEVANT for url in urls]
+
+
+def _hunt_pinterest(index, srcs, relevant, storage):
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.loader = FakeLoader({src: _picture(seed) for seed, src in enumerate(srcs)})
+    hunter.vision, hunter.storage, hunter.dedup, hunter.min_width = FakeVision(relevant), storage, index, 474
+
+    session = _HuntSession("query", limit=5, download_workers=2, upload_workers=1, queue_size=8)
+    for src in srcs:
+        assert session.enqueue(session.downloads.submit(hunter._download_best, session, src))
+    session.close()
+    hunter._classify_loop(session, batch_size=8)
+    for executor in (session.downloads, session.probes, session.uploads):
+        executor.shutdown(wait=True)
+    return hunter, session
+
+
+def test_pinterest_index_only_keeps_stored_images(index):
+    srcs = ["https://example.com/keep.jpg", "https://example.com/reject.jpg"]
+    hunter, session = _hunt_pinterest(index, srcs, relevant={srcs[0]}, storage=FakeStorage())
+
+    assert len(session.results) == 1
+    assert index.lookup(dhash(hunter.loader.get_image(srcs[0])))["source"] == srcs[0]
+    # Rejected by the relevance filter: a later run may evaluate it again.
+    assert index.lookup(dhash(hunter.loader.get_image(srcs[1]))) is None
+
+
+def test_pinterest_failed_upload_leaves_the_index(index):
+    src = "https://example.com/keep.jpg"
+    hunter, session = _hunt_pinterest(index, [src], relevant={src}, storage=FakeStorage(fail=True))
+
+    assert session.results == [] and session.accepted == 0
+    assert index.stats()["entries"] == 0
+
+
+def _write_video(path, frames: int, fps: int = 2, repeat: int = 3) -> str:
+    """MJPG video whose sampled frames (one every 1.5 s = `repeat` frames) are all different pictures."""
+    import cv2
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), fps, (96, 96))
+    for index in range(frames):
+        hue = np.full((96, 96), index * 170 // frames, dtype=np.uint8)
+        value = np.asarray(_picture(index).convert("L"))
+        frame = cv2.cvtColor(np.dstack([hue, np.full_like(hue, 255), value]), cv2.COLOR_HSV2BGR)
+        for _ in range(repeat):
+            writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+class ScriptedVision:
+    """Approves or rejects frames in the order they are analyzed."""
+
+    def __init__(self, decisions):
+        self.decisions = list(decisions)
+
+    def analyze(self, frame, candidates, color_order="RGB"):
+        relevant = self.decisions.pop(0)
+        return {"content_type": {"label": "fashion outfit" if relevant else "text overlay", "score": 0.9}}
+
+
+def _video_hunter(index, decisions, storage=None):
+    hunter = ShortVideoHunter.__new__(ShortVideoHunter)
+    hunter.vision, hunter.storage = ScriptedVision(decisions), storage or FakeStorage()
+    hunter.dedup, hunter.decode_mode = index, "read"
+    return hunter
+
+
+def test_shorts_rejected_frames_leave_the_index(index, tmp_path):
+    video = _write_video(tmp_path / "v.avi", frames=7)
+    hunter = _video_hunter(index, [True, True, False, True, True, True, True])
+
+    frames = hunter._process_video(video, parent_id="v", tag="tag")
+
+    assert len(frames) == 6
+    assert index.stats()["entries"] == 6
+
+
+def test_shorts_rejected_video_does_not_reduce_a_later_run(index, tmp_path):
+    video = _write_video(tmp_path / "v.avi", frames=6)
+
+    # First run: only 3 frames pass, so the video is discarded...
+    assert len(_video_hunter(index, [True] * 3 + [False] * 3)._process_video(video, parent_id="v", tag="tag")) == 3
+    assert index.stats()["entries"] == 0
+    # ...and a later run still sees all of its frames.
+    assert len(_video_hunter(index, [True] * 6)._process_video(video, parent_id="v", tag="tag")) == 6
+
+
+def test_shorts_failed_uploads_leave_the_index(index, tmp_path):
+    video = _write_video(tmp_path / "v.avi", frames=6)
+    frames = _video_hunter(index, [True] * 6, FakeStorage(fail=True))._process_video(video, parent_id="v", tag="tag")
+
+    assert frames == []
+    assert index.stats()["entries"] == 0
+
+
+class BrokenIndex:
+    def claim(self, *args, **kwargs):
+        raise AttributeError("index unavailable")
+
+    def discard(self, source):
+        pass
+
+
+def test_pinterest_index_failure_does_not_drop_downloads():
+    srcs = ["https://example.com/a.jpg", "https://example.com/b.jpg"]
+    _, session = _hunt_pinterest(BrokenIndex(), srcs, relevant=set(srcs), storage=FakeStorage())
+
+    assert len(session.results) == 2
+
+
+def test_shorts_index_failure_does_not_abort_the_video(tmp_path):
+    video = _write_video(tmp_path / "v.avi", frames=6)
+
+    assert len(_video_hunter(BrokenIndex(), [True] * 6)._process_video(video, parent_id="v", tag="tag")) == 6
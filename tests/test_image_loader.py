@@ -0,0 +1,98 @@
+import threading
+import time
+
+from PIL import Image
+
+from modules.integration.image_loader import ImageLoader
+
+
+def _save(path, colour):
+    Image.new("RGB", (16, 16), colour).save(path, "PNG")
+    return str(path)
+
+
+def test_bytes_are_fetched_once_and_decoded_once_per_content(tmp_path):
+    loader = ImageLoader()
+    first = _save(tmp_path / "a.png", (200, 10, 10))
+    copy = tmp_path / "copy.png"
+    copy.write_bytes(open(first, "rb").read())
+
+    assert loader.get_bytes(first) is loader.get_bytes(first)
+    assert loader.hits == 1 and loader.misses == 1
+    # Same picture under another source: decoded image is shared.
+    assert loader.get_image(first) is loader.get_image(str(copy))
+    assert loader.peek_bytes(str(tmp_path / "never-read.png")) is None
+
+
+def test_concurrent_requests_share_one_fetch(tmp_path, monkeypatch):
+    loader = ImageLoader()
+    source = _save(tmp_path / "a.png", (10, 200, 10))
+    fetches = []
+    fetch = loader._fetch
+
+    def slow_fetch(src):
+        fetches.append(src)
+        time.sleep(0.05)
+        return fetch(src)
+
+    monkeypatch.setattr(loader, "_fetch", slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(loader.get_bytes(source))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(fetches) == 1 and len(results) == 6
+
+
+def test_raw_cache_is_size_bounded(tmp_path):
+    loader = ImageLoader(max_raw_mb=0)  # Keeps only the most recent entry
+    sources = [_save(tmp_path / f"{i}.png", (i * 40, 0, 0)) for i in range(3)]
+    for source in sources:
+        loader.get_bytes(source)
+
+    assert loader.peek_bytes(sources[-1]) is not None
+    assert loader.peek_bytes(sources[0]) is None
+
+
+def test_engines_share_the_loader(make_vision_engine, tmp_path):
+    from modules.brains.color_engine import ColorEngine
+    from modules.integration.image_loader import get_image_loader
+
+    source = _save(tmp_path / "shared.png", (30, 60, 200))
+    loader = get_image_loader()
+    misses = loader.misses
+    make_vision_engine().analyze(source, {"fabric": ["denim", "silk"]})
+    ColorEngine(n_colors=1, mode="fast").extract_palette(source)
+
+    assert loader.misses == misses + 1
+
+
+def test_prefetch_can_skip_decoding(tmp_path):
+    loader = ImageLoader()
+    sources = [_save(tmp_path / f"{i}.png", (i * 40, 0, 0)) for i in range(3)]
+
+    for future in loader.prefetch(sources, decode=False):
+        future.result()
+    assert loader.stats()["raw_entries"] == 3 and loader.stats()["decoded_entries"] == 0
+
+    for future in loader.prefetch(sources):
+        future.result()
+    assert loader.stats()["decoded_entries"] == 3
+
+
+def test_cache_hits_are_never_decoded(make_vision_engine, tmp_path, monkeypatch):
+    from modules.integration import image_loader
+
+    sources = [_save(tmp_path / f"{i}.png", (i * 40, 90, 0)) for i in range(4)]
+    engine = make_vision_engine(cache_dir=str(tmp_path / "cache"))
+    engine.analyze_batch(sources, {"fabric": ["denim", "silk"]}, batch_size=2)
+
+    loader = ImageLoader()
+    monkeypatch.setattr(image_loader, "_loader", loader)
+    engine.analyze_batch(sources, {"fabric": ["denim", "silk"]}, batch_size=2)
+    loader._executor.shutdown(wait=True)
+
+    assert loader.stats()["raw_entries"] == 4
+    assert loader.stats()["decoded_entries"] == 0
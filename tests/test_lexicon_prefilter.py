@@ -0,0 +1,43 @@
+from modules.brains.lexicon_prefilter import LexiconPrefilter
+
+CANDIDATES = {
+    "fabric": ["Denim", "Lino", "Piel de Durazno", "Metallic"],
+    "texture": ["Soft", "Rough"],
+    "finish": ["Matte", "Metallic"],
+}
+
+
+def test_synonyms_match_across_languages_accents_and_case():
+    prefilter = LexiconPrefilter()
+    hits = prefilter.match("Pantalón de MEZCLILLA y camisa de linho; vestido peach skin.", CANDIDATES)
+    assert hits["candidates"]["fabric"] == {"Denim": 1, "Lino": 1, "Piel de Durazno": 1}
+
+
+def test_whole_words_only():
+    prefilter = LexiconPrefilter()
+    assert prefilter.match("New linoleum floors", CANDIDATES)["candidates"] == {}
+
+
+def test_shared_label_counts_in_every_category():
+    hits = LexiconPrefilter().match("A lurex top", CANDIDATES)["candidates"]
+    assert hits == {"fabric": {"Metallic": 1}, "finish": {"Metallic": 1}}
+
+
+def test_everyday_words_need_a_fabric_term_nearby():
+    prefilter = LexiconPrefilter()
+    assert not prefilter.is_relevant("We had some mate and a soft, lame afternoon. Jean came too.", CANDIDATES)
+    assert prefilter.match("a soft cotton fabric", CANDIDATES)["candidates"] == {"texture": {"Soft": 1}}
+    assert prefilter.match("vestido en tela mate", CANDIDATES)["candidates"] == {"finish": {"Matte": 1}}
+    assert prefilter.match("soft washed linen", CANDIDATES)["candidates"]["texture"] == {"Soft": 1}
+
+
+def test_generic_words_need_several_hits():
+    prefilter = LexiconPrefilter(min_generic_hits=3)
+    assert not prefilter.is_relevant("The fashion week ended.", CANDIDATES)
+    assert prefilter.is_relevant("Fashion runway: a textile-driven collection.", CANDIDATES)
+    stats = prefilter.stats()
+    assert stats["documents"] == 2 and stats["documents_skipped"] == 1
+
+
+def test_version_changes_with_the_settings():
+    assert LexiconPrefilter().version != LexiconPrefilter(context_words=5).version
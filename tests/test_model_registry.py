@@ -0,0 +1,56 @@
+import threading
+import time
+
+import torch
+
+from modules.brains.model_registry import ModelRegistry
+
+
+def test_one_load_per_key_and_reference_counting():
+    registry = ModelRegistry()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return torch.nn.Linear(4, 4)
+
+    first = registry.acquire("model", "cpu", "fp32", loader)
+    second = registry.acquire("model", "cpu", "fp32", loader)
+    other_precision = registry.acquire("model", "cpu", "int8", loader)
+
+    assert first is second and first is not other_precision
+    assert len(loads) == 2
+    report = {item["precision"]: item for item in registry.memory_report()}
+    assert report["fp32"]["refs"] == 2
+    assert report["fp32"]["size_mb"] >= 0
+
+    registry.release("model", "cpu", "fp32")
+    assert any(item["precision"] == "fp32" for item in registry.memory_report())
+    registry.release("model", "cpu", "fp32")
+    assert all(item["precision"] != "fp32" for item in registry.memory_report())
+
+
+def test_concurrent_acquires_share_a_single_load():
+    registry = ModelRegistry()
+    loads = []
+
+    def slow_loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    instances = []
+    threads = [threading.Thread(target=lambda: instances.append(registry.acquire("m", "cpu", "fp32", slow_loader)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len({id(instance) for instance in instances}) == 1
+
+
+def test_vision_engines_share_weights(make_vision_engine):
+    first, second = make_vision_engine(), make_vision_engine(embedding_mode=True)
+    assert first.model is second.model
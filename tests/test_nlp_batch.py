@@ -0,0 +1,70 @@
+import pytest
+
+from modules.brains.nlp_engine import NLPEngine
+
+CANDIDATES = {"fabric": ["Denim", "Velvet", "Lino"], "finish": ["Matte", "Shiny"]}
+TEXTS = [
+    "love this denim jacket",
+    "",
+    "a winter collection with shiny velvet coats and matte leather trousers, " * 3,
+    "bad fabric",
+    "new trend in colombia: linen shirt and silk dress for summer",
+    None,
+    "great",
+    "love the matte leather trousers and the shiny satin shirt of the new summer collection in colombia",
+    "new fashion trends: " + "soft wool coat with a quilted finish and rough cotton texture " * 12,
+]
+
+
+def _assert_same_metrics(batched: dict, single: dict):
+    assert batched.keys() == single.keys()
+    assert batched["sentiment"] == single["sentiment"]
+    assert batched["sentiment_score"] == pytest.approx(single["sentiment_score"], abs=1e-4)
+    assert batched.get("summary") == single.get("summary")
+    for category, attribute in single["attributes"].items():
+        if attribute is None:
+            assert batched["attributes"][category] is None
+        else:
+            assert batched["attributes"][category]["label"] == attribute["label"]
+            assert batched["attributes"][category]["score"] == pytest.approx(attribute["score"], abs=1e-4)
+
+
+@pytest.mark.parametrize("batch_size", [2, 8])
+@pytest.mark.parametrize("defer_summary", [False, True])
+def test_batched_analysis_matches_single_documents_in_input_order(nlp_models, defer_summary, batch_size):
+    engine = NLPEngine(defer_summary=defer_summary)
+
+    batched = engine.analyze_texts(TEXTS, CANDIDATES, batch_size=batch_size)
+
+    assert len(batched) == len(TEXTS)
+    for text, result in zip(TEXTS, batched):
+        if not text:
+            assert result == {}
+        else:
+            _assert_same_metrics(result, engine.analyze_text(text, CANDIDATES))
+
+
+def test_failing_bucket_falls_back_to_single_documents(nlp_models, monkeypatch):
+    engine = NLPEngine()
+    expected = [engine.analyze_text(text, CANDIDATES) if text else {} for text in TEXTS]
+
+    def broken_bucket(texts, candidate_data=None):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(engine, "_analyze_bucket", broken_bucket)
+    for result, single in zip(engine.analyze_texts(TEXTS, CANDIDATES, batch_size=3), expected):
+        if single:
+            _assert_same_metrics(result, single)
+        else:
+            assert result == {}
+
+
+def test_streaming_routes_documents_the_same_way_in_both_apis(nlp_models):
+    engine = NLPEngine(streaming=True, chunk_tokens=40, chunk_overlap=10)
+    texts = [TEXTS[4], "love this shiny velvet coat and matte denim jacket " * 80]
+
+    batched = engine.analyze_texts(texts, CANDIDATES)
+
+    assert "chunks" not in batched[0] and batched[1]["chunks"] > 1
+    for text, result in zip(texts, batched):
+        assert result == engine.analyze_text(text, CANDIDATES)
@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+
+from modules.brains import nlp_cache
+from modules.brains.nlp_cache import NLPResultCache
+from modules.brains.nlp_engine import NLPEngine
+
+CANDIDATES = {"fabric": ["Denim", "Velvet", "Lino"], "finish": ["Matte", "Shiny"]}
+SIGNATURE = {"models": {"classifier": "org/model"}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = itertools.count(1)
+    ticks = {"offset": 0.0}
+    monkeypatch.setattr(nlp_cache.time, "time", lambda: float(next(now)) + ticks["offset"])
+    return ticks
+
+
+def test_key_ignores_whitespace_and_width_but_not_labels_or_models(tmp_path):
+    cache = NLPResultCache(str(tmp_path))
+    key = cache.key_for("Denim  jacket\n", CANDIDATES, SIGNATURE)
+
+    assert cache.key_for(" Ｄenim jacket", CANDIDATES, SIGNATURE) == key
+    assert cache.key_for("Denim jacket", {"fabric": ["Denim", "Silk"]}, SIGNATURE) != key
+    assert cache.key_for("Denim jacket", CANDIDATES, {"models": {"classifier": "org/other"}}) != key
+    assert cache.key_for("Denim shirt", CANDIDATES, SIGNATURE) != key
+
+
+def test_put_get_persists_across_instances(tmp_path):
+    NLPResultCache(str(tmp_path)).put("k", {"sentiment": "POSITIVE", "summary": "señal"})
+
+    cache = NLPResultCache(str(tmp_path))
+    assert cache.get("k") == {"sentiment": "POSITIVE", "summary": "señal"}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = NLPResultCache(str(tmp_path), ttl_days=1)
+    cache.put("k", {"sentiment": "NEGATIVE"})
+
+    clock["offset"] = 2 * 24 * 3600
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = NLPResultCache(str(tmp_path), max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")  # "b" is now the least recently used
+
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+
+
+def test_engine_skips_the_models_on_a_repeat_text(nlp_models, tmp_path, monkeypatch):
+    engine = NLPEngine(cache_dir=str(tmp_path))
+    text = "love this shiny velvet coat"
+    first = engine.analyze_text(text, CANDIDATES)
+
+    monkeypatch.setattr(engine, "_analyze_truncated", lambda *a: pytest.fail("models ran on a cache hit"))
+    assert engine.analyze_text(text + "  ", CANDIDATES) == first
+    assert engine.analyze_texts(["", text], CANDIDATES) == [{}, first]
+    assert engine.cache.stats()["hits"] == 2
+
+
+def test_new_labels_or_mode_miss_the_cache(nlp_models, tmp_path):
+    engine = NLPEngine(cache_dir=str(tmp_path))
+    text = "love this shiny velvet coat " * 120
+    engine.analyze_text(text, CANDIDATES)
+
+    engine.analyze_text(text, {"fabric": ["Denim", "Silk"]})
+    engine.analyze_text(text, CANDIDATES, streaming=True)
+    assert engine.cache.stats()["hits"] == 0
+    assert engine.cache.stats()["entries"] == 3
+
+
+def test_short_texts_share_one_entry_whatever_the_mode(nlp_models, tmp_path):
+    engine = NLPEngine(cache_dir=str(tmp_path))
+    text = "love this shiny velvet coat"
+    first = engine.analyze_text(text, CANDIDATES)
+
+    assert engine.analyze_text(text, CANDIDATES, streaming=True) == first
+    assert engine.analyze_texts([text], CANDIDATES, streaming=True) == [first]
+    assert engine.cache.stats()["entries"] == 1
@@ -0,0 +1,34 @@
+from modules.brains.nlp_engine import NLPEngine
+
+
+def test_iter_chunks_does_not_load_any_model(nlp_models):
+    engine = NLPEngine(streaming=True, chunk_tokens=8, chunk_overlap=2)
+
+    chunks = list(engine.iter_chunks("denim jacket with linen shirt " * 10))
+
+    assert chunks
+    assert nlp_models == []
+
+
+def test_tokenizer_is_loaded_once_per_model(nlp_models, monkeypatch):
+    calls = []
+    from modules.brains import nlp_engine
+    from tests.conftest import make_word_tokenizer
+
+    monkeypatch.setattr(nlp_engine.AutoTokenizer, "from_pretrained",
+                        staticmethod(lambda model_id, **kw: calls.append(model_id) or make_word_tokenizer()))
+    first, second = NLPEngine(chunk_tokens=8, chunk_overlap=2), NLPEngine(chunk_tokens=8, chunk_overlap=2)
+    list(first.iter_chunks("denim " * 30))
+    list(second.iter_chunks("linen " * 30))
+
+    assert calls == ["facebook/bart-large-mnli"]
+
+
+def test_loaded_pipeline_tokenizer_is_reused(nlp_models, monkeypatch):
+    from modules.brains import nlp_engine
+
+    engine = NLPEngine(chunk_tokens=8, chunk_overlap=2)
+    pipe = engine.classifier
+    monkeypatch.setattr(nlp_engine.AutoTokenizer, "from_pretrained", staticmethod(lambda *a, **kw: 1 / 0))
+
+    assert engine._tokenizer("classifier") is pipe.tokenizer
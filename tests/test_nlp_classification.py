@@ -0,0 +1,28 @@
+import pytest
+
+from modules.brains.nlp_engine import NLPEngine
+
+CANDIDATES = {"fabric": ["Denim", "Velvet", "Lino"], "finish": ["Matte", "Shiny"]}
+TEXTS = ["a winter collection with shiny velvet coats", "denim jacket", "love this linen shirt"]
+
+
+def test_single_pass_matches_the_zero_shot_pipeline(nlp_models):
+    engine = NLPEngine(single_pass=True, batch_size=4)
+
+    for text, result in zip(TEXTS, engine._classify_texts(TEXTS, CANDIDATES)):
+        for category, labels in CANDIDATES.items():
+            expected = engine.classifier(text, labels, multi_label=False)
+            assert result[category]["labels"] == expected["labels"]
+            assert result[category]["scores"] == pytest.approx(expected["scores"], abs=1e-5)
+
+
+def test_single_pass_and_per_category_modes_agree(nlp_models):
+    fast = NLPEngine(single_pass=True).analyze_text(TEXTS[0], CANDIDATES)
+    slow = NLPEngine(single_pass=False).analyze_text(TEXTS[0], CANDIDATES)
+
+    assert fast["attributes"] == slow["attributes"]
+    assert fast["sentiment"] == slow["sentiment"]
+
+
+def test_empty_label_sets_are_skipped(nlp_models):
+    assert NLPEngine()._classify_texts(TEXTS[:1], {"fabric": []}) == [{}]
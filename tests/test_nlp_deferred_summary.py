@@ -0,0 +1,53 @@
+from modules.brains.nlp_engine import NLPEngine
+
+CANDIDATES = {"fabric": ["Denim", "Velvet", "Lino"], "finish": ["Matte", "Shiny"]}
+SUMMARIZER = NLPEngine.MODELS["summarizer"][1]
+LONG_TEXT = "love this new winter collection with shiny velvet coats and matte leather trousers " * 4
+
+
+def test_deferred_analysis_never_loads_the_summarizer(nlp_models):
+    engine = NLPEngine(defer_summary=True)
+
+    single = engine.analyze_text(LONG_TEXT, CANDIDATES)
+    batched = engine.analyze_texts([LONG_TEXT, "bad fabric"], CANDIDATES)
+    streamed = engine.analyze_text(LONG_TEXT * 10, CANDIDATES, streaming=True)
+
+    assert SUMMARIZER not in nlp_models
+    assert "summary" not in single and "summary" not in batched[0] and "summary" not in streamed
+    # Sentiment is read from the source text
+    assert single["sentiment"] == batched[0]["sentiment"] == "POSITIVE"
+    assert batched[1]["sentiment"] == "NEGATIVE"
+    assert set(single["attributes"]) == set(CANDIDATES)
+
+
+def test_summary_on_demand_is_computed_once(nlp_models):
+    engine = NLPEngine(defer_summary=True)
+
+    summary = engine.summarize(LONG_TEXT)
+    summarizer = engine._pipelines["summarizer"]
+
+    assert summary == LONG_TEXT[:130]
+    assert engine.summarize(LONG_TEXT) == summary
+    assert summarizer.calls == 1
+    assert engine.summarize("") == ""
+
+
+def test_summary_survives_the_engine_through_the_result_cache(nlp_models, tmp_path):
+    summary = NLPEngine(defer_summary=True, cache_dir=str(tmp_path)).summarize(LONG_TEXT)
+    loads = nlp_models.count(SUMMARIZER)
+
+    engine = NLPEngine(defer_summary=True, cache_dir=str(tmp_path))
+    assert engine.summarize(LONG_TEXT) == summary
+    assert "summarizer" not in engine._pipelines
+    assert nlp_models.count(SUMMARIZER) == loads
+
+
+def test_streaming_summary_folds_every_window(nlp_models):
+    engine = NLPEngine(defer_summary=True, chunk_tokens=40, chunk_overlap=10, chunk_batch=2)
+    text = LONG_TEXT * 10
+
+    summary = engine.summarize(text, streaming=True)
+
+    windows = list(engine.iter_chunks(text))
+    assert len(windows) > 2
+    assert summary == " ".join(window[:max(30, min(130, len(window) // 2))] for window in windows)
@@ -0,0 +1,82 @@
+import random
+
+from tests.conftest import WORDS, make_word_tokenizer
+from modules.brains.nlp_engine import NLPEngine
+
+CANDIDATES = {"fabric": ["Denim", "Velvet", "Lino"], "finish": ["Matte", "Shiny"]}
+
+
+def _document(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _tokens(text: str) -> list:
+    return make_word_tokenizer().tokenize(text)
+
+
+def test_windows_have_the_configured_size_and_overlap(nlp_models):
+    engine = NLPEngine(chunk_tokens=40, chunk_overlap=10)
+    text = _document(1000)
+
+    chunks = list(engine.iter_chunks(text))
+    tokens = [_tokens(chunk) for chunk in chunks]
+
+    assert all(len(window) == 40 for window in tokens[:-1])
+    assert 10 < len(tokens[-1]) <= 40
+    for previous, current in zip(tokens, tokens[1:]):
+        assert previous[-10:] == current[:10]
+    # Every token of the document appears once the overlaps are removed
+    assert tokens[0] + [token for window in tokens[1:] for token in window[10:]] == _tokens(text)
+    assert text.startswith(chunks[0]) and text.endswith(chunks[-1])
+
+
+def test_short_text_is_a_single_window(nlp_models):
+    engine = NLPEngine(chunk_tokens=40, chunk_overlap=10)
+    text = _document(25)
+
+    assert list(engine.iter_chunks(text)) == [text]
+
+
+def test_tail_repeating_the_overlap_is_not_emitted(nlp_models):
+    engine = NLPEngine(chunk_tokens=40, chunk_overlap=10)
+    # 70 tokens: windows [0, 40) and [30, 70) cover everything
+    chunks = list(engine.iter_chunks(_document(70)))
+
+    assert [len(_tokens(chunk)) for chunk in chunks] == [40, 40]
+
+
+def test_streaming_analysis_reads_every_window(nlp_models):
+    engine = NLPEngine(streaming=True, chunk_tokens=40, chunk_overlap=10, chunk_batch=3)
+    text = _document(1000, seed=1) + " love"
+
+    metrics = engine.analyze_text(text, CANDIDATES)
+
+    assert metrics["chunks"] == len(list(engine.iter_chunks(text)))
+    assert set(metrics["attributes"]) == set(CANDIDATES)
+    assert metrics["sentiment"] in ("POSITIVE", "NEGATIVE")
+    assert metrics["summary"]
+
+
+def test_max_aggregation_keeps_the_best_window_score(nlp_models):
+    engine = NLPEngine(streaming=True, chunk_tokens=40, chunk_overlap=10, chunk_aggregation="max")
+    text = _document(800, seed=2)
+
+    metrics = engine.analyze_text(text, CANDIDATES)
+    windows = engine._classify_texts(list(engine.iter_chunks(text)), CANDIDATES)
+
+    for category, attribute in metrics["attributes"].items():
+        best = max(max(window[category]["scores"]) for window in windows)
+        if attribute is not None:
+            assert abs(attribute["score"] - best) < 1e-4
+        else:
+            assert best <= 0.4
+
+
+def test_window_sentiment_runs_in_batches(nlp_models):
+    engine = NLPEngine(streaming=True, chunk_tokens=40, chunk_overlap=10, chunk_batch=3)
+    engine.analyze_text(_document(1000, seed=3), CANDIDATES)
+
+    sentiment = engine._pipelines["sentiment_analyzer"]
+    assert sentiment.calls > 1
+    assert set(sentiment.batch_sizes) == {3}
@@ -0,0 +1,50 @@
+import numpy as np
+from PIL import Image
+
+from modules.brains.color_engine import ColorEngine
+from tests.test_vision_batch import CANDIDATES, _assert_same
+
+
+def _frame():
+    rng = np.random.default_rng(3)
+    return (rng.random((48, 64, 3)) * 255).astype(np.uint8)
+
+
+def test_vision_accepts_rgb_and_bgr_frames(make_vision_engine):
+    engine = make_vision_engine()
+    rgb = _frame()
+    expected = engine.analyze(Image.fromarray(rgb), CANDIDATES)
+
+    _assert_same(engine.analyze(rgb, CANDIDATES), expected)
+    _assert_same(engine.analyze(np.ascontiguousarray(rgb[..., ::-1]), CANDIDATES, color_order="BGR"), expected)
+
+
+def test_cached_frames_share_the_pil_cache_key(make_vision_engine, tmp_path):
+    engine = make_vision_engine(cache_dir=str(tmp_path))
+    rgb = _frame()
+    engine.analyze(Image.fromarray(rgb), CANDIDATES)
+
+    engine.analyze(np.ascontiguousarray(rgb[..., ::-1]), CANDIDATES, color_order="BGR")
+
+    assert engine.cache.stats()["hits"] == 1
+
+
+def test_vision_rejects_frames_that_are_not_images(make_vision_engine):
+    assert make_vision_engine().analyze(np.zeros((8, 8), dtype=np.uint8), CANDIDATES) == {}
+
+
+def test_color_engine_bgr_frame_matches_pil():
+    engine = ColorEngine(n_colors=3, mode="fast")
+    rgb = _frame()
+    expected = engine.extract_palette(_png(rgb))
+
+    palette = engine.extract_palette(np.ascontiguousarray(rgb[..., ::-1]), color_order="BGR")
+
+    assert [c["hex"] for c in palette] == [c["hex"] for c in expected]
+
+
+def _png(rgb) -> bytes:
+    from io import BytesIO
+    buffer = BytesIO()
+    Image.fromarray(rgb).save(buffer, "PNG")
+    return buffer.getvalue()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from modules.brains.color_engine import ColorEngine, delta_e_2000, rgb_to_lab
+
+
+def _blocks():
+    """Three colour areas (50%, 30%, 20%) with a little noise."""
+    rng = np.random.default_rng(0)
+    image = np.zeros((100, 100, 3), dtype=np.int16)
+    image[:50] = (180, 30, 40)
+    image[50:80] = (20, 60, 160)
+    image[80:] = (230, 220, 200)
+    return np.clip(image + rng.integers(-6, 7, size=image.shape), 0, 255).astype(np.uint8)
+
+
+def test_fast_mode_agrees_with_kmeans():
+    image = _blocks()
+    reference = ColorEngine(n_colors=3, mode="kmeans").extract_palette(image)
+    fast = ColorEngine(n_colors=3, mode="fast").extract_palette(image)
+
+    assert [c["percentage"] for c in fast] == pytest.approx([c["percentage"] for c in reference], abs=0.02)
+    for ref, got in zip(reference, fast):
+        assert float(delta_e_2000(rgb_to_lab(ref["rgb"]), rgb_to_lab(got["rgb"]))) < 2.0
+        assert got["pantone_code"] and got["delta_e"] >= 0
+
+
+def test_fast_mode_handles_fewer_colours_than_clusters():
+    image = np.full((20, 20, 3), (90, 120, 30), dtype=np.uint8)
+    palette = ColorEngine(n_colors=5, mode="fast").extract_palette(image)
+    assert len(palette) == 1 and palette[0]["percentage"] == 1.0
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ColorEngine(mode="median-cut")
@@ -0,0 +1,68 @@
+import numpy as np
+from PIL import Image
+
+from modules.integration.phash_index import PerceptualHashIndex, dhash, hamming
+
+
+def _picture(seed: int, size: int = 96) -> Image.Image:
+    pixels = (np.random.default_rng(seed).random((12, 12, 3)) * 255).astype(np.uint8)
+    return Image.fromarray(pixels).resize((size, size), Image.BILINEAR)
+
+
+def test_dhash_is_stable_across_resizes_and_colour_order():
+    image = _picture(1)
+    assert hamming(dhash(image), dhash(image.resize((40, 40), Image.BILINEAR))) <= 6
+    frame = np.asarray(image)[..., ::-1]
+    assert dhash(frame, color_order="BGR") == dhash(image)
+
+
+def test_claim_lookup_and_discard(tmp_path):
+    index = PerceptualHashIndex(str(tmp_path / "phash.sqlite"), max_distance=6)
+    value = dhash(_picture(1))
+    near = value ^ 0b101  # 2 bits away
+    other = dhash(_picture(2))
+
+    assert index.claim(value, source="a", namespace="tests") is None
+    assert index.claim(near, source="b")["source"] == "a"
+    assert index.lookup(other) is None
+
+    index.discard("a")
+    assert index.lookup(near) is None
+    assert index.claim(near, source="b") is None
+    assert index.stats()["entries"] == 1
+
+
+def test_lookup_finds_matches_in_any_band(tmp_path):
+    index = PerceptualHashIndex(str(tmp_path / "phash.sqlite"), max_distance=6)
+    value = 0x0123456789ABCDEF
+    index.add(value, source="a")
+    # 6 flipped bits spread over the 4 bands of 16 bits still match; 7 do not.
+    six = value ^ (1 | 1 << 17 | 1 << 18 | 1 << 33 | 1 << 50 | 1 << 63)
+    assert index.lookup(six)["distance"] == 6
+    assert index.lookup(six ^ 1 << 40) is None
+
+
+def test_index_persists_between_instances(tmp_path):
+    path = str(tmp_path / "phash.sqlite")
+    PerceptualHashIndex(path).add(42, source="a")
+    assert PerceptualHashIndex(path).lookup(42)["source"] == "a"
+
+
+def test_claims_near_duplicates_against_a_populated_index(tmp_path):
+    index = PerceptualHashIndex(str(tmp_path / "phash.sqlite"), max_distance=6)
+    rng = np.random.default_rng(0)
+    base = int(rng.integers(0, 1 << 63)) << 1 | 1
+    # Same bands as `base` except one: every lookup has to verify rows from shared buckets.
+    stored = [base ^ int(rng.integers(1, 1 << 16)) << 48 for _ in range(200)]
+    for number, value in enumerate(stored):
+        index.add(value, source=f"s{number}")
+
+    for flips in ([0], [3, 20], [1, 17, 33, 49, 62]):
+        probe = stored[7]
+        for bit in flips:
+            probe ^= 1 << bit
+        match = index.claim(probe, source="probe")
+        expected = min(bin(probe ^ value).count("1") for value in stored)
+        assert match is not None and match["distance"] == expected
+    assert index.claim(~base & (1 << 64) - 1, source="new") is None
+    assert hamming(0, (1 << 64) - 1) == 64
@@ -0,0 +1,127 @@
+import threading
+import types
+from concurrent.futures import Future
+
+from tests import _stubs  # noqa: F401  (Selenium / boto3 stand-ins when not installed)
+from modules.hunters.pinterest_hunter import COLLECT_NEW_IMAGES_JS, PinterestHunter, _HuntSession
+
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class BrokenVision:
+    def analyze_batch(self, urls, candidates, batch_size=None):
+        return None  # Not a list: the classifier thread crashes outside its per-batch error handling
+
+
+def test_producer_does_not_hang_when_the_classifier_dies():
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.vision, hunter.dedup = BrokenVision(), None
+    session = _HuntSession("query", limit=5, download_workers=1, upload_workers=1, queue_size=1)
+    classifier = threading.Thread(target=hunter._classify_loop, args=(session, 1), daemon=True)
+    classifier.start()
+
+    def produce():
+        for index in range(20):
+            if not session.enqueue(_done((f"raw{index}", f"url{index}"))):
+                break
+        session.close()
+        classifier.join()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    producer.join(timeout=10)
+
+    assert not producer.is_alive()
+    assert session.failed.is_set()
+    for executor in (session.downloads, session.probes, session.uploads):
+        executor.shutdown()
+
+
+def test_classifier_batches_what_is_already_queued():
+    batches = []
+
+    class RecordingVision:
+        def analyze_batch(self, urls, candidates, batch_size=None):
+            batches.append(list(urls))
+            return [{"content_type": {"label": "text overlay", "score": 0.9}} for _ in urls]
+
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.vision, hunter.dedup = RecordingVision(), None
+    session = _HuntSession("query", limit=5, download_workers=1, upload_workers=1, queue_size=16)
+    for index in range(5):
+        session.enqueue(_done((f"raw{index}", f"url{index}")))
+    session.enqueue(_done(None))  # Failed download: skipped
+    session.close()
+
+    hunter._classify_loop(session, batch_size=3)
+
+    assert batches == [["url0", "url1", "url2"], ["url3", "url4"]]
+    for executor in (session.downloads, session.probes, session.uploads):
+        executor.shutdown()
+
+
+class PageDriver:
+    """Search page that shows `srcs` once and never loads anything else."""
+
+    def __init__(self, srcs):
+        self.srcs = list(srcs)
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, value):
+        return object()
+
+    def execute_script(self, script, *args):
+        if script == COLLECT_NEW_IMAGES_JS:
+            srcs, self.srcs = self.srcs, []
+            return srcs
+        return False if args else 1000
+
+
+class OneBrowser:
+    def __init__(self, driver):
+        self.driver, self.released = driver, 0
+
+    def acquire(self):
+        return self.driver
+
+    def release(self, driver, broken=False):
+        self.released += 1
+
+
+class HangingStorage:
+    def __init__(self):
+        self.unblock = threading.Event()
+
+    def upload_file(self, data, name):
+        self.unblock.wait()
+        return f"file://{name}"
+
+
+class ApproveAll:
+    def analyze_batch(self, urls, candidates, batch_size=None):
+        return [{"content_type": {"label": "editorial fashion photography", "score": 0.9}} for _ in urls]
+
+
+def test_hunt_gives_up_on_stalled_uploads():
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.browsers = OneBrowser(PageDriver([f"https://example.com/{index}.jpg" for index in range(3)]))
+    hunter.loader = types.SimpleNamespace(get_bytes=lambda url: b"jpeg", head=lambda url: None, max_asset_bytes=1 << 20)
+    hunter.vision, hunter.storage, hunter.dedup = ApproveAll(), HangingStorage(), None
+    hunter.min_width, hunter.scroll_pause, hunter.scroll_timeout, hunter.max_idle_scrolls = 474, 0.01, 0.05, 1000
+    hunter.upload_timeout = 0.5
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(hunter.hunt("query", limit=1)), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    hunter.storage.unblock.set()
+
+    assert not thread.is_alive()
+    assert results == [[]]
+    assert hunter.browsers.released == 1
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from tests import _stubs  # noqa: F401  (Selenium / boto3 stand-ins when not installed)
+from modules.hunters.pinterest_hunter import HAS_NEW_CONTENT_JS, PinterestHunter
+
+
+class ScrollDriver:
+    """Page whose new pins appear `delay` seconds after each scroll (never, with None)."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.scrolled_at = None
+        self.height = 1000
+
+    def execute_script(self, script, *args):
+        if script == HAS_NEW_CONTENT_JS:
+            assert args == (self.height,)
+            return self.delay is not None and time.monotonic() - self.scrolled_at >= self.delay
+        self.scrolled_at = time.monotonic()
+        return self.height
+
+
+def _hunter(scroll_pause=0.2, scroll_timeout=1.5):
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.scroll_pause, hunter.scroll_timeout = scroll_pause, scroll_timeout
+    return hunter
+
+
+def _timed_scroll(hunter, driver):
+    started = time.monotonic()
+    loaded = hunter._scroll_and_wait(driver)
+    return loaded, time.monotonic() - started
+
+
+def test_returns_as_soon_as_new_content_loads():
+    loaded, elapsed = _timed_scroll(_hunter(), ScrollDriver(delay=0.4))
+
+    assert loaded
+    assert 0.4 <= elapsed < 1.2
+
+
+def test_keeps_the_courtesy_pause_when_content_is_immediate():
+    loaded, elapsed = _timed_scroll(_hunter(scroll_pause=0.3), ScrollDriver(delay=0))
+
+    assert loaded
+    assert 0.3 <= elapsed < 0.3 * 1.5 + 0.3
+
+
+def test_gives_up_after_the_timeout_without_new_content():
+    loaded, elapsed = _timed_scroll(_hunter(scroll_timeout=0.5), ScrollDriver(delay=None))
+
+    assert not loaded
+    assert elapsed == pytest.approx(0.5, abs=0.4)
@@ -0,0 +1,99 @@
+import pytest
+
+from tests import _stubs  # noqa: F401  (Selenium / boto3 stand-ins when not installed)
+from modules.hunters.pinterest_hunter import PinterestHunter, _HuntSession
+
+THUMBNAIL = "https://i.pinimg.com/236x/ab/cd/ef/abcdef.jpg"
+
+
+def _variant(name):
+    return THUMBNAIL.replace("/236x/", f"/{name}/")
+
+
+class ProbeLoader:
+    """HEAD answers per URL: a Content-Length, None (unknown size) or an exception (404/403)."""
+    max_asset_bytes = 1000
+
+    def __init__(self, lengths, broken_downloads=()):
+        self.lengths = lengths
+        self.broken_downloads = set(broken_downloads)
+        self.heads, self.downloads = [], []
+
+    def head(self, url):
+        self.heads.append(url)
+        length = self.lengths.get(url, PermissionError("403"))
+        if isinstance(length, Exception):
+            raise length
+        return length
+
+    def get_bytes(self, url):
+        self.downloads.append(url)
+        if url in self.broken_downloads:
+            raise ConnectionError("reset")
+        return b"image"
+
+
+def _hunter(loader, min_width=474):
+    hunter = PinterestHunter.__new__(PinterestHunter)
+    hunter.loader, hunter.min_width, hunter.dedup = loader, min_width, None
+    return hunter
+
+
+@pytest.fixture
+def session():
+    session = _HuntSession("query", limit=5, download_workers=1, upload_workers=1, queue_size=4)
+    yield session
+    for executor in (session.downloads, session.probes, session.uploads):
+        executor.shutdown()
+
+
+def test_candidates_prefer_the_smallest_sufficient_variant():
+    urls = _hunter(ProbeLoader({}))._candidate_urls(THUMBNAIL)
+
+    assert urls == [_variant(name) for name in ("474x", "564x", "736x", "originals", "236x")]
+    assert _hunter(ProbeLoader({}), min_width=600)._candidate_urls(THUMBNAIL)[:3] == [
+        _variant("736x"), _variant("originals"), _variant("564x")
+    ]
+
+
+def test_non_pinterest_urls_are_used_as_is():
+    url = "https://example.com/236x/photo.jpg"
+    assert _hunter(ProbeLoader({}))._candidate_urls(url) == [url]
+
+
+def test_downloads_the_first_available_variant_only(session):
+    loader = ProbeLoader({_variant("564x"): 400, _variant("736x"): 600, _variant("originals"): None, THUMBNAIL: 50})
+    hunter = _hunter(loader)
+
+    assert hunter._download_variant(session, hunter._candidate_urls(THUMBNAIL)) == _variant("564x")
+    assert loader.downloads == [_variant("564x")]
+
+
+def test_oversized_and_failed_variants_are_skipped(session):
+    loader = ProbeLoader(
+        {_variant("474x"): 5000, _variant("564x"): 400, _variant("736x"): 600, THUMBNAIL: 50},
+        broken_downloads={_variant("564x")}
+    )
+    hunter = _hunter(loader)
+
+    # 474x is too heavy, 564x fails mid-download, originals does not exist: 736x wins.
+    assert hunter._download_variant(session, hunter._candidate_urls(THUMBNAIL)) == _variant("736x")
+    assert loader.downloads == [_variant("564x"), _variant("736x")]
+
+
+def test_a_single_candidate_is_downloaded_without_probing(session):
+    loader = ProbeLoader({})
+    url = "https://example.com/photo.jpg"
+
+    assert _hunter(loader)._download_variant(session, [url]) == url
+    assert loader.heads == [] and loader.downloads == [url]
+
+
+def test_an_already_claimed_url_is_not_downloaded_twice(session):
+    loader = ProbeLoader({_variant("474x"): 400})
+    hunter = _hunter(loader)
+    candidates = hunter._candidate_urls(THUMBNAIL)
+
+    assert hunter._download_variant(session, candidates) == _variant("474x")
+    assert hunter._download_variant(session, candidates) is None
+    assert loader.downloads == [_variant("474x")]
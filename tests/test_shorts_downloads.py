@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+import types
+
+import pytest
+
+from tests import _stubs  # noqa: F401  (yt-dlp / boto3 stand-ins when not installed)
+from modules.hunters import short_video_hunter
+from modules.hunters.short_video_hunter import ShortVideoHunter, _DiskBudget
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def _fake_yt_dlp(entries, failing=(), delay=0.0):
+    """yt-dlp stand-in: search returns `entries`; downloads write a small file (or fail)."""
+    downloads = []
+
+    class YoutubeDL:
+        def __init__(self, options):
+            self.options = options
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, query, download=False):
+            return {"entries": entries}
+
+        def download(self, urls):
+            video_id = urls[0]
+            downloads.append(video_id)
+            time.sleep(delay)
+            for hook in self.options.get("progress_hooks", []):
+                hook({"status": "downloading"})
+            if video_id in failing:
+                raise OSError("HTTP Error 403")
+            with open(self.options["outtmpl"].replace("%(id)s", video_id).replace("%(ext)s", "mp4"), "wb") as f:
+                f.write(b"\0" * 1024)
+
+    module = types.SimpleNamespace(YoutubeDL=YoutubeDL, utils=types.SimpleNamespace(DownloadCancelled=DownloadCancelled))
+    return module, downloads
+
+
+def _hunter(tmp_path, monkeypatch, entries, failing=(), delay=0.0):
+    module, downloads = _fake_yt_dlp(entries, failing, delay)
+    monkeypatch.setattr(short_video_hunter, "yt_dlp", module)
+    hunter = ShortVideoHunter.__new__(ShortVideoHunter)
+    hunter.temp_dir = str(tmp_path)
+    processed = []
+
+    def process_video(video_path, parent_id, tag, attribute_candidates=None, color_engine=None):
+        assert os.path.exists(video_path)
+        processed.append(parent_id)
+        if parent_id.startswith("broken"):
+            raise ValueError("corrupt video")
+        return [{"id": f"{parent_id}:{index}"} for index in range(ShortVideoHunter.MIN_VALID_FRAMES)]
+
+    hunter._process_video = process_video
+    return hunter, downloads, processed
+
+
+def _entries(*ids):
+    return [{"id": video_id, "duration": 30, "filesize": 1024} for video_id in ids]
+
+
+def test_disk_budget_waits_for_space_and_always_admits_one_video():
+    budget = _DiskBudget(100)
+    cancel = threading.Event()
+
+    assert budget.acquire(500, cancel)  # Larger than the budget, but nothing else is on disk
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(budget.acquire(60, cancel)))
+    waiter.start()
+    time.sleep(0.1)
+    assert not admitted
+
+    budget.resize(500, 30)  # Real size is known once the download ends
+    waiter.join(timeout=5)
+    assert admitted == [True] and budget.used == 90
+
+    budget.release(30)
+    budget.release(60)
+    assert budget.used == 0
+
+
+def test_disk_budget_gives_up_when_cancelled():
+    budget = _DiskBudget(100)
+    cancel = threading.Event()
+    budget.acquire(80, cancel)
+
+    threading.Timer(0.1, cancel.set).start()
+    assert not budget.acquire(50, cancel)
+    assert budget.used == 80
+
+
+def test_failed_downloads_and_videos_do_not_abort_the_hunt(tmp_path, monkeypatch):
+    hunter, downloads, processed = _hunter(
+        tmp_path, monkeypatch, _entries("bad1", "broken1", "a", "bad2", "b", "c"), failing={"bad1", "bad2"}
+    )
+
+    results = hunter.hunt("tag", limit=2, download_workers=2)
+
+    assert "bad1" in downloads
+    assert "broken1" in processed
+    assert {frame["id"].split(":")[0] for frame in results} == {"a", "b"}
+    assert len(results) == 2 * ShortVideoHunter.MIN_VALID_FRAMES
+    assert os.listdir(tmp_path) == []
+
+
+def test_quota_stops_further_downloads(tmp_path, monkeypatch):
+    hunter, downloads, processed = _hunter(
+        tmp_path, monkeypatch, _entries(*(f"v{index}" for index in range(20))), delay=0.05
+    )
+
+    results = hunter.hunt("tag", limit=1, download_workers=2)
+
+    assert len(results) == ShortVideoHunter.MIN_VALID_FRAMES
+    assert len(processed) == 1
+    assert len(downloads) <= 2 + 1  # download_workers + one video waiting to be processed
+    assert os.listdir(tmp_path) == []
+
+
+def test_long_videos_are_never_downloaded(tmp_path, monkeypatch):
+    entries = _entries("a") + [{"id": "long", "duration": 600, "filesize": 1024}, None]
+    hunter, downloads, _ = _hunter(tmp_path, monkeypatch, entries)
+
+    hunter.hunt("tag", limit=2, download_workers=1)
+
+    assert downloads == ["a"]
@@ -0,0 +1,39 @@
+import torch
+
+from modules.brains.text_embedding_classifier import EmbeddingTextClassifier
+
+
+def test_embed_texts_does_not_depend_on_batch(vision_engine):
+    short = "denim"
+    long = "a long paragraph about oversized linen shirts and wide leg denim trousers"
+
+    alone = vision_engine.embed_texts([short])
+    batched = vision_engine.embed_texts([short, long])
+
+    assert torch.allclose(alone[0], batched[0], atol=1e-5)
+
+
+def test_label_features_match_embed_texts(vision_engine):
+    labels = ["denim", "linen shirt"]
+    assert torch.allclose(vision_engine._text_features(labels), vision_engine.embed_texts(labels), atol=1e-5)
+
+
+def test_embed_texts_truncates_to_text_context(vision_engine):
+    text = "x" * (vision_engine.TEXT_MAX_LENGTH * 3)
+    assert vision_engine.embed_texts([text]).shape[0] == 1
+
+
+def test_classifier_scores_a_text_the_same_alone_and_in_a_batch(vision_engine):
+    classifier = EmbeddingTextClassifier(model_id=vision_engine.model_id, backend="torch")
+    candidates = {"fabric": ["denim", "linen", "silk"]}
+    text = "linen"
+    others = ["an extremely long review of a silk evening dress with pleated panels and a denim jacket " * 2]
+
+    try:
+        alone = classifier.classify([text], candidates)[0]["fabric"]
+        batched = classifier.classify([text] + others, candidates)[0]["fabric"]
+    finally:
+        classifier.release()
+
+    assert alone["labels"] == batched["labels"]
+    assert all(abs(a - b) < 1e-5 for a, b in zip(alone["scores"], batched["scores"]))
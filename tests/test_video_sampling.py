@@ -0,0 +1,88 @@
+import cv2
+import numpy as np
+import pytest
+
+from tests import _stubs  # noqa: F401  (yt-dlp / boto3 stand-ins when not installed)
+from modules.hunters.short_video_hunter import ShortVideoHunter
+
+MODES = ("read", "grab", "seek")
+
+
+def _write_video(path, frames: int = 23) -> str:
+    """MJPG (every frame is a keyframe) where each frame is a different picture."""
+    rng = np.random.default_rng(0)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for _ in range(frames):
+        writer.write(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+def _sample(path, interval, mode):
+    cap = cv2.VideoCapture(path)
+    try:
+        return list(ShortVideoHunter._iter_sampled_frames(cap, interval, mode))
+    finally:
+        cap.release()
+
+
+class CountingCapture:
+    """VideoCapture stand-in that records which frames get decoded to BGR."""
+
+    def __init__(self, frames: int, report_count: bool = True):
+        self.frames, self.report_count = frames, report_count
+        self.position = 0
+        self.decoded, self.grabbed = [], 0
+
+    def get(self, prop):
+        return self.frames if prop == cv2.CAP_PROP_FRAME_COUNT and self.report_count else 0
+
+    def set(self, prop, value):
+        self.position = int(value)
+        return True
+
+    def read(self):
+        if self.position >= self.frames:
+            return False, None
+        self.decoded.append(self.position)
+        self.position += 1
+        return True, np.full((2, 2, 3), self.position - 1, dtype=np.uint8)
+
+    def grab(self):
+        if self.position >= self.frames:
+            return False
+        self.grabbed += 1
+        self.position += 1
+        return True
+
+
+@pytest.mark.parametrize("interval", [1, 4, 15, 40])
+def test_all_modes_return_the_same_frames(tmp_path, interval):
+    video = _write_video(tmp_path / "v.avi")
+    reference = _sample(video, interval, "read")
+
+    assert [index for index, _ in reference] == list(range(0, 23, interval))
+    for mode in ("grab", "seek"):
+        frames = _sample(video, interval, mode)
+        assert [index for index, _ in frames] == [index for index, _ in reference]
+        for (_, frame), (_, expected) in zip(frames, reference):
+            assert np.array_equal(frame, expected)
+
+
+def test_grab_only_decodes_the_sampled_frames():
+    cap = CountingCapture(frames=10)
+
+    frames = list(ShortVideoHunter._iter_sampled_frames(cap, 3, "grab"))
+
+    assert [index for index, _ in frames] == [0, 3, 6, 9]
+    assert [int(frame[0, 0, 0]) for _, frame in frames] == [0, 3, 6, 9]
+    assert cap.decoded == [0, 3, 6, 9] and cap.grabbed == 6
+
+
+def test_seek_without_a_frame_count_falls_back_to_grab():
+    cap = CountingCapture(frames=10, report_count=False)
+
+    frames = list(ShortVideoHunter._iter_sampled_frames(cap, 4, "seek"))
+
+    assert [index for index, _ in frames] == [0, 4, 8]
+    assert cap.decoded == [0, 4, 8] and cap.grabbed == 7
@@ -0,0 +1,54 @@
+import pytest
+import torch
+import transformers
+
+from modules.brains.vision_backends import OnnxZeroShotModel, export_onnx, features_tensor
+from tests.conftest import FakeSiglipProcessor, make_tiny_siglip
+from tests.test_vision_batch import CANDIDATES, _images
+
+pytest.importorskip("onnxruntime")
+
+
+@pytest.fixture
+def onnx_dir(tmp_path, monkeypatch):
+    """The tiny SigLIP exported with the real exporter."""
+    monkeypatch.setattr(transformers.AutoProcessor, "from_pretrained", lambda *a, **kw: FakeSiglipProcessor())
+    monkeypatch.setattr(transformers.AutoModelForZeroShotImageClassification, "from_pretrained",
+                        lambda *a, **kw: make_tiny_siglip())
+    return export_onnx("tests/tiny-siglip", str(tmp_path / "onnx"))
+
+
+def _cosine(a, b):
+    return torch.nn.functional.cosine_similarity(a, b, dim=-1)
+
+
+def test_onnx_towers_match_pytorch(onnx_dir):
+    reference, onnx_model = make_tiny_siglip(), OnnxZeroShotModel(onnx_dir)
+    processor = FakeSiglipProcessor()
+    pixels = processor(images=_images(3))["pixel_values"]
+    # Batch and sequence length differ from the export sample (dynamic axes).
+    text = processor(text=["denim", "silk", "leather", "linen"], padding="max_length", max_length=64)
+
+    with torch.no_grad():
+        assert _cosine(onnx_model.get_image_features(pixels),
+                       features_tensor(reference.get_image_features(pixel_values=pixels))).min() > 0.999
+        assert _cosine(onnx_model.get_text_features(**text),
+                       features_tensor(reference.get_text_features(**text))).min() > 0.999
+    assert float(onnx_model.logit_scale) == pytest.approx(float(reference.logit_scale))
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_backends_agree_with_fp32(make_vision_engine, onnx_dir, backend):
+    images = _images(4)
+    reference = make_vision_engine(embedding_mode=True).analyze_batch(images, CANDIDATES)
+    engine = make_vision_engine(backend=backend, onnx_dir=onnx_dir)
+
+    assert engine.precision == backend
+    for expected, result in zip(reference, engine.analyze_batch(images, CANDIDATES)):
+        for category in CANDIDATES:
+            assert abs(expected[category]["score"] - result[category]["score"]) < 0.05
+
+
+def test_unknown_backend_is_rejected(make_vision_engine):
+    with pytest.raises(ValueError):
+        make_vision_engine(backend="tensorrt")
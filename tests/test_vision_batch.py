@@ -0,0 +1,37 @@
+import numpy as np
+from PIL import Image
+
+CANDIDATES = {"fabric": ["denim", "silk", "leather"], "finish": ["matte", "shiny"]}
+
+
+def _images(count: int = 5) -> list:
+    rng = np.random.default_rng(0)
+    return [Image.fromarray((rng.random((40, 40, 3)) * 255).astype(np.uint8)) for _ in range(count)]
+
+
+def _assert_same(a: dict, b: dict):
+    assert a.keys() == b.keys()
+    for category in a:
+        assert a[category]["label"] == b[category]["label"]
+        for label, score in a[category]["all_scores"].items():
+            assert abs(score - b[category]["all_scores"][label]) < 1e-4
+
+
+def test_analyze_batch_matches_analyze(vision_engine):
+    images = _images()
+    batched = vision_engine.analyze_batch(images, CANDIDATES, batch_size=2)
+
+    assert len(batched) == len(images)
+    for image, result in zip(images, batched):
+        _assert_same(result, vision_engine.analyze(image, CANDIDATES))
+
+
+def test_analyze_batch_keeps_order_and_isolates_failures(vision_engine, tmp_path):
+    images = _images(3)
+    inputs = [images[0], str(tmp_path / "missing.jpg"), images[2]]
+
+    results = vision_engine.analyze_batch(inputs, CANDIDATES, batch_size=8)
+
+    assert results[1] == {}
+    _assert_same(results[0], vision_engine.analyze(images[0], CANDIDATES))
+    _assert_same(results[2], vision_engine.analyze(images[2], CANDIDATES))
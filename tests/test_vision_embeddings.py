@@ -0,0 +1,34 @@
+from tests.test_vision_batch import CANDIDATES, _assert_same, _images
+
+
+def test_embedding_mode_matches_per_category_scoring(make_vision_engine):
+    reference = make_vision_engine()
+    fast = make_vision_engine(embedding_mode=True)
+    images = _images(3)
+
+    for expected, result in zip(reference.analyze_batch(images, CANDIDATES),
+                                fast.analyze_batch(images, CANDIDATES)):
+        _assert_same(result, expected)
+
+
+def test_label_embeddings_are_encoded_once(make_vision_engine, monkeypatch):
+    engine = make_vision_engine(embedding_mode=True)
+    calls = []
+    encode = engine.model.get_text_features
+    monkeypatch.setattr(engine.model, "get_text_features", lambda **kw: calls.append(1) or encode(**kw))
+
+    engine.analyze_batch(_images(2), CANDIDATES)
+    engine.analyze_batch(_images(2), CANDIDATES)
+
+    assert len(calls) == len(CANDIDATES)
+
+
+def test_image_tower_runs_once_per_batch(make_vision_engine, monkeypatch):
+    engine = make_vision_engine(embedding_mode=True)
+    calls = []
+    encode = engine.model.get_image_features
+    monkeypatch.setattr(engine.model, "get_image_features", lambda **kw: calls.append(1) or encode(**kw))
+
+    engine.analyze_batch(_images(4), {**CANDIDATES, "colour": ["dark", "light"]}, batch_size=4)
+
+    assert len(calls) == 1